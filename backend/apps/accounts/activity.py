@@ -0,0 +1,262 @@
+"""
+Daily user activity rollup for the admin reports.
+
+``UserActivityDaily`` keeps one row per (day, role) with the registrations,
+logins and the net change in active / held users for that day. The ``User``
+signals update the current row with F() increments and the
+``rollup_user_activity`` command catches up on anything they missed, so a
+report only reads the rollup: its cost grows with the number of days in the
+range, not with the number of users.
+
+Logins are the hot path: every login would increment the same (today, role)
+row. They are counted in memory instead and written at most once per
+``ACTIVITY_LOGIN_FLUSH_SECONDS`` per process, as one increment per row.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import User, UserActivityDaily
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("registered", "logins", "active_delta", "held_delta")
+
+
+def _day(value=None):
+    return timezone.localdate(value) if value else timezone.localdate()
+
+
+def record(day, role, **deltas):
+    """Add ``deltas`` to the (day, role) row, creating it on first use."""
+    deltas = {field: amount for field, amount in deltas.items() if amount}
+    if not deltas:
+        return
+    updates = {field: F(field) + amount for field, amount in deltas.items()}
+    rows = UserActivityDaily.objects.filter(day=day, role=role)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            UserActivityDaily.objects.create(day=day, role=role, **deltas)
+    except IntegrityError:
+        # Another request created the row first
+        rows.update(**updates)
+
+
+def _state_deltas(state, sign):
+    is_active, role = state
+    return role, {"active_delta" if is_active else "held_delta": sign}
+
+
+def record_registration(user):
+    role, deltas = _state_deltas(user.stats_state(), 1)
+    record(_day(user.date_joined), role, registered=1, **deltas)
+
+
+def record_registrations(user_ids):
+    """Book users created in bulk (``bulk_create`` skips post_save) — one grouped query per batch."""
+    for start in range(0, len(user_ids), 1000):
+        counts = _recount_registrations(User.objects.filter(id__in=user_ids[start:start + 1000]))
+        for (day, role), entry in counts.items():
+            record(day, role, **entry)
+
+
+def record_state_change(old_state=None, new_state=None):
+    """Move a user between the active / held and role buckets as of today."""
+    today = _day()
+    for state, sign in ((old_state, -1), (new_state, 1)):
+        if state is not None:
+            role, deltas = _state_deltas(state, sign)
+            record(today, role, **deltas)
+
+
+class LoginCounter:
+    """Logins per (day, role) buffered in memory and added to the rollup in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._flushed_at = time.monotonic()
+
+    def add(self, day, role):
+        interval = getattr(settings, "ACTIVITY_LOGIN_FLUSH_SECONDS", 10)
+        with self._lock:
+            self._counts[(day, role)] += 1
+            if time.monotonic() - self._flushed_at < interval:
+                return
+        self.flush()
+
+    def flush(self):
+        """Write the buffered counts (one F() increment per row); return how many logins were written."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = time.monotonic()
+        try:
+            for (day, role), logins in counts.items():
+                record(day, role, logins=logins)
+        except Exception:
+            # rollup_user_activity's catch_up recounts logins from last_login
+            logger.exception("Could not write %s buffered logins to the activity rollup", sum(counts.values()))
+            return 0
+        return sum(counts.values())
+
+
+login_counter = LoginCounter()
+atexit.register(login_counter.flush)
+
+
+def record_login(user):
+    login_counter.add(_day(user.last_login), user.role)
+
+
+def _actual_levels():
+    rows = User.objects.values("role").annotate(
+        active=Count("id", filter=Q(is_active=True)),
+        held=Count("id", filter=Q(is_active=False)),
+    ).order_by()
+    return {row["role"]: (row["active"], row["held"]) for row in rows}
+
+
+def _recorded_levels(before=None):
+    rows = UserActivityDaily.objects.all()
+    if before is not None:
+        rows = rows.filter(day__lt=before)
+    rows = rows.values("role").annotate(active=Sum("active_delta"), held=Sum("held_delta")).order_by()
+    return {row["role"]: (row["active"] or 0, row["held"] or 0) for row in rows}
+
+
+def reconcile(day=None):
+    """Book the difference between the real active / held counts and the rollup on ``day``."""
+    day = day or _day()
+    actual = _actual_levels()
+    recorded = _recorded_levels()
+    for role in set(actual) | set(recorded):
+        active, held = actual.get(role, (0, 0))
+        recorded_active, recorded_held = recorded.get(role, (0, 0))
+        record(day, role, active_delta=active - recorded_active, held_delta=held - recorded_held)
+
+
+def _recount_registrations(users):
+    """Registrations and current active / held split per (joined day, role)."""
+    counts = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    rows = users.annotate(day=TruncDate("date_joined")).values("day", "role").annotate(
+        registered=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        held=Count("id", filter=Q(is_active=False)),
+    ).order_by()
+    for row in rows:
+        counts[(row["day"], row["role"])].update(
+            registered=row["registered"], active_delta=row["active"], held_delta=row["held"]
+        )
+    return counts
+
+
+def _recount_logins(users):
+    """Users whose latest login falls on each (day, role)."""
+    rows = users.filter(last_login__isnull=False).annotate(day=TruncDate("last_login")).values(
+        "day", "role"
+    ).annotate(logins=Count("id")).order_by()
+    return {(row["day"], row["role"]): row["logins"] for row in rows}
+
+
+def rebuild():
+    """
+    Replace the rollup with a recount of the user table. Past state changes
+    aren't recorded anywhere, so each user counts as active / held from the
+    day they joined, and only their latest login is known.
+    """
+    counts = _recount_registrations(User.objects.all())
+    for key, logins in _recount_logins(User.objects.all()).items():
+        counts[key]["logins"] = logins
+    with transaction.atomic():
+        UserActivityDaily.objects.all().delete()
+        UserActivityDaily.objects.bulk_create(
+            [UserActivityDaily(day=day, role=role, **entry) for (day, role), entry in counts.items()],
+            batch_size=1000,
+        )
+    return len(counts)
+
+
+def catch_up(since):
+    """
+    Fill in registrations and logins from ``since`` onwards that the signals
+    missed, then reconcile today's active / held levels. Counters are only
+    ever raised: deleted users and repeat logins are already in the rollup.
+    """
+    registered = _recount_registrations(User.objects.filter(date_joined__date__gte=since))
+    logins = _recount_logins(User.objects.filter(last_login__date__gte=since))
+    existing = {(row.day, row.role): row for row in UserActivityDaily.objects.filter(day__gte=since)}
+
+    changed = []
+    for key in set(registered) | set(logins):
+        row = existing.get(key) or UserActivityDaily(day=key[0], role=key[1])
+        new_counts = (
+            max(row.registered, registered[key]["registered"] if key in registered else 0),
+            max(row.logins, logins.get(key, 0)),
+        )
+        if row.pk is None or new_counts != (row.registered, row.logins):
+            row.registered, row.logins = new_counts
+            changed.append(row)
+
+    with transaction.atomic():
+        UserActivityDaily.objects.bulk_create(
+            changed,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["day", "role"],
+            update_fields=["registered", "logins"],
+        )
+        reconcile()
+    return len(changed)
+
+
+def activity_report(start, end):
+    """Daily registrations, logins and active / held levels (overall and per role) for ``start``..``end``."""
+    login_counter.flush()
+    baseline = _recorded_levels(before=start)
+    rows = {
+        (day, role): counters
+        for day, role, *counters in UserActivityDaily.objects.filter(
+            day__range=(start, end)
+        ).values_list("day", "role", *COUNTERS)
+    }
+
+    roles = [role for role, _ in User.ROLE_CHOICES]
+    roles += sorted(({role for _, role in rows} | set(baseline)) - set(roles))
+    levels = {role: list(baseline.get(role, (0, 0))) for role in roles}
+
+    days = []
+    totals = {"registered": 0, "logins": 0}
+    day = start
+    while day <= end:
+        entry = {"date": day.isoformat(), "registered": 0, "logins": 0, "active": 0, "held": 0, "roles": {}}
+        for role in roles:
+            registered, logins, active_delta, held_delta = rows.get((day, role), (0, 0, 0, 0))
+            levels[role][0] += active_delta
+            levels[role][1] += held_delta
+            entry["roles"][role] = {
+                "registered": registered,
+                "logins": logins,
+                "active": levels[role][0],
+                "held": levels[role][1],
+            }
+            entry["registered"] += registered
+            entry["logins"] += logins
+            entry["active"] += levels[role][0]
+            entry["held"] += levels[role][1]
+        totals["registered"] += entry["registered"]
+        totals["logins"] += entry["logins"]
+        days.append(entry)
+        day += timedelta(days=1)
+
+    return {"start": start.isoformat(), "end": end.isoformat(), "totals": totals, "days": days}
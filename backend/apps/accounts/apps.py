@@ -4,3 +4,6 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.accounts"          # full import path
     label = "accounts"              # ✅ short label used by Django internally
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,104 @@
+"""
+Native async API views (served when ``USE_ASYNC_VIEWS`` is on).
+
+DRF's ``APIView`` is synchronous, so under ASGI every DRF request is handed
+to a thread. ``async_api_view`` wraps a plain ``async def`` handler with the
+same pipeline instead — JSON parsing, the configured authentication,
+permission and throttle classes — and renders its result with the default
+renderer. The checks themselves are cheap (token claims, cache reads) and
+run in one ``sync_to_async`` hop; the handler then awaits the ORM's async
+API, so a slow request holds a coroutine, not a worker thread.
+
+Methods the handler doesn't serve (writes) are passed to ``fallback``, the
+existing sync view, so only reads and the OTP endpoints need async versions.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+class AsyncResponse(HttpResponse):
+    """A rendered JSON response; ``data`` is kept for callers that want it."""
+
+    def __init__(self, data=None, status=200, headers=None):
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        content = b"" if data is None else renderer.render(data)
+        content_type = f"{renderer.media_type}; charset={renderer.charset}" if renderer.charset else renderer.media_type
+        super().__init__(content, status=status, headers=headers, content_type=content_type)
+        self.data = data
+
+
+def error_response(exc, request):
+    """Same status, body and headers DRF's exception handler would produce."""
+    headers = {}
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        authenticators = request.authenticators
+        header = authenticators[0].authenticate_header(request) if authenticators else None
+        if header:
+            headers["WWW-Authenticate"] = header
+        else:
+            exc.status_code = 403
+    wait = getattr(exc, "wait", None)
+    if wait:
+        headers["Retry-After"] = str(int(wait))
+    detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    return AsyncResponse(detail, status=exc.status_code, headers=headers)
+
+
+def _check_request(request, permission_classes, throttle_classes):
+    """Parse the body, authenticate, check permissions and throttles (DRF's order)."""
+    request.data  # parse errors surface here as a 400
+    request.user
+    for permission in (cls() for cls in permission_classes):
+        if not permission.has_permission(request, None):
+            if request.authenticators and not request.successful_authenticator:
+                raise exceptions.NotAuthenticated()
+            raise exceptions.PermissionDenied(getattr(permission, "message", None))
+    waits = []
+    for throttle in (cls() for cls in throttle_classes):
+        if not throttle.allow_request(request, None):
+            waits.append(throttle.wait())
+    if waits:
+        raise exceptions.Throttled(max((w for w in waits if w is not None), default=None))
+
+
+def async_api_view(methods, permission_classes=(IsAuthenticated,), throttle_classes=(), fallback=None):
+    """
+    Turn ``async def handler(request, *args, **kwargs)`` — ``request`` being a
+    DRF ``Request`` — into an async Django view. The handler returns an
+    ``HttpResponse`` (e.g. ``AsyncResponse(data)``) or raises an ``APIException``.
+    """
+    methods = {method.upper() for method in methods}
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method not in methods:
+                if fallback is not None:
+                    return await sync_to_async(fallback)(request, *args, **kwargs)
+                allowed = ", ".join(sorted(methods))
+                return AsyncResponse(
+                    {"detail": f'Method "{request.method}" not allowed.'}, status=405, headers={"Allow": allowed}
+                )
+
+            drf_request = Request(
+                request,
+                parsers=[JSONParser()],
+                authenticators=[cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+            )
+            try:
+                await sync_to_async(_check_request)(drf_request, permission_classes, throttle_classes)
+                return await handler(drf_request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return error_response(exc, drf_request)
+
+        view.csrf_exempt = True  # token-authenticated like the DRF views
+        return view
+
+    return decorator
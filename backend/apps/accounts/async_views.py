@@ -0,0 +1,32 @@
+"""
+Async versions of the profile read and the live stats stream (routed when
+``USE_ASYNC_VIEWS`` is on). Writes fall back to the sync views in ``views``.
+"""
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework.permissions import IsAdminUser
+
+from . import payload_cache, versioning, views
+from .async_api import AsyncResponse, async_api_view
+from .streaming import broadcaster
+
+
+# ✅ Profile View — GET on the event loop, POST via the sync view
+@async_api_view(["GET"], fallback=views.profile_view)
+async def profile_view(request):
+    not_modified = await sync_to_async(versioning.precondition_response)(request, versioning.PROFILE)
+    if not_modified is not None:
+        return not_modified
+
+    response = AsyncResponse(await payload_cache.aprofile_payload(request.user))
+    return await sync_to_async(versioning.set_validators)(response, request, versioning.PROFILE)
+
+
+# ✅ Admin — Live User Statistics (SSE); an open connection holds no thread
+@async_api_view(["GET"], permission_classes=[IsAdminUser])
+async def stats_stream_view(request):
+    last_event_id = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+    response = StreamingHttpResponse(broadcaster.aevents(last_event_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,229 @@
+"""
+Claims-based JWT authentication.
+
+Access tokens issued by ``CustomTokenObtainPairSerializer`` carry the claims
+that permission checks need (id, username, role, is_staff, is_superuser,
+is_active, token version), so ``ClaimsJWTAuthentication`` builds
+``request.user`` from the signed token without querying ``accounts_user``.
+Held users and revoked tokens are refused from the in-memory snapshot in
+``revocation``, so a hold takes effect within seconds, not at token expiry.
+The full ``User`` row is loaded only when a view reads an attribute that
+isn't a claim, and it comes from a bounded per-process LRU cache that the
+``User`` signals invalidate.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from . import revocation
+from .models import User
+
+CLAIMS = ("username", "role", "is_staff", "is_superuser", "is_active", "ver")
+USER_FIELDS = frozenset(field.attname for field in User._meta.concrete_fields)
+
+
+def add_user_claims(token, user):
+    token["username"] = user.username
+    token["role"] = user.role
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token["is_active"] = user.is_active
+    token["ver"] = user.token_version
+    return token
+
+
+class UserCache:
+    """Bounded LRU of ``User`` rows by id; entries also expire after a TTL."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _config(self):
+        config = getattr(settings, "AUTH_USER_CACHE", {})
+        return config.get("MAX_SIZE", 10000), config.get("TTL_SECONDS", 60)
+
+    def _cached(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return copy.copy(entry[0])
+        return None
+
+    def _store(self, user_id, user):
+        max_size, ttl = self._config()
+        with self._lock:
+            self._entries[user_id] = (user, time.monotonic() + ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+        return copy.copy(user)
+
+    def get(self, user_id):
+        """Return a private copy of the user, loading it on a miss."""
+        user = self._cached(user_id)
+        if user is not None:
+            return user
+        try:
+            user = User.objects.get(pk=user_id)
+        except User.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        return self._store(user_id, user)
+
+    async def aget(self, user_id):
+        """``get`` for async views: a miss is loaded with the async ORM."""
+        user = self._cached(user_id)
+        if user is not None:
+            return user
+        try:
+            user = await User.objects.aget(pk=user_id)
+        except User.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        return self._store(user_id, user)
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+user_cache = UserCache()
+
+
+class ClaimsUser(TokenUser):
+    """
+    ``request.user`` backed by token claims.
+
+    Claims answer ``id``, ``username``, ``role``, ``is_staff``... directly;
+    any other attribute is read from ``instance``, the full ``User`` loaded
+    lazily through ``user_cache``. ``save()`` / ``set_password()`` act on that
+    instance, though views that modify the user usually work on
+    ``get_user_instance(request.user)`` directly.
+    """
+
+    def __str__(self):
+        return self.username
+
+    @cached_property
+    def id(self):
+        # The claim is serialized as a string; match the model's pk type
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def role(self):
+        return self.token.get("role", "user")
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+    @cached_property
+    def instance(self):
+        return user_cache.get(self.id)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.instance, attr)
+
+    def __setattr__(self, attr, value):
+        # Field writes (e.g. update_last_login's) also land on the instance that save() writes
+        if attr in USER_FIELDS:
+            setattr(self.instance, attr, value)
+        super().__setattr__(attr, value)
+
+    # TokenUser refuses these; the ``User`` behind the claims can do them. Its
+    # post_save / post_delete signals drop the row from ``user_cache``.
+    def check_password(self, raw_password):
+        return self.instance.check_password(raw_password)
+
+    def set_password(self, raw_password):
+        self.instance.set_password(raw_password)
+
+    def save(self, *args, **kwargs):
+        self.instance.save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self.instance.delete(*args, **kwargs)
+
+
+def get_user_instance(user):
+    """Return the ``User`` model instance behind ``request.user``."""
+    if isinstance(user, ClaimsUser):
+        return user.instance
+    return user
+
+
+async def aget_user_instance(user):
+    """``get_user_instance`` for async views."""
+    if isinstance(user, ClaimsUser):
+        if "instance" not in user.__dict__:
+            user.__dict__["instance"] = await user_cache.aget(user.id)
+        return user.instance
+    return user
+
+
+def _refuse(is_active, revoked):
+    if not is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    if revoked:
+        raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+
+
+def check_revocation(validated_token):
+    """Reject access tokens of held users and ones issued before the user's last version bump — in memory."""
+    user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return
+    user_id = User._meta.pk.to_python(user_id)
+    revocation.snapshot.sync()
+    _refuse(
+        not revocation.snapshot.is_held(user_id),
+        revocation.snapshot.is_revoked(user_id, validated_token.get("ver")),
+    )
+
+
+def check_refresh_revocation(refresh_token):
+    """
+    Same rules for a refresh token, against the user row: refresh tokens
+    outlive the bumps the snapshot keeps, and refreshes are rare enough for
+    one query.
+    """
+    user_id = refresh_token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return
+    row = User.objects.filter(pk=user_id).values_list("is_active", "token_version").first()
+    if row is not None:
+        is_active, token_version = row
+        _refuse(is_active, (refresh_token.get("ver") or 0) < token_version)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        check_revocation(validated_token)
+
+        if api_settings.USER_ID_CLAIM not in validated_token or not all(
+            claim in validated_token for claim in CLAIMS
+        ):
+            # Tokens issued before the claims were added still work via the DB lookup
+            return super().get_user(validated_token)
+
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return ClaimsUser(validated_token)
@@ -0,0 +1,27 @@
+from django.contrib.auth.backends import ModelBackend
+
+from . import hashing
+from .identity import find_user
+from .models import User
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that accepts a username, email or phone number as the login
+    (one indexed query, see apps.accounts.identity) and checks passwords on
+    the hashing pool (see apps.accounts.hashing).
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        user = find_user(username)
+        if user is None:
+            # Pay the same hashing cost so timing doesn't reveal which accounts exist
+            hashing.make_password(password)
+            return None
+        if hashing.check_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
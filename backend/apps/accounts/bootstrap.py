@@ -0,0 +1,30 @@
+"""
+Session bootstrap: everything the first dashboard screen needs in one payload.
+
+Profile and addresses come from the payload cache, so a query runs only
+for whichever changed since the last read. Staff also get the stats
+snapshot, which is served from the cached counters.
+"""
+from . import payload_cache, stats, versioning
+
+
+def build_bootstrap(user):
+    addresses = payload_cache.addresses_payload(user.pk)
+    is_admin = user.is_superuser or user.is_staff
+    return {
+        "profile": payload_cache.profile_payload(user),
+        "addresses": addresses,
+        "has_address": bool(addresses),
+        "roles": {
+            "role": user.role,
+            "is_staff": user.is_staff,
+            "is_superuser": user.is_superuser,
+            "is_admin": is_admin,
+        },
+        "stats": stats.get_user_stats() if user.is_staff else None,
+        # ETags for later conditional requests on the same resources
+        "versions": {
+            "profile": versioning.validators(versioning.PROFILE, user.pk)[0],
+            "addresses": versioning.validators(versioning.ADDRESSES, user.pk)[0],
+        },
+    }
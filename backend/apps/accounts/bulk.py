@@ -0,0 +1,100 @@
+"""
+Bulk admin actions on users.
+
+Targets are resolved in batches of ``BATCH_SIZE`` ids and every batch is
+applied with one ``UPDATE ... WHERE id IN (...)`` (or a batched delete) inside
+a single transaction. ``QuerySet.update`` bypasses ``post_save``, so listeners
+are told through the ``users_bulk_changed`` signal once the transaction commits.
+Deletes still cascade to addresses, but the per-user ``post_delete``
+bookkeeping is skipped in favour of that one signal.
+"""
+from django.db import transaction
+
+from . import revocation
+from .models import User
+from .signals import bulk_delete, users_bulk_changed
+
+BATCH_SIZE = 1000
+
+HOLD = "hold"
+ACTIVATE = "activate"
+CHANGE_ROLE = "change_role"
+DELETE = "delete"
+ACTIONS = (HOLD, ACTIVATE, CHANGE_ROLE, DELETE)
+
+
+def _batches(items, size=BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def resolve_filter(filters, limit=None):
+    """Return the ids (ascending, at most ``limit``) of users matching a validated filter dict."""
+    queryset = User.objects.all()
+    if "role" in filters:
+        queryset = queryset.filter(role=filters["role"])
+    if "is_active" in filters:
+        queryset = queryset.filter(is_active=filters["is_active"])
+    if "is_staff" in filters:
+        queryset = queryset.filter(is_staff=filters["is_staff"])
+    if "joined_after" in filters:
+        queryset = queryset.filter(date_joined__gte=filters["joined_after"])
+    if "joined_before" in filters:
+        queryset = queryset.filter(date_joined__lt=filters["joined_before"])
+    return list(queryset.order_by("id").values_list("id", flat=True)[:limit])
+
+
+def apply_bulk_action(action, user_ids, acting_user, role=None):
+    """
+    Apply ``action`` to ``user_ids`` and return ``{id: result}``.
+
+    Results are ``"updated"``, ``"deleted"``, ``"not_found"`` or ``"skipped"``
+    (an admin can't hold, demote or delete their own account).
+    """
+    results = {}
+    changed = []
+
+    if action == HOLD:
+        # Holding also revokes the users' issued tokens (see apps.accounts.revocation)
+        values = {"is_active": False, **revocation.bump_values()}
+    elif action == ACTIVATE:
+        values = {"is_active": True}
+    elif action == CHANGE_ROLE:
+        # The role is a token claim: revoke tokens carrying the old one
+        values = {"role": role, **revocation.bump_values()}
+    else:
+        values = None
+
+    with transaction.atomic():
+        for batch in _batches(list(dict.fromkeys(user_ids))):
+            existing = set(User.objects.filter(id__in=batch).values_list("id", flat=True))
+            targets = []
+            for user_id in batch:
+                if user_id not in existing:
+                    results[user_id] = "not_found"
+                elif user_id == acting_user.pk and action != ACTIVATE:
+                    results[user_id] = "skipped"
+                else:
+                    targets.append(user_id)
+
+            if not targets:
+                continue
+
+            if action == DELETE:
+                with bulk_delete():
+                    User.objects.filter(id__in=targets).delete()
+                status = "deleted"
+            else:
+                User.objects.filter(id__in=targets).update(**values)
+                status = "updated"
+
+            for user_id in targets:
+                results[user_id] = status
+            changed.extend(targets)
+
+        if changed:
+            transaction.on_commit(
+                lambda: users_bulk_changed.send(sender=User, user_ids=changed, action=action)
+            )
+
+    return results
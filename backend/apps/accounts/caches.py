@@ -0,0 +1,19 @@
+"""
+Which cache backends are shared between worker processes.
+
+Stats counters, resource versions and cached payloads are only correct
+across workers when every process reads the same cache. Local memory (and
+the dummy cache) is per process, so features that depend on sharing check
+``is_shared()`` and fall back to something slower but correct.
+"""
+from django.conf import settings
+
+PER_PROCESS_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def is_shared(alias="default"):
+    """True when every worker process sees the same entries in cache ``alias``."""
+    return settings.CACHES[alias]["BACKEND"] not in PER_PROCESS_BACKENDS
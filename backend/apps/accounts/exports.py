@@ -0,0 +1,108 @@
+"""
+Streaming exports of users joined with their addresses.
+
+Rows come from a server-side cursor (``iterator(chunk_size=...)``) and are
+encoded by generators that a ``StreamingHttpResponse`` consumes, so memory
+stays flat whatever the number of users. Output can be gzipped on the fly.
+"""
+import csv
+import json
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import User
+
+USER_FIELDS = [
+    "id", "username", "first_name", "last_name", "email", "phone",
+    "role", "is_active", "is_staff", "date_joined", "last_login",
+]
+ADDRESS_FIELDS = [
+    "id", "house_flat", "street", "landmark", "area", "district",
+    "city", "state", "postal_code", "country", "created_at",
+]
+CSV_HEADER = USER_FIELDS + [f"address_{field}" for field in ADDRESS_FIELDS]
+
+# Rows buffered per yielded chunk — keeps the per-chunk overhead low
+ROWS_PER_CHUNK = 500
+
+# Spreadsheets run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _chunk_size():
+    return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+
+def joined_rows(queryset=None):
+    """Yield one tuple per (user, address) pair — users without addresses get empty address columns."""
+    queryset = User.objects.all() if queryset is None else queryset
+    columns = USER_FIELDS + [f"addresses__{field}" for field in ADDRESS_FIELDS]
+    return (
+        queryset.order_by("id", "addresses__id")
+        .values_list(*columns)
+        .iterator(chunk_size=_chunk_size())
+    )
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    """Cell text for ``value``; user-entered text that a spreadsheet would evaluate is quoted with ``'``."""
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_stream(rows):
+    writer = csv.writer(_Echo())
+    buffer = [writer.writerow(CSV_HEADER)]
+    for row in rows:
+        buffer.append(writer.writerow([csv_cell(value) for value in row]))
+        if len(buffer) >= ROWS_PER_CHUNK:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def ndjson_stream(rows):
+    """One JSON object per user with an ``addresses`` list (rows arrive grouped by user id)."""
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    user_count = len(USER_FIELDS)
+    current = None
+    buffer = []
+
+    for row in rows:
+        if current is None or current["id"] != row[0]:
+            if current is not None:
+                buffer.append(encoder.encode(current) + "\n")
+                if len(buffer) >= ROWS_PER_CHUNK:
+                    yield "".join(buffer)
+                    buffer = []
+            current = dict(zip(USER_FIELDS, row[:user_count]))
+            current["addresses"] = []
+        if row[user_count] is not None:
+            current["addresses"].append(dict(zip(ADDRESS_FIELDS, row[user_count:])))
+
+    if current is not None:
+        buffer.append(encoder.encode(current) + "\n")
+    if buffer:
+        yield "".join(buffer)
+
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 → gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
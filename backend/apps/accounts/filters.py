@@ -0,0 +1,29 @@
+from rest_framework.filters import BaseFilterBackend
+
+BOOLEAN_VALUES = {
+    "true": True, "1": True, "yes": True,
+    "false": False, "0": False, "no": False,
+}
+
+
+class UserFilterBackend(BaseFilterBackend):
+    """
+    Filter admin user listings by ``?role=``, ``?is_active=`` and ``?is_staff=``.
+
+    Each filter is backed by a ``(field, id)`` index on ``User`` so it combines
+    with the keyset pagination without a table scan.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        role = params.get("role")
+        if role:
+            queryset = queryset.filter(role=role)
+
+        for field in ("is_active", "is_staff"):
+            value = BOOLEAN_VALUES.get(params.get(field, "").lower())
+            if value is not None:
+                queryset = queryset.filter(**{field: value})
+
+        return queryset
@@ -0,0 +1,204 @@
+"""
+Password hashing on a bounded process pool.
+
+Hashing is deliberately slow and CPU-bound, so during login or registration
+bursts it would otherwise pile up on request threads. Here the work runs on
+``PASSWORD_HASHING["WORKERS"]`` processes (0 runs it inline). At most
+``MAX_PENDING`` hashes may be queued or running at once; a request that
+can't get a slot within ``QUEUE_TIMEOUT`` seconds is shed with a 503
+instead of queueing behind the burst.
+
+Every web process starts its own pool, so the hashing processes on a host
+number server workers × ``WORKERS``; the default is deliberately small. If a
+pool process dies (e.g. OOM-killed) the pool is replaced and the hash retried
+once, rather than every later hash failing until the web process restarts.
+"""
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import APIException
+
+from apps.monitoring.metrics import timer
+
+DEFAULTS = {
+    "WORKERS": 2,
+    "MAX_PENDING": 8,
+    "QUEUE_TIMEOUT": 2.0,
+}
+
+
+class HashingUnavailable(APIException):
+    status_code = 503
+    default_detail = "The server is busy, please try again in a moment."
+    default_code = "hashing_unavailable"
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "PASSWORD_HASHING", {})}
+
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+def _new_executor(config):
+    if not config["WORKERS"]:
+        return None
+    # spawn, not fork: the parent is a multi-threaded web worker
+    return ProcessPoolExecutor(
+        max_workers=config["WORKERS"],
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "backend.settings"),),
+    )
+
+
+def _get_pool():
+    global _executor, _slots
+    with _lock:
+        if _slots is None:
+            config = get_config()
+            _slots = threading.BoundedSemaphore(config["MAX_PENDING"])
+            _executor = _new_executor(config)
+    return _executor, _slots
+
+
+def _replace_broken(executor):
+    """Swap in a fresh pool for ``executor`` once one of its processes died; return the live one."""
+    global _executor
+    with _lock:
+        if _executor is executor:  # not already replaced by another thread
+            executor.shutdown(wait=False, cancel_futures=True)
+            _executor = _new_executor(get_config())
+        return _executor
+
+
+def shutdown():
+    """Stop the pool (the next hash starts a fresh one with the current settings)."""
+    global _executor, _slots
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = _slots = None
+
+
+def run(fn, *args):
+    """Run ``fn(*args)`` on the pool, shedding load when no slot frees up in time."""
+    executor, slots = _get_pool()
+    if not slots.acquire(timeout=get_config()["QUEUE_TIMEOUT"]):
+        raise HashingUnavailable()
+    try:
+        if executor is None:
+            return fn(*args)
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            return _replace_broken(executor).submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+# ---------- Functions executed in the pool (module-level so they pickle) ----------
+
+def _build_hasher(hasher_spec):
+    if hasher_spec is None:
+        return None
+    path, overrides = hasher_spec
+    hasher = import_string(path)()
+    for attr, value in overrides.items():
+        setattr(hasher, attr, value)
+    return hasher
+
+
+def _make_password(raw_password, hasher_spec=None):
+    return hashers.make_password(raw_password, hasher=_build_hasher(hasher_spec) or "default")
+
+
+def _verify(raw_password, encoded):
+    """Return ``(is_correct, must_update)`` like Django's check_password."""
+    if raw_password is None or not encoded:
+        return False, False
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False, False
+    preferred = hashers.get_hasher("default")
+    is_correct = hasher.verify(raw_password, encoded)
+    must_update = hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+    return is_correct, is_correct and must_update
+
+
+# ---------- Public API ----------
+
+def make_password(raw_password, hasher_spec=None):
+    """
+    Hash ``raw_password`` on the pool. ``hasher_spec`` is an optional
+    ``(dotted_path, {attr: value})`` pair overriding the default hasher.
+    """
+    with timer("password_hash"):
+        return run(_make_password, raw_password, hasher_spec)
+
+
+def make_passwords(raw_passwords, hasher_spec=None):
+    """
+    Hash many passwords in parallel (bulk imports), returning them in order.
+    At most ``WORKERS`` are in flight at once, each holding a slot, so login
+    hashes queued meanwhile wait behind one round at most — and imports wait
+    for slots rather than being shed.
+    """
+    executor, slots = _get_pool()
+    if executor is None:
+        return [make_password(raw, hasher_spec) for raw in raw_passwords]
+
+    raw_passwords = list(raw_passwords)
+    window = get_config()["WORKERS"]
+    in_flight, encoded = deque(), []
+    with timer("password_hash_batch"):
+        try:
+            for raw in raw_passwords:
+                if len(in_flight) >= window:
+                    encoded.append(in_flight.popleft().result())
+                slots.acquire()
+                future = executor.submit(_make_password, raw, hasher_spec)
+                future.add_done_callback(lambda _: slots.release())
+                in_flight.append(future)
+            encoded.extend(future.result() for future in in_flight)
+        except BrokenProcessPool:
+            # Finish on a fresh pool, one hash at a time
+            _replace_broken(executor)
+            encoded.extend(make_password(raw, hasher_spec) for raw in raw_passwords[len(encoded):])
+    return encoded
+
+
+def verify(raw_password, encoded):
+    with timer("password_verify"):
+        return run(_verify, raw_password, encoded)
+
+
+def check_password(user, raw_password):
+    """Pool-backed ``user.check_password``, including the rehash-on-upgrade step."""
+    is_correct, must_update = verify(raw_password, user.password)
+    if must_update:
+        user.password = make_password(raw_password)
+        user.save(update_fields=["password"])
+    return is_correct
+
+
+def set_password(user, raw_password):
+    """Pool-backed ``user.set_password`` (does not save)."""
+    user.password = make_password(raw_password)
+    user._password = raw_password
@@ -0,0 +1,112 @@
+"""
+Canonical identifiers for login and password reset.
+
+``User.email_normalized`` (trimmed, lower-cased email) and ``User.phone_e164``
+(E.164, e.g. ``+919876543210``) are derived from ``email`` / ``phone`` on
+every save and carry unique indexes, so a user can be found by username,
+email or phone with one indexed query. These helpers are plain functions so
+migrations can use them too.
+"""
+import re
+
+from django.conf import settings
+from django.db.models import Q
+
+PHONE_SEPARATORS = re.compile(r"[\s\-().]")
+
+
+def normalize_email(value):
+    value = (value or "").strip().lower()
+    return value or None
+
+
+def normalize_phone(value, country_code=None):
+    """
+    Return ``value`` as E.164 (``+<country code><number>``), or None when it
+    doesn't look like a phone number. Numbers without a country prefix get
+    ``PHONE_DEFAULT_COUNTRY_CODE``.
+    """
+    value = PHONE_SEPARATORS.sub("", value or "")
+    if not value:
+        return None
+    if value.startswith("00"):
+        value = "+" + value[2:]
+    if value.startswith("+"):
+        digits = value[1:]
+    else:
+        if country_code is None:
+            country_code = getattr(settings, "PHONE_DEFAULT_COUNTRY_CODE", "91")
+        digits = country_code + value.lstrip("0")
+    # E.164 allows at most 15 digits; anything under 8 is not a full number
+    if not digits.isdigit() or not 8 <= len(digits) <= 15:
+        return None
+    return "+" + digits
+
+
+def lookup_condition(identifier):
+    """Q matching ``identifier`` as a username, email or phone number."""
+    condition = Q(username=identifier)
+    if "@" in identifier:
+        condition |= Q(email_normalized=normalize_email(identifier))
+    else:
+        phone = normalize_phone(identifier)
+        if phone:
+            condition |= Q(phone_e164=phone)
+    return condition
+
+
+def find_user(identifier, queryset=None):
+    """
+    Resolve a username, email or phone to a user with one query, or None. A
+    username match wins over another account's email / phone.
+    """
+    from .models import User
+
+    identifier = (identifier or "").strip()
+    if not identifier:
+        return None
+    queryset = User._default_manager.all() if queryset is None else queryset
+    return _pick_match(identifier, list(queryset.filter(lookup_condition(identifier))[:3]))
+
+
+async def afind_user(identifier, queryset=None):
+    """``find_user`` for async views, on the async ORM."""
+    from .models import User
+
+    identifier = (identifier or "").strip()
+    if not identifier:
+        return None
+    queryset = User._default_manager.all() if queryset is None else queryset
+    return _pick_match(identifier, [user async for user in queryset.filter(lookup_condition(identifier))[:3]])
+
+
+def _pick_match(identifier, matches):
+    for user in matches:
+        if user.username == identifier:
+            return user
+    return matches[0] if len(matches) == 1 else None
+
+
+def taken_identifiers(email=None, phone=None, exclude_pk=None):
+    """Which of ``email`` / ``phone`` already belong to another user — one query. Returns field errors."""
+    from .models import User
+
+    email, phone = normalize_email(email), normalize_phone(phone)
+    condition = Q()
+    if email:
+        condition |= Q(email_normalized=email)
+    if phone:
+        condition |= Q(phone_e164=phone)
+    if not condition:
+        return {}
+
+    queryset = User._default_manager.filter(condition)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    errors = {}
+    for taken_email, taken_phone in queryset.values_list("email_normalized", "phone_e164")[:2]:
+        if email and taken_email == email:
+            errors["email"] = ["A user with that email already exists."]
+        if phone and taken_phone == phone:
+            errors["phone"] = ["A user with that phone number already exists."]
+    return errors
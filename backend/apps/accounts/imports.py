@@ -0,0 +1,228 @@
+"""
+Bulk user import from CSV or NDJSON.
+
+Rows are read and validated one at a time, so the file is never held in
+memory. Valid rows are grouped into batches of ``BATCH_SIZE``: each batch
+checks for existing usernames / emails / phones with one query, hashes its passwords
+in parallel on the hashing pool and is inserted with ``bulk_create``. Bad
+rows are reported individually and never fail the rest of the file.
+"""
+import codecs
+import csv
+import json
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from . import hashing
+from .identity import normalize_email, normalize_phone
+from .models import User
+from .serializers import ImportUserSerializer
+from .signals import users_bulk_changed
+
+BATCH_SIZE = 500
+# Per-row errors listed in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+CSV = "csv"
+NDJSON = "ndjson"
+FORMATS = (CSV, NDJSON)
+
+
+def detect_format(filename, default=None):
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return CSV
+    if name.endswith((".ndjson", ".jsonl")):
+        return NDJSON
+    return default
+
+
+def read_rows(binary_file, file_format):
+    """Yield ``(line_number, row)``; ``row`` is a dict, or an error message for unparseable lines."""
+    lines = codecs.iterdecode(binary_file, "utf-8-sig")
+    if file_format == CSV:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key}
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, "Invalid JSON."
+            continue
+        yield line_number, row if isinstance(row, dict) else "Each line must be a JSON object."
+
+
+class ImportReport:
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.truncated = False
+        self.errors = []
+
+    def error(self, line, username, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "username": username, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": self.failed,
+            "dry_run": self.dry_run,
+            "truncated": self.truncated,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+        }
+
+
+def _existing(batch):
+    """Usernames, emails and phones of the batch that already belong to a user — one indexed query."""
+    usernames = [data["username"] for _, data in batch]
+    emails = [data["email_normalized"] for _, data in batch]
+    phones = [data["phone_e164"] for _, data in batch if data["phone_e164"]]
+    rows = User.objects.filter(
+        Q(username__in=usernames) | Q(email_normalized__in=emails) | Q(phone_e164__in=phones)
+    ).values_list("username", "email_normalized", "phone_e164")
+    taken = {"username": set(), "email_normalized": set(), "phone_e164": set()}
+    for username, email, phone in rows:
+        taken["username"].add(username)
+        taken["email_normalized"].add(email)
+        taken["phone_e164"].add(phone)
+    return taken
+
+
+# (key in the row data, field reported, message)
+IDENTIFIERS = (
+    ("username", "username", "username"),
+    ("email_normalized", "email", "email"),
+    ("phone_e164", "phone", "phone number"),
+)
+
+
+def _conflicts(data, taken, message):
+    return {
+        field: [message.format(label=label)]
+        for key, field, label in IDENTIFIERS
+        if data[key] and data[key] in taken[key]
+    }
+
+
+def _drop_existing(batch, report):
+    taken = _existing(batch)
+    fresh = []
+    for line, data in batch:
+        errors = _conflicts(data, taken, "A user with that {label} already exists.")
+        if errors:
+            report.error(line, data["username"], errors)
+        else:
+            fresh.append((line, data))
+    return fresh
+
+
+def _create_one_by_one(batch, users, report):
+    """Insert ``users`` with a savepoint each, reporting the rows that still conflict; return the created ones."""
+    lines = {data["username"]: line for line, data in batch}
+    created = []
+    for user in users:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([user])  # no post_save: users_bulk_changed covers them
+        except IntegrityError:
+            report.error(lines[user.username], user.username, {
+                "non_field_errors": ["A user with this username, email or phone was created during the import."]
+            })
+        else:
+            created.append(user)
+    return created
+
+
+def _flush(batch, report):
+    batch = _drop_existing(batch, report)
+    if not batch or report.dry_run:
+        report.created += len(batch)
+        return
+
+    encoded = hashing.make_passwords([data["password"] for _, data in batch])
+    users = [
+        User(
+            username=data["username"],
+            email=data["email"],
+            email_normalized=data["email_normalized"],
+            password=password,
+            phone=data["phone"],
+            phone_e164=data["phone_e164"],
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            role=data["role"],
+            is_active=data["is_active"],
+        )
+        for (_, data), password in zip(batch, encoded)
+    ]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+    except IntegrityError:
+        # Someone registered one of these names since the check: re-check and retry once
+        survivors = {data["username"] for _, data in _drop_existing(batch, report)}
+        users = [user for user in users if user.username in survivors]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+        except IntegrityError:
+            # Still racing with registrations: go row by row so only the conflicting rows fail
+            users = _create_one_by_one(batch, users, report)
+
+    user_ids = [user.pk for user in users]
+    report.created += len(user_ids)
+    # bulk_create skips post_save: stats, rollup and caches hear about it here
+    transaction.on_commit(lambda: users_bulk_changed.send(sender=User, user_ids=user_ids, action="import"))
+
+
+def import_users(rows, batch_size=BATCH_SIZE, max_rows=None, dry_run=False):
+    """Import ``(line_number, row)`` pairs from ``read_rows`` and return the report dict."""
+    report = ImportReport(dry_run=dry_run)
+    seen = {key: set() for key, _, _ in IDENTIFIERS}
+    batch = []
+
+    for line, row in rows:
+        if max_rows is not None and report.rows >= max_rows:
+            report.truncated = True
+            break
+        report.rows += 1
+        if isinstance(row, str):
+            report.error(line, None, {"non_field_errors": [row]})
+            continue
+
+        serializer = ImportUserSerializer(data=row)
+        if not serializer.is_valid():
+            report.error(line, row.get("username"), serializer.errors)
+            continue
+        data = serializer.validated_data
+        # bulk_create skips save(), so fill the canonical columns here
+        data["email_normalized"] = normalize_email(data["email"])
+        data["phone_e164"] = normalize_phone(data["phone"])
+
+        # Duplicates within the file itself
+        errors = _conflicts(data, seen, "Duplicate {label} in this file.")
+        if errors:
+            report.error(line, data["username"], errors)
+            continue
+        for key, _, _ in IDENTIFIERS:
+            seen[key].add(data[key])
+
+        batch.append((line, data))
+        if len(batch) >= batch_size:
+            _flush(batch, report)
+            batch = []
+
+    if batch:
+        _flush(batch, report)
+    return report.as_dict()
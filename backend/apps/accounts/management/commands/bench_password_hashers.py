@@ -0,0 +1,136 @@
+import json
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from apps.accounts import hashing
+
+# The attribute that controls each built-in hasher's work factor
+WORK_FACTOR_ATTRS = {
+    "pbkdf2_sha256": "iterations",
+    "pbkdf2_sha1": "iterations",
+    "argon2": "time_cost",
+    "bcrypt_sha256": "rounds",
+    "bcrypt": "rounds",
+    "scrypt": "work_factor",
+}
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark password hashing through the hashing pool: hashes/sec and "
+        "login (check_password) latency percentiles per hasher and work factor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hasher", action="append", dest="hashers",
+            help="Dotted hasher path from PASSWORD_HASHERS (repeatable). Defaults to PASSWORD_HASHERS[0].",
+        )
+        parser.add_argument(
+            "--work-factor", action="append", type=int, dest="work_factors",
+            help="Work factor to try (repeatable): iterations, rounds, time_cost... Defaults to the hasher's own.",
+        )
+        parser.add_argument("--hashes", type=int, default=50, help="Hashes per throughput run.")
+        parser.add_argument("--logins", type=int, default=200, help="Login checks per latency run.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent request threads.")
+        parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+
+    def handle(self, *args, **options):
+        hasher_paths = options["hashers"] or [settings.PASSWORD_HASHERS[0]]
+        # Verification identifies the hasher from PASSWORD_HASHERS, so others can't be measured
+        unknown = [path for path in hasher_paths if path not in settings.PASSWORD_HASHERS]
+        if unknown:
+            raise CommandError(f"Not in PASSWORD_HASHERS: {', '.join(unknown)}")
+        config = hashing.get_config()
+        results = []
+
+        for path in hasher_paths:
+            algorithm = import_string(path).algorithm
+            attr = WORK_FACTOR_ATTRS.get(algorithm)
+            factors = options["work_factors"] if attr else None
+            for factor in factors or [None]:
+                spec = (path, {attr: factor} if factor is not None else {})
+                results.append(self.bench(spec, factor, options))
+
+        report = {"pool": config, "results": results}
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"Pool: {config['WORKERS']} worker(s), {config['MAX_PENDING']} slots, "
+            f"concurrency {options['concurrency']}"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['hasher']:<50} factor={row['work_factor']!s:<8} "
+                f"{row['hashes_per_sec']:>8.1f} hashes/s   login p50={row['login_p50_ms']:.1f}ms "
+                f"p99={row['login_p99_ms']:.1f}ms   shed={row['shed']}"
+            )
+
+    def _run_concurrently(self, total, concurrency, job):
+        """Run ``job()`` ``total`` times on ``concurrency`` threads; return latencies and shed count."""
+        latencies, shed = [], [0]
+        remaining = [total]
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                try:
+                    job()
+                except hashing.HashingUnavailable:
+                    with lock:
+                        shed[0] += 1
+                    continue
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, shed[0], time.perf_counter() - started
+
+    def bench(self, spec, factor, options):
+        password = "correct-horse-battery-9"
+        encoded = hashing.make_password(password, spec)  # also warms up the pool
+        if not hashing.verify(password, encoded)[0]:
+            raise CommandError(f"{spec[0]} did not verify its own hash; login timings would be meaningless")
+
+        _, hash_shed, hash_elapsed = self._run_concurrently(
+            options["hashes"], options["concurrency"], lambda: hashing.make_password(password, spec)
+        )
+        login_latencies, login_shed, _ = self._run_concurrently(
+            options["logins"], options["concurrency"], lambda: hashing.verify(password, encoded)
+        )
+
+        completed = options["hashes"] - hash_shed
+        return {
+            "hasher": spec[0],
+            "work_factor": factor,
+            "hashes_per_sec": completed / hash_elapsed if hash_elapsed else 0.0,
+            "login_p50_ms": statistics.median(login_latencies) * 1000 if login_latencies else 0.0,
+            "login_p99_ms": percentile(login_latencies, 99) * 1000,
+            "shed": hash_shed + login_shed,
+        }
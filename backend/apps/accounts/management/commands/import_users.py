@@ -0,0 +1,49 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts import imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create users from a CSV or NDJSON file (columns: username, email, "
+        "password, phone, first_name, last_name, role, is_active). Bad rows are "
+        "reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument("--file-format", choices=imports.FORMATS,
+                            help="Defaults to the file extension (.csv, .ndjson/.jsonl).")
+        parser.add_argument("--batch-size", type=int, default=imports.BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate and check duplicates without inserting.")
+        parser.add_argument("--json", action="store_true", help="Print the full report as JSON.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["file_format"] or imports.detect_format(path)
+        if file_format is None:
+            raise CommandError("Can't tell the file format from the name; pass --file-format.")
+
+        try:
+            handle = sys.stdin.buffer if path == "-" else open(path, "rb")
+        except OSError as exc:
+            raise CommandError(f"Can't open {path}: {exc}")
+        with handle:
+            report = imports.import_users(
+                imports.read_rows(handle, file_format),
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']} ({error['username']}): {json.dumps(error['errors'])}")
+        verb = "would be created" if report["dry_run"] else "created"
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['rows']} rows: {report['created']} users {verb}, {report['failed']} failed."
+        ))
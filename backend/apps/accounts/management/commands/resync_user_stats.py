@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts import stats
+
+
+class Command(BaseCommand):
+    help = "Recount users and replace the cached admin dashboard counters (run from cron)."
+
+    def handle(self, *args, **options):
+        snapshot = stats.resync()
+        self.stdout.write(self.style.SUCCESS(f"User stats resynced: {snapshot}"))
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.accounts import activity
+
+
+class Command(BaseCommand):
+    help = "Catch the daily user activity rollup up with the user table (run from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=2,
+                            help="How many recent days to recount (default: 2).")
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Drop the rollup and rebuild it from the whole user table.")
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            rows = activity.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"User activity rollup rebuilt: {rows} rows."))
+            return
+
+        since = timezone.localdate() - timedelta(days=max(options["days"], 1) - 1)
+        rows = activity.catch_up(since)
+        self.stdout.write(self.style.SUCCESS(
+            f"User activity rollup caught up since {since}: {rows} rows updated."
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserActivityDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('role', models.CharField(choices=[('admin', 'Admin'), ('user', 'User')], max_length=10)),
+                ('registered', models.PositiveIntegerField(default=0)),
+                ('logins', models.PositiveIntegerField(default=0)),
+                ('active_delta', models.IntegerField(default=0)),
+                ('held_delta', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['day', 'role'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'role'), name='accounts_activity_day_role_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Trigram GIN indexes for the admin user search (apps.accounts.search).
+#
+# PostgreSQL only: other backends skip this migration's SQL and search with a
+# plain scan. The expressions match what Django emits for ``icontains`` —
+# UPPER("col"::text) LIKE UPPER(%s) — so the planner can use them. Built
+# CONCURRENTLY so existing user tables stay writable while indexing.
+from django.db import migrations
+
+FIELDS = ("username", "email", "first_name", "last_name", "phone")
+
+
+def index_name(field):
+    return f"accounts_user_{field}_trgm_idx"
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for field in FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(field)} '
+            f'ON accounts_user USING gin ((UPPER("{field}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in FIELDS:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name(field)}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0006_user_activity_daily'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,55 @@
+# Fill email_normalized / phone_e164 for existing users before 0010 makes them
+# unique. Where several accounts share an email or phone, the oldest keeps it
+# and the others are left NULL (they can still log in by username and keep
+# saving normally); they are listed on stdout so an admin can sort them out.
+import sys
+
+from django.db import migrations
+
+from apps.accounts.identity import normalize_email, normalize_phone
+
+BATCH_SIZE = 2000
+
+
+def backfill(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    seen_emails, seen_phones = set(), set()
+    duplicates = []
+    batch = []
+
+    for user in User.objects.order_by("id").only("id", "username", "email", "phone").iterator(chunk_size=BATCH_SIZE):
+        email, phone = normalize_email(user.email), normalize_phone(user.phone)
+        if email and email in seen_emails:
+            duplicates.append((user.username, "email", email))
+            email = None
+        if phone and phone in seen_phones:
+            duplicates.append((user.username, "phone", phone))
+            phone = None
+        seen_emails.add(email)
+        seen_phones.add(phone)
+        user.email_normalized, user.phone_e164 = email, phone
+        batch.append(user)
+        if len(batch) >= BATCH_SIZE:
+            User.objects.bulk_update(batch, ["email_normalized", "phone_e164"])
+            batch = []
+    if batch:
+        User.objects.bulk_update(batch, ["email_normalized", "phone_e164"])
+
+    if duplicates:
+        sys.stdout.write(
+            f"\n  accounts: {len(duplicates)} account(s) share an email / phone with an older account. "
+            "Their login by that email / phone stays disabled until it is changed to a unique value:\n"
+        )
+        for username, field, value in duplicates:
+            sys.stdout.write(f"    {username!r}: {field} {value}\n")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_user_identity_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
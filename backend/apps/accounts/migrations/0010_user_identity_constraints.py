@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_backfill_user_identity'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(('email_normalized__isnull', False)), fields=('email_normalized',), name='accounts_user_email_normalized_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(('phone_e164__isnull', False)), fields=('phone_e164',), name='accounts_user_phone_e164_uniq'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:30
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_existing_bumps(apps, schema_editor):
+    # When earlier bumps happened isn't known: treat them as recent, so tokens
+    # they revoked stay refused until every access token issued before now expires
+    User = apps.get_model("accounts", "User")
+    User.objects.filter(token_version__gt=0).update(token_version_changed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_user_revocation_index'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevocationEpoch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epoch', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='accounts_user_revocation_idx',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='token_version_changed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['id'], name='accounts_user_held_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('token_version_changed_at__isnull', False)), fields=['token_version_changed_at'], name='accounts_user_version_bump_idx'),
+        ),
+        migrations.RunPython(mark_existing_bumps, migrations.RunPython.noop),
+    ]
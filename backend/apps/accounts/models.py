@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
+
+from .identity import normalize_email, normalize_phone
 
 class User(AbstractUser):
     phone = models.CharField(max_length=15, unique=False, null=True, blank=True)
@@ -11,5 +14,138 @@ class User(AbstractUser):
     )
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='user')
 
+    # ✅ Embedded in JWT claims ("ver"); bumping it invalidates issued tokens
+    token_version = models.PositiveIntegerField(default=0)
+    # ✅ When it was last bumped: only bumps newer than an access token's lifetime can matter
+    token_version_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # ✅ Canonical forms of email / phone, kept in sync by save() (see apps.accounts.identity)
+    email_normalized = models.CharField(max_length=254, null=True, blank=True, editable=False)
+    phone_e164 = models.CharField(max_length=16, null=True, blank=True, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        # ✅ Composite indexes for the admin listing filters + keyset pagination
+        indexes = [
+            models.Index(fields=['role', 'id'], name='accounts_user_role_id_idx'),
+            models.Index(fields=['is_active', 'id'], name='accounts_user_active_id_idx'),
+            models.Index(fields=['is_staff', 'id'], name='accounts_user_staff_id_idx'),
+            models.Index(fields=['date_joined', 'id'], name='accounts_user_joined_id_idx'),
+            # ✅ Held users and recent token version bumps: the rows apps.accounts.revocation loads
+            models.Index(fields=['id'], condition=models.Q(is_active=False), name='accounts_user_held_idx'),
+            models.Index(
+                fields=['token_version_changed_at'],
+                condition=models.Q(token_version_changed_at__isnull=False),
+                name='accounts_user_version_bump_idx',
+            ),
+        ]
+        # ✅ One account per email / phone; the unique indexes also serve login and OTP lookups
+        constraints = [
+            models.UniqueConstraint(
+                fields=['email_normalized'],
+                condition=models.Q(email_normalized__isnull=False),
+                name='accounts_user_email_normalized_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['phone_e164'],
+                condition=models.Q(phone_e164__isnull=False),
+                name='accounts_user_phone_e164_uniq',
+            ),
+        ]
+
     def __str__(self):
         return self.username
+
+    def sync_identity(self):
+        """Refresh the canonical email / phone (call before bulk_create, which skips save())."""
+        self.email_normalized = normalize_email(self.email)
+        self.phone_e164 = normalize_phone(self.phone)
+
+    def save(self, *args, **kwargs):
+        # ✅ Only re-derive what changed, so the duplicates 0009 left unset stay saveable
+        loaded_identity = getattr(self, "_loaded_identity", {})
+        if self._state.adding or loaded_identity.get("email", object()) != self.email:
+            self.email_normalized = normalize_email(self.email)
+        if self._state.adding or loaded_identity.get("phone", object()) != self.phone:
+            self.phone_e164 = normalize_phone(self.phone)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if "email" in update_fields:
+                update_fields.add("email_normalized")
+            if "phone" in update_fields:
+                update_fields.add("phone_e164")
+
+        # ✅ Putting a user on hold, or changing the role / staff flags that tokens carry as
+        # claims, revokes every token issued so far (see apps.accounts.revocation)
+        loaded = getattr(self, "_loaded_stats_state", None)
+        loaded_privileges = getattr(self, "_loaded_privileges", None)
+        put_on_hold = loaded is not None and loaded[0] and not self.is_active
+        privileges_changed = loaded_privileges is not None and loaded_privileges != self.privileges()
+        if put_on_hold or privileges_changed:
+            self.token_version += 1
+            self.token_version_changed_at = timezone.now()
+            if update_fields is not None:
+                update_fields.update(("token_version", "token_version_changed_at"))
+        if self._state.adding:
+            self._revocation_changed = not self.is_active
+        else:
+            # Unknown previous state: assume it changed
+            self._revocation_changed = loaded is None or loaded[0] != self.is_active or privileges_changed
+
+        if update_fields is not None:
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+        self._loaded_privileges = self.privileges()
+        self._loaded_identity = {"email": self.email, "phone": self.phone}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # ✅ Remember the loaded state so the stats signals can apply deltas
+        if "is_active" in field_names and "role" in field_names:
+            instance._loaded_stats_state = instance.stats_state()
+        # ✅ ...and save() can tell when the claims in issued tokens went stale
+        if {"role", "is_staff", "is_superuser"} <= set(field_names):
+            instance._loaded_privileges = instance.privileges()
+        # ✅ ...and save() only re-derives the canonical email / phone when they change
+        instance._loaded_identity = {
+            field: getattr(instance, field) for field in ("email", "phone") if field in field_names
+        }
+        # ✅ ...and the activity rollup can tell a fresh login from any other save
+        if "last_login" in field_names:
+            instance._loaded_last_login = instance.last_login
+        return instance
+
+    def stats_state(self):
+        return (self.is_active, self.role)
+
+    def privileges(self):
+        return (self.role, self.is_staff, self.is_superuser)
+
+
+class UserActivityDaily(models.Model):
+    """Per-day, per-role activity counters read by the admin reports (see apps.accounts.activity)."""
+    day = models.DateField()
+    role = models.CharField(max_length=10, choices=User.ROLE_CHOICES)
+    registered = models.PositiveIntegerField(default=0)
+    logins = models.PositiveIntegerField(default=0)
+    # Net change in active / held users that day — running sums give the levels
+    active_delta = models.IntegerField(default=0)
+    held_delta = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['day', 'role']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'role'], name='accounts_activity_day_role_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.role}"
+
+
+class RevocationEpoch(models.Model):
+    """One row, bumped whenever a user is held, re-activated or has tokens revoked; processes poll it."""
+    epoch = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"revocation epoch {self.epoch}"
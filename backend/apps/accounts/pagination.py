@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the admin user listings.
+
+    Pages are fetched with ``WHERE id < <cursor> ORDER BY id DESC LIMIT n``,
+    so there is no OFFSET scan and no COUNT(*), and page latency stays flat as
+    the table grows. ``?ordering=date_joined`` (or ``-date_joined``) is also
+    accepted through the view's ``OrderingFilter``.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "-id"
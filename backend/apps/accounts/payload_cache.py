@@ -0,0 +1,163 @@
+"""
+Cached profile and address payloads.
+
+The serialized body of each user's profile and address list is cached under
+``payload:<resource>:<user>:<version token>``, reusing the version tokens
+from ``versioning``. The ``User`` / ``Address`` save and delete signals
+replace the token, so the next read misses and rebuilds without anything
+being deleted. That only holds when every worker sees the bump: with a
+per-process cache another worker would keep serving its old body, so the
+cache is off unless ``caches.is_shared()``. Even then a bump lost to a
+cache eviction leaves a body at most ``TTL_SECONDS`` old.
+
+Stampedes are avoided two ways. Each entry records how long it took to
+build, and a read shortly before expiry may refresh it early ("XFetch",
+probability rising as expiry nears), so hot keys are rebuilt before they
+vanish. And only the request holding the ``<key>:lock`` entry rebuilds: the
+others keep serving the current entry or, on a cold miss, wait up to
+``WAIT_SECONDS`` for the builder's result.
+"""
+import asyncio
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.addresses.models import Address
+from apps.addresses.serializers import AddressSerializer
+
+from . import caches, versioning
+from .authentication import aget_user_instance, get_user_instance
+from .fast_serializers import ValuesSerializer
+from .serializers import UserSerializer
+
+DEFAULTS = {
+    "ENABLED": True,
+    "TTL_SECONDS": 300,
+    "EARLY_REFRESH_BETA": 1.0,
+    "LOCK_SECONDS": 5,
+    "WAIT_SECONDS": 1.0,
+}
+POLL_SECONDS = 0.05
+
+address_values = ValuesSerializer(AddressSerializer)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "PAYLOAD_CACHE", {})}
+
+
+def enabled(config):
+    return config["ENABLED"] and caches.is_shared()
+
+
+def _key(resource, user_id, token):
+    return f"payload:{resource}:{user_id}:{token}"
+
+
+def _fresh(entry, config):
+    """False once the entry has expired or is picked for an early refresh."""
+    payload, expires_at, build_seconds = entry
+    early = -build_seconds * config["EARLY_REFRESH_BETA"] * math.log(1.0 - random.random())
+    return time.time() + early < expires_at
+
+
+def _entry(payload, started, config):
+    now = time.time()
+    return payload, now + config["TTL_SECONDS"], now - started
+
+
+def get_or_build(resource, user_id, build):
+    """Return the cached payload of ``resource`` for ``user_id``, calling ``build()`` when needed."""
+    config = get_config()
+    if not enabled(config):
+        return build()
+
+    key = _key(resource, user_id, versioning.get_version(resource, user_id)[0])
+    entry = cache.get(key)
+    if entry is not None and _fresh(entry, config):
+        return entry[0]
+
+    if cache.add(f"{key}:lock", True, timeout=config["LOCK_SECONDS"]):
+        try:
+            started = time.time()
+            entry = _entry(build(), started, config)
+            cache.set(key, entry, timeout=config["TTL_SECONDS"])
+            return entry[0]
+        finally:
+            cache.delete(f"{key}:lock")
+
+    if entry is not None:
+        return entry[0]  # someone else is refreshing it
+    deadline = time.monotonic() + config["WAIT_SECONDS"]
+    while time.monotonic() < deadline:
+        time.sleep(POLL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    return build()  # the builder is slow or gone; don't keep the client waiting
+
+
+async def aget_or_build(resource, user_id, build):
+    """``get_or_build`` for async views: ``build`` is a coroutine function, cache calls are awaited."""
+    config = get_config()
+    if not enabled(config):
+        return await build()
+
+    key = _key(resource, user_id, (await versioning.aget_version(resource, user_id))[0])
+    entry = await cache.aget(key)
+    if entry is not None and _fresh(entry, config):
+        return entry[0]
+
+    if await cache.aadd(f"{key}:lock", True, timeout=config["LOCK_SECONDS"]):
+        try:
+            started = time.time()
+            entry = _entry(await build(), started, config)
+            await cache.aset(key, entry, timeout=config["TTL_SECONDS"])
+            return entry[0]
+        finally:
+            await cache.adelete(f"{key}:lock")
+
+    if entry is not None:
+        return entry[0]
+    deadline = time.monotonic() + config["WAIT_SECONDS"]
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_SECONDS)
+        entry = await cache.aget(key)
+        if entry is not None:
+            return entry[0]
+    return await build()
+
+
+# ---------- Payloads ----------
+
+def profile_payload(user):
+    """``UserSerializer`` data for ``request.user``."""
+    return get_or_build(
+        versioning.PROFILE, user.pk, lambda: dict(UserSerializer(get_user_instance(user)).data)
+    )
+
+
+def addresses_payload(user_id):
+    """The address list of ``user_id``, as ``AddressSerializer`` renders it."""
+    return get_or_build(
+        versioning.ADDRESSES, user_id,
+        lambda: address_values.to_representation(address_values.values(Address.objects.filter(user_id=user_id))),
+    )
+
+
+async def aprofile_payload(user):
+    async def build():
+        return dict(UserSerializer(await aget_user_instance(user)).data)
+
+    return await aget_or_build(versioning.PROFILE, user.pk, build)
+
+
+async def aaddresses_payload(user_id):
+    async def build():
+        rows = address_values.values(Address.objects.filter(user_id=user_id))
+        return address_values.to_representation([row async for row in rows])
+
+    return await aget_or_build(versioning.ADDRESSES, user_id, build)
@@ -0,0 +1,30 @@
+"""
+orjson-backed JSON renderer.
+
+Select it with ``API_JSON_RENDERER=apps.accounts.renderers.ORJSONRenderer``.
+Output matches DRF's ``JSONRenderer`` with the default compact / unicode
+settings. Types orjson doesn't know (Decimal, lazy strings, querysets...)
+go through DRF's encoder. orjson is optional; without it this falls back
+to ``JSONRenderer``.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_encoder.default, option=option)
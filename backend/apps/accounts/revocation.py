@@ -0,0 +1,139 @@
+"""
+Access-token revocation without a per-request query.
+
+Every token carries the user's ``token_version`` as its ``ver`` claim.
+Putting a user on hold, changing their role or staff / superuser flags, or
+resetting their password bumps the version, so tokens issued earlier (and
+the claims they carry) are rejected even after the user is re-activated.
+
+Each process keeps a snapshot of the users whose access tokens may be
+refused: a bitmap of held user ids, and the token versions bumped within the
+last ``ACCESS_TOKEN_LIFETIME`` (an older bump can't predate a live access
+token). Both come from one query over partial indexes, so the snapshot stays
+small however many users ever reset a password. ``ClaimsJWTAuthentication``
+checks a token against it in memory. Refresh tokens live longer than that
+window and are checked against the user row instead, once per refresh.
+
+Writers call ``publish()``, which bumps the one-row ``RevocationEpoch``
+table. Processes read it by primary key at most every ``POLL_SECONDS`` and
+reload when it moved, so a hold takes effect in every worker within seconds
+whatever the cache backend. They also reload every ``REFRESH_SECONDS``
+regardless, which drops expired bumps and catches changes made without
+``publish()``.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+EPOCH_ID = 1
+
+DEFAULTS = {
+    "POLL_SECONDS": 2,
+    "REFRESH_SECONDS": 60,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "REVOCATION", {})}
+
+
+def bump_values():
+    """``update()`` values that revoke every token issued so far."""
+    return {"token_version": F("token_version") + 1, "token_version_changed_at": timezone.now()}
+
+
+def recent_bumps_since():
+    """Bumps older than this can only affect access tokens that have already expired."""
+    return timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+
+
+def current_epoch():
+    from .models import RevocationEpoch
+
+    return RevocationEpoch.objects.filter(pk=EPOCH_ID).values_list("epoch", flat=True).first()
+
+
+class IdBitmap:
+    """Set of non-negative integer ids, one bit each."""
+    __slots__ = ("bits",)
+
+    def __init__(self, ids=()):
+        ids = list(ids)
+        self.bits = bytearray((max(ids) >> 3) + 1 if ids else 0)
+        for user_id in ids:
+            self.bits[user_id >> 3] |= 1 << (user_id & 7)
+
+    def __contains__(self, user_id):
+        index = user_id >> 3
+        return 0 <= index < len(self.bits) and bool(self.bits[index] & (1 << (user_id & 7)))
+
+    def __len__(self):
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+
+class RevocationSnapshot:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.held = IdBitmap()
+        self.versions = {}  # user id -> token_version, for recent bumps only
+        self.epoch = None
+        self.checked_at = None
+        self.loaded_at = None
+
+    def sync(self):
+        """Reload if the epoch changed or the snapshot is old; at most one epoch read per POLL_SECONDS."""
+        config = get_config()
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < config["POLL_SECONDS"]:
+            return
+        # The first load blocks; later ones are done by one thread while the rest use the old snapshot
+        if not self._lock.acquire(blocking=self.loaded_at is None):
+            return
+        try:
+            if self.checked_at is not None and now - self.checked_at < config["POLL_SECONDS"]:
+                return
+            epoch = current_epoch()
+            stale = self.loaded_at is None or now - self.loaded_at >= config["REFRESH_SECONDS"]
+            if stale or epoch != self.epoch:
+                self._load(epoch)
+            self.checked_at = now
+        finally:
+            self._lock.release()
+
+    def _load(self, epoch):
+        from .models import User
+
+        since = recent_bumps_since()
+        held, versions = [], {}
+        rows = User.objects.filter(Q(is_active=False) | Q(token_version_changed_at__gte=since)).values_list(
+            "id", "is_active", "token_version", "token_version_changed_at"
+        )
+        for user_id, is_active, token_version, changed_at in rows.iterator(chunk_size=10000):
+            if not is_active:
+                held.append(user_id)
+            if changed_at is not None and changed_at >= since:
+                versions[user_id] = token_version
+        self.held, self.versions = IdBitmap(held), versions
+        self.epoch, self.loaded_at = epoch, time.monotonic()
+
+    def is_held(self, user_id):
+        return user_id in self.held
+
+    def is_revoked(self, user_id, token_version):
+        """True when a token with this ``ver`` claim was issued before the user's last bump."""
+        return (token_version or 0) < self.versions.get(user_id, 0)
+
+    def publish(self):
+        """Tell every process to reload (call once the change is committed)."""
+        from .models import RevocationEpoch
+
+        if not RevocationEpoch.objects.filter(pk=EPOCH_ID).update(epoch=F("epoch") + 1):
+            RevocationEpoch.objects.get_or_create(pk=EPOCH_ID, defaults={"epoch": 1})
+        self.checked_at = None  # this process picks it up on its next request
+
+
+snapshot = RevocationSnapshot()
@@ -0,0 +1,53 @@
+"""
+Admin user search (typeahead).
+
+Matches ``q`` as a case-insensitive substring of username, email, first /
+last name and phone. On PostgreSQL those ``icontains`` lookups are served
+by the trigram GIN indexes from migration 0007 and results are ranked by
+trigram similarity; other backends fall back to exact / prefix / substring
+ranking. Either way only the top ``limit`` rows are fetched.
+"""
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from .models import User
+
+SEARCH_FIELDS = ("username", "email", "first_name", "last_name", "phone")
+MIN_QUERY_LENGTH = 2
+
+
+def _match(query):
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f"{field}__icontains": query})
+    return condition
+
+
+def _prefix_rank(query):
+    """3 = exact username/email, 2 = prefix of any field, 1 = substring only."""
+    return Case(
+        When(Q(username__iexact=query) | Q(email__iexact=query), then=Value(3)),
+        When(
+            Q(username__istartswith=query) | Q(email__istartswith=query)
+            | Q(first_name__istartswith=query) | Q(last_name__istartswith=query)
+            | Q(phone__startswith=query),
+            then=Value(2),
+        ),
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+
+
+def search_users(query, limit):
+    queryset = User.objects.filter(_match(query)).annotate(rank=_prefix_rank(query))
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        queryset = queryset.annotate(
+            similarity=Greatest(*(TrigramSimilarity(field, query) for field in SEARCH_FIELDS))
+        )
+        ordering = ["-rank", "-similarity", "id"]
+    else:
+        ordering = ["-rank", "username", "id"]
+    return list(queryset.order_by(*ordering)[:limit])
@@ -1,4 +1,9 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from . import hashing
+from .authentication import check_refresh_revocation
+from .bulk import ACTIONS, CHANGE_ROLE
+from .identity import taken_identifiers
 from .models import User
 
 
@@ -8,22 +13,90 @@ class RegisterSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'first_name', 'last_name', 'email', 'phone', 'password', 'role']
         extra_kwargs = {'password': {'write_only': True}}
 
+    def validate(self, attrs):
+        errors = taken_identifiers(attrs.get('email'), attrs.get('phone'))
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
     def create(self, validated_data):
-        role = validated_data.get('role', 'user')
-        user = User.objects.create_user(
-            username=validated_data['username'],
+        # ✅ Hash on the pool and insert once (role included, no second save)
+        user = User(
+            username=User.normalize_username(validated_data['username']),
             first_name=validated_data.get('first_name', ''),
             last_name=validated_data.get('last_name', ''),
-            email=validated_data['email'],
+            email=User.objects.normalize_email(validated_data['email']),
             phone=validated_data.get('phone', ''),
-            password=validated_data['password'],
+            role=validated_data.get('role', 'user'),
         )
-        user.role = role
+        hashing.set_password(user, validated_data['password'])
         user.save()
         return user
 
 
+class ImportUserSerializer(serializers.Serializer):
+    """One row of a bulk import. Uniqueness is checked per batch in apps.accounts.imports."""
+    username = serializers.CharField(max_length=150, validators=[User.username_validator])
+    email = serializers.EmailField()
+    password = serializers.CharField(min_length=8, max_length=128)
+    phone = serializers.CharField(max_length=15, required=False, allow_blank=True, default='')
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False, default='user')
+    is_active = serializers.BooleanField(required=False, default=True)
+
+    def validate_username(self, value):
+        return User.normalize_username(value)
+
+    def validate_email(self, value):
+        return User.objects.normalize_email(value)
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email', 'phone', 'role', 'is_active']
+
+    def validate(self, attrs):
+        # ✅ Only the email / phone being set need checking
+        errors = taken_identifiers(
+            attrs.get('email'), attrs.get('phone'), exclude_pk=getattr(self.instance, 'pk', None)
+        )
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class BulkUserFilterSerializer(serializers.Serializer):
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    is_active = serializers.BooleanField(required=False)
+    is_staff = serializers.BooleanField(required=False)
+    joined_after = serializers.DateTimeField(required=False)
+    joined_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Filter must include at least one condition.")
+        return attrs
+
+
+class BulkUserActionSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=ACTIONS)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filter = BulkUserFilterSerializer(required=False)
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Provide either 'ids' or 'filter'.")
+        if attrs['action'] == CHANGE_ROLE and 'role' not in attrs:
+            raise serializers.ValidationError({"role": "This field is required for change_role."})
+        return attrs
+
+
+class RevocationAwareTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh tokens issued before a hold / password reset can't mint new access tokens."""
+
+    def validate(self, attrs):
+        check_refresh_revocation(self.token_class(attrs["refresh"]))
+        return super().validate(attrs)
@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import activity, revocation, stats, versioning
+from .authentication import user_cache
+from .models import User
+
+# Sent after a bulk QuerySet.update()/delete() or bulk_create() on users commits
+# (these skip post_save). Arguments: ``user_ids`` and ``action`` ("import" for
+# newly created users).
+users_bulk_changed = Signal()
+
+# Set while a bulk action deletes users: its users_bulk_changed signal does the
+# bookkeeping once, so the per-user post_delete receivers below stand down.
+_bulk_deleting = ContextVar("users_bulk_deleting", default=False)
+
+
+@contextmanager
+def bulk_delete():
+    token = _bulk_deleting.set(True)
+    try:
+        yield
+    finally:
+        _bulk_deleting.reset(token)
+
+
+@receiver(post_save, sender=User)
+def update_counters_on_save(sender, instance, created, **kwargs):
+    new_state = instance.stats_state()
+    if created:
+        stats.apply_change(new_state=new_state)
+        activity.record_registration(instance)
+    else:
+        old_state = getattr(instance, "_loaded_stats_state", None)
+        if old_state is None:
+            # Saved without being loaded from the database — we can't tell what changed.
+            stats.invalidate()
+        elif old_state != new_state:
+            stats.apply_change(old_state, new_state)
+            activity.record_state_change(old_state, new_state)
+    instance._loaded_stats_state = new_state
+
+
+@receiver(post_delete, sender=User)
+def update_counters_on_delete(sender, instance, **kwargs):
+    if _bulk_deleting.get():
+        return
+    old_state = getattr(instance, "_loaded_stats_state", None) or instance.stats_state()
+    stats.apply_change(old_state=old_state)
+    activity.record_state_change(old_state=old_state)
+
+
+@receiver(users_bulk_changed)
+def update_counters_on_bulk_change(sender, user_ids, action=None, **kwargs):
+    stats.invalidate()
+    if action == "import":
+        activity.record_registrations(user_ids)
+    else:
+        activity.reconcile()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    if _bulk_deleting.get():
+        return
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(users_bulk_changed)
+def invalidate_cached_users_on_bulk_change(sender, user_ids, action=None, **kwargs):
+    if action == "import":
+        return  # brand-new users can't be cached yet
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_profile_version(sender, instance, update_fields=None, **kwargs):
+    # A login only saves last_login, which isn't part of the profile payload
+    if _bulk_deleting.get() or update_fields == {"last_login"}:
+        return
+    versioning.bump(versioning.PROFILE, instance.pk)
+
+
+@receiver(users_bulk_changed)
+def bump_profile_versions_on_bulk_change(sender, user_ids, action=None, **kwargs):
+    if action == "import":
+        return
+    for user_id in user_ids:
+        versioning.bump(versioning.PROFILE, user_id)
+
+
+@receiver(post_save, sender=User)
+def publish_revocation_change(sender, instance, **kwargs):
+    # Held / re-activated users: every process reloads its revocation snapshot
+    if getattr(instance, "_revocation_changed", False):
+        transaction.on_commit(revocation.snapshot.publish)
+
+
+@receiver(users_bulk_changed)
+def publish_revocation_change_on_bulk_change(sender, user_ids, action=None, **kwargs):
+    # Holds and role changes bump token versions; activations, deletes and imports change who is held
+    revocation.snapshot.publish()
+
+
+@receiver(post_save, sender=User)
+def record_login_activity(sender, instance, created, update_fields=None, **kwargs):
+    # simplejwt / django.contrib.auth save last_login on every successful login
+    if created or not instance.last_login:
+        return
+    if hasattr(instance, "_loaded_last_login"):
+        logged_in = instance.last_login != instance._loaded_last_login
+    else:
+        logged_in = bool(update_fields) and "last_login" in update_fields
+    if logged_in:
+        activity.record_login(instance)
+    instance._loaded_last_login = instance.last_login
@@ -0,0 +1,152 @@
+"""
+User statistics for the admin dashboard.
+
+Counts are computed in one aggregate query and kept in the cache as running
+counters. The ``User`` save/delete signals apply deltas to those counters and
+a full recount replaces them every ``USER_STATS_RESYNC_SECONDS``, so reading
+the stats never touches the user table between resyncs.
+
+With a per-process cache (local memory) a worker never sees the deltas
+applied by the others, so it recounts every ``USER_STATS_LOCAL_RESYNC_SECONDS``
+instead; use a shared cache to get changes from every worker immediately.
+"""
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from . import caches
+from .models import User
+
+KEY_PREFIX = "user_stats"
+TOTAL_KEY = f"{KEY_PREFIX}:total"
+ACTIVE_KEY = f"{KEY_PREFIX}:active"
+HELD_KEY = f"{KEY_PREFIX}:held"
+SYNCED_AT_KEY = f"{KEY_PREFIX}:synced_at"
+VERSION_KEY = f"{KEY_PREFIX}:version"
+
+
+def role_key(role):
+    return f"{KEY_PREFIX}:role:{role}"
+
+
+def _count_keys():
+    return [TOTAL_KEY, ACTIVE_KEY, HELD_KEY] + [role_key(role) for role, _ in User.ROLE_CHOICES]
+
+
+def _all_keys():
+    return _count_keys() + [SYNCED_AT_KEY]
+
+
+def resync_seconds():
+    """How old the counters may get before a read recounts them."""
+    seconds = getattr(settings, "USER_STATS_RESYNC_SECONDS", 300)
+    if not caches.is_shared():
+        # Deltas from other workers never reach this cache; recount often instead
+        seconds = min(seconds, getattr(settings, "USER_STATS_LOCAL_RESYNC_SECONDS", 10))
+    return seconds
+
+
+def compute_user_stats():
+    """Count total, active, held and per-role users in a single query."""
+    aggregates = {
+        "total": Count("id"),
+        "active": Count("id", filter=Q(is_active=True)),
+        "held": Count("id", filter=Q(is_active=False)),
+    }
+    for role, _ in User.ROLE_CHOICES:
+        aggregates[f"role_{role}"] = Count("id", filter=Q(role=role))
+    return User.objects.aggregate(**aggregates)
+
+
+def resync():
+    """
+    Replace the cached counters with a full recount and return the snapshot.
+    Open streams are notified when the recount differs from the counters.
+    """
+    counts = compute_user_stats()
+    previous = cache.get_many(_count_keys())
+    values = {
+        TOTAL_KEY: counts["total"],
+        ACTIVE_KEY: counts["active"],
+        HELD_KEY: counts["held"],
+        SYNCED_AT_KEY: time.time(),
+    }
+    for role, _ in User.ROLE_CHOICES:
+        values[role_key(role)] = counts[f"role_{role}"]
+    cache.set_many(values, timeout=None)
+    if any(previous.get(key) != values[key] for key in _count_keys()):
+        bump_version()
+    return _snapshot(values)
+
+
+def invalidate():
+    """Force a full recount on the next read."""
+    cache.delete(SYNCED_AT_KEY)
+    bump_version()
+
+
+def get_version():
+    """Return the change counter that streaming clients use as a cursor."""
+    return cache.get(VERSION_KEY, 0)
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 1, timeout=None)
+
+
+def get_user_stats():
+    """Return the current stats snapshot, recounting only when it is stale."""
+    values = cache.get_many(_all_keys())
+    synced_at = values.get(SYNCED_AT_KEY)
+    if (
+        len(values) < len(_all_keys())
+        or synced_at is None
+        or time.time() - synced_at > resync_seconds()
+    ):
+        return resync()
+    return _snapshot(values)
+
+
+def _snapshot(values):
+    return {
+        "total_users": values[TOTAL_KEY],
+        "active_users": values[ACTIVE_KEY],
+        "hold_users": values[HELD_KEY],
+        "roles": {role: values[role_key(role)] for role, _ in User.ROLE_CHOICES},
+    }
+
+
+def _state_keys(is_active, role):
+    return [TOTAL_KEY, ACTIVE_KEY if is_active else HELD_KEY, role_key(role)]
+
+
+def apply_change(old_state=None, new_state=None):
+    """
+    Move one user between counters.
+
+    ``old_state`` and ``new_state`` are ``(is_active, role)`` tuples; pass
+    ``None`` for a user that did not exist before (create) or no longer
+    exists (delete).
+    """
+    deltas = Counter()
+    if old_state is not None:
+        for key in _state_keys(*old_state):
+            deltas[key] -= 1
+    if new_state is not None:
+        for key in _state_keys(*new_state):
+            deltas[key] += 1
+
+    try:
+        for key, delta in deltas.items():
+            if delta:
+                cache.incr(key, delta)
+    except ValueError:
+        # A counter is missing (cold or evicted cache) — recount on next read.
+        cache.delete(SYNCED_AT_KEY)
+    bump_version()
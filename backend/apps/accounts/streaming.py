@@ -0,0 +1,174 @@
+"""
+Server-Sent Events fan-out for the admin dashboard stats.
+
+One poller thread per process watches the stats version counter (a single
+cache read per ``USER_STATS_STREAM_POLL_SECONDS``) and, when it changes,
+reads the snapshot once and wakes every connected admin. Idle connections
+only receive a keep-alive comment every ``USER_STATS_STREAM_HEARTBEAT_SECONDS``.
+
+``events()`` holds a server thread per connection (WSGI), so a process
+serves at most ``USER_STATS_STREAM_MAX_SYNC_CONNECTIONS`` of them and further
+dashboards are told to poll. ``aevents()`` is the same stream as an async
+generator for ASGI, where each connection is only an ``asyncio.Event`` that
+the poller sets from its thread.
+
+The version counter only moves across workers with a shared cache; with a
+per-process cache the poller recounts periodically instead (``stats``).
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.renderers import BaseRenderer
+
+from . import caches, stats
+
+logger = logging.getLogger(__name__)
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF negotiate ``text/event-stream`` and renders errors as an SSE event."""
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event(json.dumps(data), event="error")
+
+
+def format_event(data, event=None, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+class StatsBroadcaster:
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._subscribers = 0
+        self._sync_streams = 0
+        self._waiters = set()  # (event loop, asyncio.Event) per async connection
+        self._poller = None
+        self._version = None
+        self._payload = None
+
+    def accepts_sync_stream(self):
+        """False when this process's threads are already taken by ``events()`` streams."""
+        limit = getattr(settings, "USER_STATS_STREAM_MAX_SYNC_CONNECTIONS", 4)
+        with self._condition:
+            return self._sync_streams < limit
+
+    def events(self, last_event_id=None):
+        """Yield SSE frames for one client until the stream's max lifetime ends."""
+        heartbeat = getattr(settings, "USER_STATS_STREAM_HEARTBEAT_SECONDS", 15)
+        deadline = time.monotonic() + getattr(settings, "USER_STATS_STREAM_MAX_SECONDS", 300)
+        seen = last_event_id
+        self._subscribe(sync=True)
+        try:
+            while time.monotonic() < deadline:
+                with self._condition:
+                    if self._version is None or str(self._version) == seen:
+                        self._condition.wait(timeout=heartbeat)
+                    version, payload = self._version, self._payload
+
+                if version is not None and str(version) != seen:
+                    seen = str(version)
+                    yield format_event(payload, event="stats", event_id=version)
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            self._unsubscribe(sync=True)
+
+    async def aevents(self, last_event_id=None):
+        """``events()`` as an async generator: waiting costs no thread."""
+        heartbeat = getattr(settings, "USER_STATS_STREAM_HEARTBEAT_SECONDS", 15)
+        deadline = time.monotonic() + getattr(settings, "USER_STATS_STREAM_MAX_SECONDS", 300)
+        seen = last_event_id
+        wakeup = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), wakeup)
+        self._subscribe(waiter)
+        try:
+            while time.monotonic() < deadline:
+                with self._condition:
+                    # Cleared under the lock, so a change published after this read still wakes us
+                    waiting = self._version is None or str(self._version) == seen
+                    if waiting:
+                        wakeup.clear()
+                if waiting:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), timeout=heartbeat)
+                    except asyncio.TimeoutError:
+                        pass
+                with self._condition:
+                    version, payload = self._version, self._payload
+
+                if version is not None and str(version) != seen:
+                    seen = str(version)
+                    yield format_event(payload, event="stats", event_id=version)
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            self._unsubscribe(waiter)
+
+    def _subscribe(self, waiter=None, sync=False):
+        with self._condition:
+            self._subscribers += 1
+            self._sync_streams += sync
+            if waiter is not None:
+                self._waiters.add(waiter)
+            if self._poller is None or not self._poller.is_alive():
+                self._poller = threading.Thread(
+                    target=self._poll, name="user-stats-stream", daemon=True
+                )
+                self._poller.start()
+
+    def _unsubscribe(self, waiter=None, sync=False):
+        with self._condition:
+            self._subscribers -= 1
+            self._sync_streams -= sync
+            self._waiters.discard(waiter)
+
+    def _wake_async_waiters(self):
+        # Called with the condition held; asyncio.Event isn't thread-safe, so set it on its loop
+        for loop, event in self._waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+    def _poll(self):
+        interval = getattr(settings, "USER_STATS_STREAM_POLL_SECONDS", 1)
+        while True:
+            with self._condition:
+                if self._subscribers <= 0:
+                    self._poller = None
+                    return
+            try:
+                if not caches.is_shared():
+                    # Recounts once the local counters are stale, bumping the version on a change
+                    stats.get_user_stats()
+                version = stats.get_version()
+                if version != self._version:
+                    # Computed once per change, shared by every connected admin
+                    payload = json.dumps(stats.get_user_stats())
+                    with self._condition:
+                        self._version, self._payload = version, payload
+                        self._condition.notify_all()
+                        self._wake_async_waiters()
+            except Exception:
+                logger.exception("User stats stream poll failed")
+            finally:
+                # The poller outlives requests, so give back its DB connection
+                close_old_connections()
+            time.sleep(interval)
+
+
+broadcaster = StatsBroadcaster()
@@ -0,0 +1,323 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.addresses.models import Address
+
+from . import activity, bulk, exports, imports, payload_cache, revocation, stats, versioning
+from .authentication import ClaimsUser
+from .models import User, UserActivityDaily
+from .streaming import broadcaster
+from .views import CustomTokenObtainPairSerializer
+
+
+class UserStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_resync_bumps_version_only_when_counts_change(self):
+        stats.resync()
+        version = stats.get_version()
+
+        stats.resync()
+        self.assertEqual(stats.get_version(), version)
+
+        # A write the signals never saw (another worker, raw SQL)
+        User.objects.bulk_create([User(username="ghost")])
+        snapshot = stats.resync()
+        self.assertEqual(snapshot["total_users"], 1)
+        self.assertGreater(stats.get_version(), version)
+
+    @override_settings(USER_STATS_RESYNC_SECONDS=300, USER_STATS_LOCAL_RESYNC_SECONDS=0)
+    def test_per_process_cache_recounts_instead_of_trusting_counters(self):
+        stats.resync()
+        User.objects.bulk_create([User(username="ghost")])
+        self.assertEqual(stats.get_user_stats()["total_users"], 1)
+
+    @override_settings(USER_STATS_STREAM_MAX_SYNC_CONNECTIONS=0)
+    def test_sync_stream_over_capacity_asks_client_to_poll(self):
+        admin = User.objects.create_user("admin", password="pw", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        self.assertFalse(broadcaster.accepts_sync_stream())
+        response = client.get("/api/auth/admin/stats/stream/", HTTP_ACCEPT="application/json")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "60")
+
+
+@override_settings(ACTIVITY_LOGIN_FLUSH_SECONDS=3600)
+class LoginActivityTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(activity, "login_counter", activity.LoginCounter())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user("ravi", password="pw")
+
+    def login(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.last_login = timezone.now()
+        user.save(update_fields=["last_login"])
+
+    def test_logins_are_batched_into_one_rollup_update(self):
+        self.login()
+        self.login()
+        self.assertEqual(UserActivityDaily.objects.filter(logins__gt=0).count(), 0)
+
+        self.assertEqual(activity.login_counter.flush(), 2)
+        self.assertEqual(UserActivityDaily.objects.get(day=timezone.localdate(), role="user").logins, 2)
+
+    def test_login_keeps_the_profile_version(self):
+        with mock.patch.object(versioning, "bump") as bump:
+            self.login()
+        bump.assert_not_called()
+
+
+class ExportTests(TestCase):
+    def test_csv_quotes_cells_a_spreadsheet_would_evaluate(self):
+        User.objects.create_user("=HYPERLINK(\"http://x\")", first_name="@SUM(A1)", last_name="-2+3", phone="+919876543210")
+        body = "".join(exports.csv_stream(exports.joined_rows()))
+        row = body.splitlines()[1]
+        self.assertIn("'=HYPERLINK", row)
+        self.assertIn("'@SUM(A1)", row)
+        self.assertIn("'-2+3", row)
+        self.assertIn("'+919876543210", row)
+
+
+class PayloadCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.build = mock.Mock(side_effect=lambda: {"calls": self.build.call_count})
+
+    def test_per_process_cache_always_rebuilds(self):
+        payload_cache.get_or_build(versioning.PROFILE, 1, self.build)
+        payload_cache.get_or_build(versioning.PROFILE, 1, self.build)
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_shared_cache_rebuilds_after_a_version_bump(self):
+        with mock.patch("apps.accounts.caches.is_shared", return_value=True):
+            first = payload_cache.get_or_build(versioning.PROFILE, 1, self.build)
+            self.assertEqual(payload_cache.get_or_build(versioning.PROFILE, 1, self.build), first)
+            versioning.bump(versioning.PROFILE, 1)
+            self.assertNotEqual(payload_cache.get_or_build(versioning.PROFILE, 1, self.build), first)
+        self.assertEqual(self.build.call_count, 2)
+
+
+class IdentityTests(TestCase):
+    def test_duplicate_left_unset_by_the_backfill_can_still_be_saved(self):
+        User.objects.create_user("first", email="Shared@example.com")
+        second = User.objects.create_user("second", email="second@example.com")
+        # What 0009 leaves behind for a younger account sharing an email
+        User.objects.filter(pk=second.pk).update(email="shared@example.com", email_normalized=None)
+
+        second = User.objects.get(pk=second.pk)
+        second.first_name = "Second"
+        second.save()
+        second.refresh_from_db()
+        self.assertIsNone(second.email_normalized)
+
+        second.email = " Second@Example.com "
+        second.save()
+        second.refresh_from_db()
+        self.assertEqual(second.email_normalized, "second@example.com")
+
+
+@override_settings(PASSWORD_HASHING={"WORKERS": 0})
+class ImportTests(TestCase):
+    def rows(self, *usernames):
+        return [(line, {"username": name, "email": f"{name}@example.com", "password": "s3cret-pass"})
+                for line, name in enumerate(usernames, start=2)]
+
+    def test_rows_registered_during_the_import_fail_alone(self):
+        User.objects.create_user("other", email="b@example.com")
+        # The pre-insert check misses it, as if it registered between the check and the insert
+        missed = {"username": set(), "email_normalized": set(), "phone_e164": set()}
+        with mock.patch.object(imports, "_existing", return_value=missed):
+            report = imports.import_users(self.rows("a", "b", "c"))
+
+        self.assertEqual((report["created"], report["failed"]), (2, 1))
+        self.assertEqual([(error["line"], error["username"]) for error in report["errors"]], [(3, "b")])
+        self.assertEqual(sorted(User.objects.values_list("username", flat=True)), ["a", "c", "other"])
+
+
+class BulkActionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user("admin", password="pw", is_staff=True, role="admin")
+        self.users = [User.objects.create_user(f"user{i}", password="pw") for i in range(3)]
+        self.ids = [user.pk for user in self.users]
+
+    def test_hold_revokes_tokens_and_updates_stats(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            results = bulk.apply_bulk_action(bulk.HOLD, self.ids + [self.admin.pk], self.admin)
+
+        self.assertEqual(results[self.admin.pk], "skipped")
+        self.assertEqual(
+            list(User.objects.filter(pk__in=self.ids).values_list("is_active", "token_version")),
+            [(False, 1)] * 3,
+        )
+        snapshot = stats.get_user_stats()
+        self.assertEqual((snapshot["active_users"], snapshot["hold_users"]), (1, 3))
+
+    def test_delete_books_once_through_the_bulk_signal(self):
+        Address.objects.create(user=self.users[0], city="Hyderabad", postal_code="500016")
+        with (
+            mock.patch.object(stats, "apply_change") as apply_change,
+            mock.patch.object(activity, "record_state_change") as record_state_change,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            results = bulk.apply_bulk_action(bulk.DELETE, self.ids, self.admin)
+
+        self.assertEqual(set(results.values()), {"deleted"})
+        apply_change.assert_not_called()
+        record_state_change.assert_not_called()
+        self.assertFalse(Address.objects.exists())
+        self.assertEqual(stats.get_user_stats()["total_users"], 1)
+        # The rollup books the three deletions once: no active / held users left in "user"
+        self.assertEqual(activity._recorded_levels()["user"], (0, 0))
+
+
+# Reload the revocation snapshot on every request, so tests don't wait for the poll
+@override_settings(REVOCATION={"POLL_SECONDS": 0, "REFRESH_SECONDS": 0})
+class ClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user("boss", password="pw", is_staff=True, role="admin")
+        self.user = User.objects.create_user("ravi", email="ravi@example.com", password="pw")
+        self.client = APIClient()
+
+    def login(self, user):
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
+        return str(refresh.access_token), str(refresh)
+
+    def get(self, path, access):
+        return self.client.get(path, HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def refresh(self, refresh):
+        return self.client.post("/api/auth/token/refresh/", {"refresh": refresh}, format="json")
+
+    def test_admin_claims_authorize_without_a_user_query(self):
+        access, _ = self.login(self.admin)
+        self.assertEqual(self.get("/api/auth/admin/stats/", access).status_code, 200)
+        self.assertEqual(self.get("/api/auth/admin/stats/", self.login(self.user)[0]).status_code, 403)
+
+    def test_demoted_admin_loses_access_and_cannot_refresh(self):
+        access, refresh = self.login(self.admin)
+        self.assertEqual(self.get("/api/auth/admin/users/", access).status_code, 200)
+
+        admin = User.objects.get(pk=self.admin.pk)
+        admin.is_staff, admin.role = False, "user"
+        admin.save()
+
+        response = self.get("/api/auth/admin/users/", access)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["code"], "token_revoked")
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+        # A fresh login carries the new claims
+        self.assertEqual(self.get("/api/auth/admin/users/", self.login(admin)[0]).status_code, 403)
+
+    def test_held_user_is_refused_and_old_tokens_stay_revoked(self):
+        access, refresh = self.login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.apply_bulk_action(bulk.HOLD, [self.user.pk], self.admin)
+
+        response = self.get("/api/auth/profile/", access)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["code"], "user_inactive")
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.apply_bulk_action(bulk.ACTIVATE, [self.user.pk], self.admin)
+        # Reactivation doesn't bring back the tokens issued before the hold
+        self.assertEqual(self.get("/api/auth/profile/", access).status_code, 401)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(self.get("/api/auth/profile/", self.login(user)[0]).status_code, 200)
+
+    def test_bulk_role_change_revokes_tokens(self):
+        access, refresh = self.login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.apply_bulk_action(bulk.CHANGE_ROLE, [self.user.pk], self.admin, role="admin")
+
+        self.assertEqual(self.get("/api/auth/profile/", access).status_code, 401)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+    def test_request_user_saves_through_the_user_row(self):
+        request_user = ClaimsUser(AccessToken(self.login(self.user)[0]))
+        update_last_login(None, request_user)
+        request_user.set_password("new-password-1")
+        request_user.save()
+
+        user = User.objects.get(pk=self.user.pk)
+        self.assertIsNotNone(user.last_login)
+        self.assertTrue(user.check_password("new-password-1"))
+
+    def test_unrelated_save_keeps_tokens_valid(self):
+        access, refresh = self.login(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = "Ravi"
+        user.save()
+
+        self.assertEqual(self.get("/api/auth/profile/", access).status_code, 200)
+        self.assertEqual(self.refresh(refresh).status_code, 200)
+
+
+# Poll the epoch on every request, but never fall back to the periodic full reload
+@override_settings(REVOCATION={"POLL_SECONDS": 0, "REFRESH_SECONDS": 3600})
+class RevocationSnapshotTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ravi", password="pw")
+        # Another worker's snapshot, loaded before the change
+        self.other = revocation.RevocationSnapshot()
+        self.other.sync()
+
+    def test_hold_reaches_other_processes_through_the_epoch_row(self):
+        cache.clear()  # nothing shared through the (per-process) cache
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.other.sync()
+        self.assertTrue(self.other.is_held(self.user.pk))
+        self.assertTrue(self.other.is_revoked(self.user.pk, 0))
+
+    def test_only_recent_bumps_are_kept(self):
+        refresh = CustomTokenObtainPairSerializer.get_token(self.user)
+        long_ago = timezone.now() - timedelta(days=1)
+        User.objects.filter(pk=self.user.pk).update(token_version=1, token_version_changed_at=long_ago)
+        revocation.snapshot.publish()
+
+        self.other.sync()
+        self.assertEqual(self.other.versions, {})
+        # Refresh tokens outlive that window and are checked against the row
+        response = APIClient().post("/api/auth/token/refresh/", {"refresh": str(refresh)}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(THROTTLE_RATES={"login.ip": "2/m", "login.account": "5/m"})
+class ThrottleTests(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.client = APIClient()
+
+    def login(self, username, **headers):
+        return self.client.post("/api/auth/login/", {"username": username, "password": "wrong"}, format="json", **headers)
+
+    def test_forged_forwarded_for_does_not_reset_the_ip_bucket(self):
+        responses = [
+            self.login(f"user{i}", HTTP_X_FORWARDED_FOR=f"10.0.0.{i}") for i in range(3)
+        ]
+        self.assertNotEqual(responses[1].status_code, 429)
+        self.assertEqual(responses[2].status_code, 429)
+        self.assertIn("Retry-After", responses[2])
+
+    def test_account_bucket_spans_ips_and_spellings(self):
+        for i, username in enumerate(["Ravi@Mail.com", "ravi@mail.com ", "RAVI@mail.com"] * 2):
+            response = self.login(username, REMOTE_ADDR=f"10.0.1.{i}")
+        self.assertEqual(response.status_code, 429)
@@ -0,0 +1,204 @@
+"""
+Rate limiting and load shedding for the unauthenticated endpoints.
+
+Login, registration and the OTP endpoints each turn a request into a
+password hash, an insert or an email, so they are throttled with token
+buckets keyed on the client IP *and* on the account being targeted
+(username / email / phone, canonicalized so variants share a bucket). The
+client IP honours ``REST_FRAMEWORK["NUM_PROXIES"]``, so a forged
+``X-Forwarded-For`` can't buy a fresh bucket.
+Buckets live in the ``THROTTLE_CACHE_ALIAS`` cache — local memory by
+default, or a file / shared cache so every worker sees the same counts.
+DRF checks throttles before the view runs, so a throttled request costs one
+cache read and gets a 429 with ``Retry-After``.
+
+``AdaptiveSheddingMiddleware`` adds a second line of defence: it tracks the
+latency of those endpoints and, once it rises above a target, rejects a
+growing share of new requests with a 503 before they reach the database.
+"""
+import hashlib
+import random
+import re
+import threading
+import time
+from math import ceil
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+from .identity import normalize_email, normalize_phone
+
+RATE_PATTERN = re.compile(r"^(\d+)/(\d*)([smhd])")
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Striped locks make each bucket update atomic within a process
+_locks = [threading.Lock() for _ in range(64)]
+
+
+def parse_rate(rate):
+    """``"10/min"``, ``"3/15m"``, ``"100/h"`` → (capacity, tokens per second); None disables."""
+    if not rate:
+        return None
+    match = RATE_PATTERN.match(rate)
+    if match is None:
+        raise ValueError(f"Invalid throttle rate {rate!r}")
+    capacity, multiplier, unit = int(match.group(1)), int(match.group(2) or 1), match.group(3)
+    return capacity, capacity / (multiplier * PERIODS[unit])
+
+
+def take(key, capacity, refill_per_second):
+    """Take one token from the bucket at ``key``. Returns (allowed, seconds until a token is available)."""
+    cache = caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+    with _locks[hash(key) % len(_locks)]:
+        now = time.time()
+        state = cache.get(key)
+        if state is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, state[0] + (now - state[1]) * refill_per_second)
+        if tokens < 1:
+            return False, (1 - tokens) / refill_per_second
+        # Once the bucket would be full again the entry can simply expire
+        cache.set(key, (tokens - 1, now), timeout=ceil(capacity / refill_per_second) + 1)
+        return True, 0.0
+
+
+def canonical_identifier(value):
+    """Same bucket for ``Ravi@Mail.com`` / ``ravi@mail.com`` and ``98765 43210`` / ``+919876543210``."""
+    value = str(value or "").strip()
+    if not value:
+        return None
+    if "@" in value:
+        return normalize_email(value)
+    return normalize_phone(value) or value.lower()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Applies one bucket per key kind. Subclasses set ``scope`` and
+    ``identifier_fields``; rates come from ``THROTTLE_RATES["<scope>.ip"]``
+    and ``THROTTLE_RATES["<scope>.account"]`` (missing rate = unlimited).
+    """
+    scope = None
+    identifier_fields = ()
+
+    def get_keys(self, request):
+        keys = {"ip": self.get_ident(request)}
+        for field in self.identifier_fields:
+            try:
+                identifier = canonical_identifier(request.data.get(field))
+            except AttributeError:  # body isn't a dict (e.g. a JSON list)
+                identifier = None
+            if identifier:
+                keys["account"] = identifier
+                break
+        return keys
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        rates = getattr(settings, "THROTTLE_RATES", {})
+        for kind, ident in self.get_keys(request).items():
+            rate = parse_rate(rates.get(f"{self.scope}.{kind}"))
+            if rate is None or not ident:
+                continue
+            digest = hashlib.sha256(str(ident).encode()).hexdigest()[:32]
+            allowed, wait = take(f"throttle:{self.scope}.{kind}:{digest}", *rate)
+            if not allowed:
+                self.retry_after = wait
+                return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class LoginThrottle(TokenBucketThrottle):
+    scope = "login"
+    identifier_fields = ("username",)
+
+
+class RegisterThrottle(TokenBucketThrottle):
+    scope = "register"
+    identifier_fields = ("email",)
+
+
+class SendOTPThrottle(TokenBucketThrottle):
+    scope = "otp_send"
+    identifier_fields = ("identifier", "email")
+
+
+class VerifyOTPThrottle(TokenBucketThrottle):
+    scope = "otp_verify"
+    identifier_fields = ("identifier", "email")
+
+
+class AdaptiveSheddingMiddleware:
+    """
+    Tracks an exponentially weighted moving average of the latency of
+    ``LOAD_SHEDDING["PATHS"]``. Above ``TARGET_MS`` it rejects new requests
+    to those paths with probability ``(ewma - target) / target`` (capped at
+    ``MAX_DROP``, so some traffic still gets through and measures recovery).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lock = threading.Lock()
+        self.ewma_ms = 0.0
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _config(self):
+        return getattr(settings, "LOAD_SHEDDING", {})
+
+    def drop_probability(self, config):
+        target = config.get("TARGET_MS", 1000)
+        if self.ewma_ms <= target:
+            return 0.0
+        return min(config.get("MAX_DROP", 0.9), (self.ewma_ms - target) / target)
+
+    def applies_to(self, request, config):
+        return config.get("ENABLED") and request.path.startswith(tuple(config.get("PATHS", ())))
+
+    def shed_response(self):
+        response = JsonResponse(
+            {"detail": "The server is busy, please try again in a moment."}, status=503
+        )
+        response["Retry-After"] = "1"
+        return response
+
+    def observe(self, config, elapsed_ms):
+        alpha = config.get("SMOOTHING", 0.1)
+        with self.lock:
+            self.ewma_ms += alpha * (elapsed_ms - self.ewma_ms)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = self._config()
+        if not self.applies_to(request, config):
+            return self.get_response(request)
+        if random.random() < self.drop_probability(config):
+            return self.shed_response()
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(config, (time.perf_counter() - start) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        config = self._config()
+        if not self.applies_to(request, config):
+            return await self.get_response(request)
+        if random.random() < self.drop_probability(config):
+            return self.shed_response()
+
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(config, (time.perf_counter() - start) * 1000)
+        return response
@@ -1,23 +1,45 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     register_user,
     profile_view,
+    bootstrap_view,
     CustomTokenObtainPairView,
     AdminUserListCreateAPIView,
     AdminUserUpdateDeleteAPIView,
+    AdminUserBulkActionAPIView,
     AdminUserStatsAPIView,
+    AdminUserStatsStreamAPIView,
+    AdminUserExportAPIView,
+    AdminActivityReportAPIView,
+    AdminUserImportAPIView,
+    AdminUserSearchAPIView,
 )
 
+if settings.USE_ASYNC_VIEWS:
+    # ✅ ASGI deployments: profile reads and the stats stream run as async views
+    from .async_views import profile_view, stats_stream_view
+else:
+    stats_stream_view = AdminUserStatsStreamAPIView.as_view()
+
 urlpatterns = [
     path("login/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
 
     path("register/", register_user, name="register_user"),
     path("profile/", profile_view, name="profile_view"),
+    path("bootstrap/", bootstrap_view, name="session-bootstrap"),
 
     # Admin user management
     path("admin/users/", AdminUserListCreateAPIView.as_view(), name="admin-user-list"),
+    path("admin/users/bulk/", AdminUserBulkActionAPIView.as_view(), name="admin-user-bulk"),
+    path("admin/users/search/", AdminUserSearchAPIView.as_view(), name="admin-user-search"),
+    path("admin/users/import/", AdminUserImportAPIView.as_view(), name="admin-user-import"),
     path("admin/users/<int:pk>/", AdminUserUpdateDeleteAPIView.as_view(), name="admin-user-detail"),
     path("admin/stats/", AdminUserStatsAPIView.as_view(), name="admin-user-stats"),
+    path("admin/export/users.csv", AdminUserExportAPIView.as_view(), {"export_format": "csv"}, name="admin-user-export-csv"),
+    path("admin/export/users.ndjson", AdminUserExportAPIView.as_view(), {"export_format": "ndjson"}, name="admin-user-export-ndjson"),
+    path("admin/reports/activity/", AdminActivityReportAPIView.as_view(), name="admin-activity-report"),
+    path("admin/stats/stream/", stats_stream_view, name="admin-user-stats-stream"),
 ]
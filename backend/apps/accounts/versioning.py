@@ -0,0 +1,116 @@
+"""
+Per-user resource versions for conditional requests.
+
+Every (resource, user) pair has a version token in the cache that the
+``User`` / ``Address`` signals replace on each write. ETag and Last-Modified
+are derived from that token alone, so ``If-None-Match`` is answered with a
+304 without reading the row or serializing anything, and ``If-Match`` lets a
+client update without re-fetching first (412 if someone else wrote since).
+
+A bump is only seen by every worker when the default cache is shared; with
+a per-process cache another worker would answer 304 for a body that has
+changed. So validators are only issued (and preconditions only evaluated)
+when ``caches.is_shared()``; otherwise responses carry no ETag.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from . import caches
+
+PROFILE = "profile"
+ADDRESSES = "addresses"
+
+
+def _key(resource, user_id):
+    return f"resource_version:{resource}:{user_id}"
+
+
+def _ttl():
+    # Bounds how long a missed bump can serve a stale 304
+    return getattr(settings, "RESOURCE_VERSION_TTL", 300)
+
+
+def enabled():
+    """True when version tokens are shared by every worker, so validators can be trusted."""
+    return caches.is_shared()
+
+
+def _new_version():
+    return uuid.uuid4().hex[:16], int(time.time())
+
+
+def get_version(resource, user_id):
+    """Return ``(token, last_modified_timestamp)``, starting a new version if none is cached."""
+    version = cache.get(_key(resource, user_id))
+    if version is None:
+        version = _new_version()
+        if not cache.add(_key(resource, user_id), version, timeout=_ttl()):
+            version = cache.get(_key(resource, user_id)) or version
+    return version
+
+
+async def aget_version(resource, user_id):
+    """``get_version`` through the cache's async API."""
+    version = await cache.aget(_key(resource, user_id))
+    if version is None:
+        version = _new_version()
+        if not await cache.aadd(_key(resource, user_id), version, timeout=_ttl()):
+            version = await cache.aget(_key(resource, user_id)) or version
+    return version
+
+
+def bump(resource, user_id):
+    if enabled():
+        cache.set(_key(resource, user_id), _new_version(), timeout=_ttl())
+
+
+def validators(resource, user_id):
+    """``(etag, last_modified)``, or ``(None, None)`` when versioning is off."""
+    if not enabled():
+        return None, None
+    token, last_modified = get_version(resource, user_id)
+    return f'"{resource}-{user_id}-{token}"', last_modified
+
+
+def precondition_response(request, resource):
+    """304 / 412 response when the request's validators say so, otherwise ``None``."""
+    if not enabled():
+        return None
+    etag, last_modified = validators(resource, request.user.pk)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None and response.status_code == 304:
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def set_validators(response, request, resource):
+    """Attach the current ETag / Last-Modified to a successful response."""
+    if 200 <= response.status_code < 300 and enabled():
+        etag, last_modified = validators(resource, request.user.pk)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+class ConditionalResourceMixin:
+    """
+    For views over one user-scoped resource: handlers call
+    ``self.precondition_response(request)`` first, and every successful
+    response carries the resource's ETag / Last-Modified.
+    """
+    version_resource = None
+
+    def precondition_response(self, request):
+        return precondition_response(request, self.version_resource)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.user and request.user.is_authenticated:
+            set_validators(response, request, self.version_resource)
+        return response
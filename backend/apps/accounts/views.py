@@ -1,16 +1,36 @@
-from rest_framework.decorators import api_view, permission_classes
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status, generics
+from rest_framework.filters import OrderingFilter
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .models import User
-from .serializers import RegisterSerializer, UserSerializer
+from .serializers import RegisterSerializer, UserSerializer, BulkUserActionSerializer
+from .fast_serializers import ValuesListMixin, ValuesSerializer
+from .filters import UserFilterBackend
+from .pagination import UserCursorPagination
+from . import activity, bulk, exports, imports, payload_cache, search, stats, versioning
+from .authentication import add_user_claims, get_user_instance
+from .bootstrap import build_bootstrap
+from .streaming import EventStreamRenderer, broadcaster
+from .throttling import LoginThrottle, RegisterThrottle
 
 
 # ✅ Register User
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterThrottle])
 def register_user(request):
     username = request.data.get('username')
     email = request.data.get('email')
@@ -36,20 +56,37 @@ def register_user(request):
 def profile_view(request):
     user = request.user
 
+    # ✅ 304 for an unchanged profile / 412 for a stale If-Match, before any query
+    not_modified = versioning.precondition_response(request, versioning.PROFILE)
+    if not_modified is not None:
+        return not_modified
+
     if request.method == 'GET':
-        serializer = UserSerializer(user)
-        return Response(serializer.data)
+        # ✅ Cached serialized profile (rebuilt only after the profile changes)
+        return versioning.set_validators(Response(payload_cache.profile_payload(user)), request, versioning.PROFILE)
 
     if request.method == 'POST':
-        serializer = UserSerializer(user, data=request.data, partial=True)
+        serializer = UserSerializer(get_user_instance(user), data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return versioning.set_validators(Response(serializer.data), request, versioning.PROFILE)
         return Response(serializer.errors, status=400)
 
 
+# ✅ Session Bootstrap (profile, addresses, role flags, stats for staff)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bootstrap_view(request):
+    return Response(build_bootstrap(request.user))
+
+
 # ✅ Custom JWT Login Serializer
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # ✅ Claims that let ClaimsJWTAuthentication skip the per-request user lookup
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         data = super().validate(attrs)
         user = self.user
@@ -61,18 +98,33 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             "is_staff": user.is_staff,
             "is_admin": user.is_superuser or user.is_staff,
         })
+
+        # ✅ Optional: return the dashboard bootstrap with the tokens (?bootstrap=1 or "bootstrap": true)
+        request = self.context.get("request")
+        wants_bootstrap = self.initial_data.get("bootstrap") in (True, "true", "1", 1)
+        if request is not None and request.query_params.get("bootstrap") in ("true", "1"):
+            wants_bootstrap = True
+        if wants_bootstrap:
+            data["bootstrap"] = build_bootstrap(user)
         return data
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    # ✅ 429 before the password hash: per IP and per account
+    throttle_classes = [LoginThrottle]
 
 
-# ✅ Admin — List & Create Users
-class AdminUserListCreateAPIView(generics.ListCreateAPIView):
+# ✅ Admin — List & Create Users (cursor-paginated, filter by role/is_active/is_staff; lists read values() rows)
+class AdminUserListCreateAPIView(ValuesListMixin, generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    values_serializer = ValuesSerializer(UserSerializer)
     permission_classes = [IsAdminUser]
+    pagination_class = UserCursorPagination
+    filter_backends = [UserFilterBackend, OrderingFilter]
+    ordering_fields = ["id", "date_joined"]
+    ordering = "-id"
 
 
 # ✅ Admin — Update & Delete User
@@ -82,17 +134,194 @@ class AdminUserUpdateDeleteAPIView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAdminUser]
 
 
-# ✅ Admin — Get User Statistics (Total, Active, Hold)
-class AdminUserStatsAPIView(generics.GenericAPIView):
+# ✅ Admin — Bulk Hold / Activate / Change Role / Delete
+class AdminUserBulkActionAPIView(generics.GenericAPIView):
+    """
+    POST /api/auth/admin/users/bulk/
+    body: { "action": "hold" | "activate" | "change_role" | "delete",
+            "ids": [1, 2, 3]  — or —  "filter": { "role", "is_active", "is_staff", "joined_after", "joined_before" },
+            "role": "admin" | "user"  (change_role only) }
+    """
     permission_classes = [IsAdminUser]
+    serializer_class = BulkUserActionSerializer
 
-    def get(self, request):
-        total_users = User.objects.count()
-        active_users = User.objects.filter(is_active=True).count()
-        hold_users = User.objects.filter(is_active=False).count()
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        limit = getattr(settings, "ADMIN_BULK_MAX_USERS", 10000)
+
+        if "ids" in data:
+            user_ids = data["ids"]
+        else:
+            user_ids = bulk.resolve_filter(data["filter"], limit=limit + 1)
+        if len(user_ids) > limit:
+            return Response(
+                {"detail": f"A bulk action can target at most {limit} users. Narrow the selection."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
+        results = bulk.apply_bulk_action(data["action"], user_ids, request.user, role=data.get("role"))
         return Response({
-            "total_users": total_users,
-            "active_users": active_users,
-            "hold_users": hold_users,
+            "action": data["action"],
+            "summary": Counter(results.values()),
+            "results": {str(user_id): result for user_id, result in results.items()},
         })
+
+
+# ✅ Admin — Get User Statistics (Total, Active, Hold, per role)
+class AdminUserStatsAPIView(generics.GenericAPIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        # Served from the cached counters (see apps.accounts.stats)
+        return Response(stats.get_user_stats())
+
+
+# ✅ Admin — Registration / Activity Time-Series (reads the daily rollup only)
+class AdminActivityReportAPIView(generics.GenericAPIView):
+    """GET /api/auth/admin/reports/activity/?start=YYYY-MM-DD&end=YYYY-MM-DD (default: last 30 days)"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        end = parse_date(request.query_params.get("end") or "") or timezone.localdate()
+        start_param = request.query_params.get("start")
+        start = parse_date(start_param) if start_param else end - timedelta(days=29)
+        if start is None or start > end:
+            return Response({"detail": "Invalid date range."}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_days = settings.ADMIN_REPORT_MAX_DAYS
+        if (end - start).days + 1 > max_days:
+            return Response(
+                {"detail": f"Date range is limited to {max_days} days."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(activity.activity_report(start, end))
+
+
+# ✅ Admin — User Search (typeahead for ManageUsers)
+class AdminUserSearchAPIView(generics.GenericAPIView):
+    """GET /api/auth/admin/users/search/?q=<text>&limit=20 → best matches on username, email, name or phone"""
+    permission_classes = [IsAdminUser]
+    serializer_class = UserSerializer
+
+    def get(self, request):
+        query = (request.query_params.get("q") or "").strip()
+        if len(query) < search.MIN_QUERY_LENGTH:
+            return Response(
+                {"detail": f"Search needs at least {search.MIN_QUERY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        max_results = settings.ADMIN_USER_SEARCH_MAX_RESULTS
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), max_results)
+        except ValueError:
+            limit = 20
+        users = search.search_users(query, max(limit, 1))
+        return Response({"query": query, "results": self.get_serializer(users, many=True).data})
+
+
+# ✅ Admin — Bulk User Import (CSV / NDJSON upload)
+class AdminUserImportAPIView(generics.GenericAPIView):
+    """
+    POST /api/auth/admin/users/import/   (multipart)
+    fields: file (.csv / .ndjson), file_format ("csv" | "ndjson", optional), dry_run (optional)
+    Columns: username, email, password, phone, first_name, last_name, role, is_active
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "Upload a CSV or NDJSON file as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get("file_format") or imports.detect_format(upload.name)
+        if file_format not in imports.FORMATS:
+            return Response(
+                {"detail": "Unknown file format; use a .csv or .ndjson file or set file_format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Larger files should go through `manage.py import_users`
+        max_rows = settings.ADMIN_IMPORT_MAX_ROWS
+        report = imports.import_users(
+            imports.read_rows(upload, file_format),
+            max_rows=max_rows,
+            dry_run=str(request.data.get("dry_run", "")).lower() in ("1", "true"),
+        )
+        if report["truncated"]:
+            report["detail"] = f"Only the first {max_rows} rows were imported; use the import_users command for larger files."
+        return Response(report, status=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK)
+
+
+# ✅ Admin — Live User Statistics (Server-Sent Events)
+class AdminUserStatsStreamAPIView(generics.GenericAPIView):
+    permission_classes = [IsAdminUser]
+    renderer_classes = [EventStreamRenderer, JSONRenderer]
+
+    def get(self, request):
+        # Reconnecting clients send the last version they saw, so no duplicate push
+        last_event_id = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+        # Each open stream holds a worker thread here; past the cap the dashboard polls stats/
+        if not broadcaster.accepts_sync_stream():
+            return Response(
+                {"detail": "Live stats are busy; poll admin/stats/ instead."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "60"},
+            )
+        response = StreamingHttpResponse(
+            broadcaster.events(last_event_id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Export responses pick their own content type; errors are rendered as JSON."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+# ✅ Admin — Streaming Export of Users + Addresses (CSV / NDJSON, optional gzip)
+class AdminUserExportAPIView(generics.GenericAPIView):
+    """
+    GET /api/auth/admin/export/users.csv
+    GET /api/auth/admin/export/users.ndjson
+    Optional: ?gzip=1, and the role / is_active / is_staff filters of the user listing.
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = [JSONRenderer]
+    content_negotiation_class = IgnoreClientContentNegotiation
+    queryset = User.objects.all()
+    filter_backends = [UserFilterBackend]
+
+    CONTENT_TYPES = {
+        "csv": "text/csv; charset=utf-8",
+        "ndjson": "application/x-ndjson; charset=utf-8",
+    }
+
+    def get(self, request, export_format):
+        rows = exports.joined_rows(self.filter_queryset(self.get_queryset()))
+        if export_format == "csv":
+            stream = exports.csv_stream(rows)
+        else:
+            stream = exports.ndjson_stream(rows)
+
+        filename = f"users.{export_format}"
+        content_type = self.CONTENT_TYPES[export_format]
+        if request.query_params.get("gzip") in ("1", "true"):
+            stream = exports.gzip_stream(stream)
+            filename += ".gz"
+            content_type = "application/gzip"
+
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,39 @@
+"""
+Async address reads (routed when ``USE_ASYNC_VIEWS`` is on). Creates and
+updates fall back to the sync views in ``views``.
+"""
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotFound
+
+from apps.accounts import payload_cache, versioning
+from apps.accounts.async_api import AsyncResponse, async_api_view
+
+from .models import Address
+from .serializers import AddressSerializer
+from .views import AddressListCreateView, AddressRetrieveUpdateView
+
+
+async def _conditional(request, load):
+    """304 / 412 from the version token alone, otherwise ``load()``'s data with fresh validators."""
+    not_modified = await sync_to_async(versioning.precondition_response)(request, versioning.ADDRESSES)
+    if not_modified is not None:
+        return not_modified
+    response = AsyncResponse(await load())
+    return await sync_to_async(versioning.set_validators)(response, request, versioning.ADDRESSES)
+
+
+@async_api_view(["GET"], fallback=AddressListCreateView.as_view())
+async def address_list_view(request):
+    return await _conditional(request, lambda: payload_cache.aaddresses_payload(request.user.pk))
+
+
+@async_api_view(["GET"], fallback=AddressRetrieveUpdateView.as_view())
+async def address_detail_view(request, pk):
+    async def load():
+        try:
+            address = await Address.objects.aget(pk=pk, user_id=request.user.pk)
+        except Address.DoesNotExist:
+            raise NotFound()
+        return AddressSerializer(address).data
+
+    return await _conditional(request, load)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.addresses.pincodes import build_index, normalize_country, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the memory-mapped postal code index from a CSV "
+        "(e.g. the India Post All India Pincode Directory)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--output", default=str(settings.PINCODE_INDEX_PATH))
+        parser.add_argument("--country", default="IN", help="ISO code for rows without a country column.")
+        parser.add_argument("--country-name", default="India", help="Display name for --country.")
+
+    def handle(self, *args, **options):
+        country = normalize_country(options["country"])
+        if country is None:
+            raise CommandError("--country must be a two-letter ISO code.")
+        try:
+            with open(options["csv_path"], newline="", encoding="utf-8-sig") as f:
+                count = build_index(read_rows(f, country, options["country_name"]), options["output"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} postal records to {options['output']}"))
@@ -0,0 +1,207 @@
+"""
+Local postal-code lookup backed by a compact, memory-mapped index file.
+
+File layout (little-endian)::
+
+    header   8s magic "PINIDX01", I record count, H key size, H reserved
+    records  count x (12s key, I payload offset, H payload length, 2x pad), sorted by key
+    payload  UTF-8 "area\\x1fdistrict\\x1fcity\\x1fstate\\x1fcountry" strings
+
+Keys are ``<ISO country code><postal code>`` (e.g. ``IN500001``) padded with
+NULs, so an exact lookup or a prefix scan is a binary search over the
+fixed-width records. The file is opened read-only with ``mmap``: every worker
+process shares the same page-cache pages instead of loading its own copy.
+"""
+import csv
+import mmap
+import os
+import struct
+import threading
+
+from django.conf import settings
+
+MAGIC = b"PINIDX01"
+HEADER = struct.Struct("<8sIHH")
+RECORD = struct.Struct("<12sIH2x")
+KEY_SIZE = 12
+FIELDS = ("area", "district", "city", "state", "country")
+SEPARATOR = "\x1f"
+
+COUNTRY_ALIASES = {"INDIA": "IN"}
+
+# Column names accepted by the importer, e.g. the India Post "All India
+# Pincode Directory" (officename, pincode, taluk, district, statename).
+COLUMN_ALIASES = {
+    "postal_code": ("postal_code", "pincode", "postalcode", "zip", "zipcode", "postcode"),
+    "area": ("area", "officename", "office_name", "place_name", "place"),
+    "district": ("district", "districtname", "district_name"),
+    "city": ("city", "taluk", "block", "town"),
+    "state": ("state", "statename", "state_name"),
+    "country": ("country_code", "country"),
+}
+
+
+def normalize_country(country):
+    country = (country or "").strip().upper()
+    country = COUNTRY_ALIASES.get(country, country)
+    return country if len(country) == 2 and country.isalpha() else None
+
+
+def normalize_code(code):
+    return "".join((code or "").split()).upper()
+
+
+def make_key(country, code):
+    key = f"{country}{normalize_code(code)}".encode("ascii", "ignore")
+    return key[:KEY_SIZE]
+
+
+# ---------- Building ----------
+
+def read_rows(csv_file, default_country="IN", country_name="India"):
+    """Yield ``(key, payload)`` pairs from a postal CSV, mapping known column aliases."""
+    reader = csv.DictReader(csv_file)
+    headers = {name.strip().lower(): name for name in reader.fieldnames or []}
+    columns = {
+        field: next((headers[alias] for alias in aliases if alias in headers), None)
+        for field, aliases in COLUMN_ALIASES.items()
+    }
+    if columns["postal_code"] is None:
+        raise ValueError("CSV has no postal code column (e.g. 'pincode' or 'postal_code').")
+
+    for row in reader:
+        def value(field):
+            column = columns[field]
+            return (row.get(column) or "").strip() if column else ""
+
+        code = normalize_code(value("postal_code"))
+        country = normalize_country(value("country")) or default_country
+        if not code:
+            continue
+        district = value("district").title()
+        place = {
+            "area": value("area").title(),
+            "district": district,
+            "city": value("city").title() or district,
+            "state": value("state").title(),
+            "country": country_name if country == default_country else country,
+        }
+        yield make_key(country, code), SEPARATOR.join(place[f] for f in FIELDS)
+
+
+def build_index(rows, output_path):
+    """Write ``(key, payload)`` rows to a sorted index file; return the record count."""
+    records = sorted(set(rows))
+    payloads = {}
+    blob = bytearray()
+    entries = []
+    for key, payload in records:
+        # Identical places (common across pincodes) are stored once
+        if payload not in payloads:
+            encoded = payload.encode("utf-8")
+            payloads[payload] = (len(blob), len(encoded))
+            blob += encoded
+        entries.append((key, *payloads[payload]))
+
+    tmp_path = f"{output_path}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, len(entries), KEY_SIZE, 0))
+        for key, offset, length in entries:
+            out.write(RECORD.pack(key, offset, length))
+        out.write(blob)
+    # Atomic swap: workers holding the old mapping keep reading the old inode
+    os.replace(tmp_path, output_path)
+    return len(entries)
+
+
+# ---------- Lookup ----------
+
+class PincodeIndex:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            # mmap can't map an empty file; anything shorter than a header isn't an index either
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is not a pincode index")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, key_size, _ = HEADER.unpack_from(self._mm, 0)
+        self._payload_start = HEADER.size + self.count * RECORD.size
+        if magic != MAGIC or key_size != KEY_SIZE or len(self._mm) < self._payload_start:
+            self._mm.close()
+            raise ValueError(f"{path} is not a pincode index")
+
+    def _record(self, i):
+        return RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+
+    def _key(self, i):
+        start = HEADER.size + i * RECORD.size
+        return self._mm[start:start + KEY_SIZE].rstrip(b"\0")
+
+    def _lower_bound(self, key):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _place(self, i, country):
+        key, offset, length = self._record(i)
+        start = self._payload_start + offset
+        values = self._mm[start:start + length].decode("utf-8").split(SEPARATOR)
+        place = dict(zip(FIELDS, values))
+        place["postal_code"] = key.rstrip(b"\0").decode("ascii")[len(country):]
+        return place
+
+    def lookup(self, code, country="IN"):
+        """All places for an exact postal code."""
+        key = make_key(country, code)
+        i = self._lower_bound(key)
+        places = []
+        while i < self.count and self._key(i) == key:
+            places.append(self._place(i, country))
+            i += 1
+        return places
+
+    def prefix(self, prefix, country="IN", limit=20):
+        """Places whose postal code starts with ``prefix`` (first ``limit`` records)."""
+        key = make_key(country, prefix)
+        i = self._lower_bound(key)
+        places = []
+        while i < self.count and len(places) < limit and self._key(i).startswith(key):
+            places.append(self._place(i, country))
+            i += 1
+        return places
+
+    def close(self):
+        self._mm.close()
+
+
+_lock = threading.Lock()
+_index = None
+_index_stat = None
+
+
+def get_pincode_index():
+    """
+    Return the shared index, reopening it after a rebuild; ``None`` if not
+    built yet. The mapping of the replaced file is closed, so rebuilds don't
+    leak one per worker.
+    """
+    global _index, _index_stat
+    path = settings.PINCODE_INDEX_PATH
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_ino, stat.st_mtime_ns)
+    if _index is None or signature != _index_stat:
+        with _lock:
+            if _index is None or signature != _index_stat:
+                previous = _index
+                _index, _index_stat = PincodeIndex(path), signature
+                if previous is not None:
+                    previous.close()
+    return _index
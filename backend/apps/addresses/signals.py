@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts import versioning
+from .models import Address
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+def bump_addresses_version(sender, instance, **kwargs):
+    versioning.bump(versioning.ADDRESSES, instance.user_id)
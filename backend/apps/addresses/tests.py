@@ -1,3 +1,73 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from . import pincodes
+
+CSV = """officename,pincode,taluk,districtname,statename
+Banjara Hills S.O,500034,Hyderabad,HYDERABAD,TELANGANA
+Jubilee Hills S.O,500033,Hyderabad,HYDERABAD,TELANGANA
+Film Nagar S.O,500033,Hyderabad,HYDERABAD,TELANGANA
+Khairatabad H.O,500004,,HYDERABAD,TELANGANA
+"""
+
+
+class PincodeIndexTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "pincodes.idx")
+        self.count = pincodes.build_index(pincodes.read_rows(io.StringIO(CSV)), self.path)
+        self.index = pincodes.PincodeIndex(self.path)
+        self.addCleanup(self.index.close)
+
+    def drop_shared_index(self):
+        pincodes._index.close()
+        pincodes._index = pincodes._index_stat = None
+
+    def test_lookup_hits_and_misses(self):
+        self.assertEqual(self.count, 4)
+        self.assertEqual(self.index.lookup("500034"), [{
+            "area": "Banjara Hills S.O", "district": "Hyderabad", "city": "Hyderabad",
+            "state": "Telangana", "country": "India", "postal_code": "500034",
+        }])
+        # No taluk: the city falls back to the district
+        self.assertEqual(self.index.lookup(" 500 004")[0]["city"], "Hyderabad")
+        self.assertEqual(self.index.lookup("500035"), [])
+        self.assertEqual(self.index.lookup("500034", country="US"), [])
+
+    def test_duplicate_pincodes_return_every_place(self):
+        areas = [place["area"] for place in self.index.lookup("500033")]
+        self.assertEqual(sorted(areas), ["Film Nagar S.O", "Jubilee Hills S.O"])
+
+    def test_prefix_scan(self):
+        codes = [place["postal_code"] for place in self.index.prefix("50003")]
+        self.assertEqual(codes, ["500033", "500033", "500034"])
+        self.assertEqual(len(self.index.prefix("5000", limit=2)), 2)
+        self.assertEqual(self.index.prefix("6"), [])
+
+    def test_rejects_empty_and_truncated_files(self):
+        empty = f"{self.path}.empty"
+        open(empty, "wb").close()
+        with self.assertRaisesMessage(ValueError, "is not a pincode index"):
+            pincodes.PincodeIndex(empty)
+
+        truncated = f"{self.path}.short"
+        with open(self.path, "rb") as source, open(truncated, "wb") as out:
+            out.write(source.read()[:pincodes.HEADER.size + 1])
+        with self.assertRaisesMessage(ValueError, "is not a pincode index"):
+            pincodes.PincodeIndex(truncated)
+
+    def test_rebuild_is_picked_up_and_the_old_mapping_closed(self):
+        with override_settings(PINCODE_INDEX_PATH=self.path):
+            first = pincodes.get_pincode_index()
+            self.addCleanup(self.drop_shared_index)
+            extra = CSV + "Ameerpet S.O,500016,Hyderabad,HYDERABAD,TELANGANA\n"
+            pincodes.build_index(pincodes.read_rows(io.StringIO(extra)), self.path)
+
+            second = pincodes.get_pincode_index()
+            self.assertIsNot(second, first)
+            self.assertEqual(second.lookup("500016")[0]["area"], "Ameerpet S.O")
+            self.assertTrue(first._mm.closed)
@@ -1,9 +1,19 @@
 # apps/addresses/urls.py
+from django.conf import settings
 from django.urls import path
-from .views import AddressListCreateView, AddressRetrieveUpdateView, check_address
+from .views import AddressListCreateView, AddressRetrieveUpdateView, check_address, pincode_lookup
+
+if settings.USE_ASYNC_VIEWS:
+    # ✅ ASGI deployments: reads on the event loop, writes through the same sync views
+    from .async_views import address_list_view, address_detail_view
+else:
+    address_list_view = AddressListCreateView.as_view()
+    address_detail_view = AddressRetrieveUpdateView.as_view()
 
 urlpatterns = [
-    path("", AddressListCreateView.as_view(), name="address-list-create"),  # GET all or POST new
-    path("<int:pk>/", AddressRetrieveUpdateView.as_view(), name="address-retrieve-update"),  # GET/PUT specific
+    path("", address_list_view, name="address-list-create"),  # GET all or POST new
+    path("<int:pk>/", address_detail_view, name="address-retrieve-update"),  # GET/PUT specific
     path("check/", check_address, name="check-address"),  # To verify if address exists
+    path("pincode/", pincode_lookup, name="pincode-prefix"),  # ?prefix= search
+    path("pincode/<str:code>/", pincode_lookup, name="pincode-lookup"),  # Auto-fill by postal code
 ]
@@ -1,30 +1,91 @@
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
 from .models import Address
+from .pincodes import get_pincode_index, normalize_country
 from .serializers import AddressSerializer
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from apps.accounts import payload_cache, versioning
 
-class AddressListCreateView(generics.ListCreateAPIView):
+class AddressListCreateView(versioning.ConditionalResourceMixin, generics.ListCreateAPIView):
     serializer_class = AddressSerializer
     permission_classes = [permissions.IsAuthenticated]
+    version_resource = versioning.ADDRESSES
 
     def get_queryset(self):
-        return Address.objects.filter(user=self.request.user)
+        return Address.objects.filter(user_id=self.request.user.pk)
+
+    def list(self, request, *args, **kwargs):
+        not_modified = self.precondition_response(request)
+        if not_modified is not None:
+            return not_modified
+        # ✅ Cached serialized list (rebuilt only after an address changes)
+        return Response(payload_cache.addresses_payload(request.user.pk))
+
+    def create(self, request, *args, **kwargs):
+        not_modified = self.precondition_response(request)
+        if not_modified is not None:
+            return not_modified
+        return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
 
-class AddressRetrieveUpdateView(generics.RetrieveUpdateAPIView):
+class AddressRetrieveUpdateView(versioning.ConditionalResourceMixin, generics.RetrieveUpdateAPIView):
     serializer_class = AddressSerializer
     permission_classes = [permissions.IsAuthenticated]
+    version_resource = versioning.ADDRESSES
 
     def get_queryset(self):
-        return Address.objects.filter(user=self.request.user)
+        return Address.objects.filter(user_id=self.request.user.pk)
+
+    def retrieve(self, request, *args, **kwargs):
+        not_modified = self.precondition_response(request)
+        if not_modified is not None:
+            return not_modified
+        return super().retrieve(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        not_modified = self.precondition_response(request)
+        if not_modified is not None:
+            return not_modified
+        return super().update(request, *args, **kwargs)
 
 
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
 def check_address(request):
-    has_address = Address.objects.filter(user=request.user).exists()
+    has_address = bool(payload_cache.addresses_payload(request.user.pk))
     return Response({"has_address": has_address})
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def pincode_lookup(request, code=None):
+    """
+    GET /api/addresses/pincode/<code>/?country=IN   → places for that postal code
+    GET /api/addresses/pincode/?prefix=5000&country=IN → places for codes with that prefix
+    Served from the local memory-mapped index (see apps.addresses.pincodes).
+    """
+    index = get_pincode_index()
+    if index is None:
+        return Response({"detail": "Pincode index is not available."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    country = normalize_country(request.query_params.get("country") or "IN")
+    if country is None:
+        return Response({"detail": "Use a two-letter country code.", "code": "EA006"}, status=status.HTTP_400_BAD_REQUEST)
+
+    if code is None:
+        prefix = request.query_params.get("prefix", "").strip()
+        if len(prefix) < 2:
+            return Response({"detail": "Prefix must be at least 2 characters.", "code": "EA008"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), 100)
+        except ValueError:
+            limit = 20
+        return Response({"prefix": prefix, "places": index.prefix(prefix, country, limit)})
+
+    places = index.lookup(code, country)
+    if not places:
+        return Response({"detail": "Unable to auto-fill location. Please check pin code.", "code": "EA007"}, status=status.HTTP_404_NOT_FOUND)
+    return Response({"postal_code": places[0]["postal_code"], "places": places})
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import password_validation
+from apps.accounts import hashing
+from apps.accounts.authentication import get_user_instance
 
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(required=True)
@@ -7,8 +9,8 @@ class ChangePasswordSerializer(serializers.Serializer):
     confirm_password = serializers.CharField(required=True)
 
     def validate(self, attrs):
-        user = self.context['request'].user
-        if not user.check_password(attrs['old_password']):
+        user = get_user_instance(self.context['request'].user)
+        if not hashing.check_password(user, attrs['old_password']):
             raise serializers.ValidationError({"old_password": "Old password is incorrect."})
         if attrs['new_password'] != attrs['confirm_password']:
             raise serializers.ValidationError({"confirm_password": "Passwords do not match."})
@@ -16,7 +18,7 @@ class ChangePasswordSerializer(serializers.Serializer):
         return attrs
 
     def save(self, **kwargs):
-        user = self.context['request'].user
-        user.set_password(self.validated_data['new_password'])
-        user.save()
+        user = get_user_instance(self.context['request'].user)
+        hashing.set_password(user, self.validated_data['new_password'])
+        user.save(update_fields=['password'])
         return user
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from .models import UserError, UserValidation, UserInformation
+
+
+@admin.register(UserError)
+class UserErrorAdmin(admin.ModelAdmin):
+    list_display = ('error_code', 'error_message', 'category')
+    search_fields = ('error_code', 'error_message')
+
+
+@admin.register(UserValidation)
+class UserValidationAdmin(admin.ModelAdmin):
+    list_display = ('validation_code', 'validation_message', 'category')
+    search_fields = ('validation_code', 'validation_message')
+
+
+@admin.register(UserInformation)
+class UserInformationAdmin(admin.ModelAdmin):
+    list_display = ('information_code', 'information_text', 'category')
+    search_fields = ('information_code', 'information_text')
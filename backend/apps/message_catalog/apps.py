@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class MessageCatalogConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.message_catalog'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,116 @@
+"""
+Process-wide message catalog.
+
+The three message tables are read into a pre-serialized JSON payload with a
+strong ETag when the server starts. Each process re-checks the catalog
+version (a one-row ``CatalogVersion`` read by primary key) at most every
+``MESSAGE_CATALOG_CHECK_SECONDS`` and reloads only when it changed. Edits
+through the admin or the loader bump that row in the same transaction, so
+every worker — whatever the cache backend — converges on the same payload
+and ETag within one check interval.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+VERSION_ID = 1
+
+
+def current_version():
+    from .models import CatalogVersion
+
+    return CatalogVersion.objects.filter(pk=VERSION_ID).values_list("version", flat=True).first()
+
+
+def bump_version():
+    from .models import CatalogVersion
+
+    if not CatalogVersion.objects.filter(pk=VERSION_ID).update(version=F("version") + 1):
+        CatalogVersion.objects.get_or_create(pk=VERSION_ID, defaults={"version": 1})
+
+
+class MessageCatalog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_version = None
+        self._checked_at = None
+        self._messages = {}
+        self.payload = b""
+        self.etag = None
+
+    def _build(self):
+        from .models import UserError, UserValidation, UserInformation
+
+        catalog = {
+            "errors": {
+                code: {"message": message, "category": category}
+                for code, message, category in UserError.objects.values_list(
+                    "error_code", "error_message", "category")
+            },
+            "validations": {
+                code: {"message": message, "category": category}
+                for code, message, category in UserValidation.objects.values_list(
+                    "validation_code", "validation_message", "category")
+            },
+            "information": {
+                code: {"message": message, "category": category}
+                for code, message, category in UserInformation.objects.values_list(
+                    "information_code", "information_text", "category")
+            },
+        }
+        payload = json.dumps(catalog, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode()
+        messages = {
+            code: entry["message"]
+            for section in catalog.values()
+            for code, entry in section.items()
+        }
+        return payload, f'"{hashlib.sha256(payload).hexdigest()[:32]}"', messages
+
+    def refresh(self):
+        """Reload if the shared version moved (checked at most every few seconds)."""
+        now = time.monotonic()
+        interval = getattr(settings, "MESSAGE_CATALOG_CHECK_SECONDS", 30)
+        if self._checked_at is not None and now - self._checked_at < interval:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < interval:
+                return
+            version = current_version()
+            if self.etag is None or version != self._loaded_version:
+                self.payload, self.etag, self._messages = self._build()
+                self._loaded_version = version
+            self._checked_at = now
+
+    def invalidate(self):
+        """Make the next ``refresh`` re-check the version immediately."""
+        self._checked_at = None
+
+    def get_message(self, code, default=None):
+        self.refresh()
+        return self._messages.get(code, default)
+
+
+catalog = MessageCatalog()
+
+
+def mark_changed():
+    """Bump the version with the pending edit; this process reloads as soon as it commits."""
+    bump_version()
+    transaction.on_commit(catalog.invalidate)
+
+
+def load_at_startup():
+    """Build the catalog before the first request (called from the WSGI / ASGI entry points)."""
+    try:
+        catalog.refresh()
+    except DatabaseError:
+        # Not migrated yet: the first request retries
+        logger.warning("Message catalog not loaded at startup", exc_info=True)
@@ -0,0 +1,74 @@
+"""
+Load the message tables from the `Error_tables code` SQL script.
+
+Only the ``INSERT INTO <table> (<columns>) VALUES (...), (...);`` statements
+are read; rows are upserted on their code, so re-running the loader after
+editing the script updates messages in place.
+"""
+import re
+
+from django.db import transaction
+
+from .catalog import mark_changed
+from .models import UserError, UserValidation, UserInformation
+
+MODELS = {
+    'user_error': (UserError, 'error_code'),
+    'user_validation': (UserValidation, 'validation_code'),
+    'user_information': (UserInformation, 'information_code'),
+}
+
+INSERT_RE = re.compile(
+    r"INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES\s*(.*?);\s*$",
+    re.IGNORECASE | re.DOTALL | re.MULTILINE,
+)
+TOKEN_RE = re.compile(r"\s*(?:'((?:[^']|'')*)'|(NULL)|([(),]))", re.IGNORECASE)
+
+
+def parse_values(text):
+    """Parse ``('a', 'b', NULL), ('c', ...)`` into a list of tuples."""
+    rows, row, pos = [], None, 0
+    text = text.strip()
+    while pos < len(text):
+        match = TOKEN_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"Unexpected SQL near: {text[pos:pos + 40]!r}")
+        pos = match.end()
+        string, null, punct = match.groups()
+        if punct == '(':
+            row = []
+        elif punct == ')':
+            rows.append(tuple(row))
+            row = None
+        elif punct == ',':
+            continue
+        elif row is not None:
+            row.append(None if null else string.replace("''", "'"))
+    return rows
+
+
+def parse_sql(sql):
+    """Yield ``(table, [row dicts])`` for each INSERT in the script."""
+    for table, columns, values in INSERT_RE.findall(sql):
+        names = [column.strip() for column in columns.split(',')]
+        yield table, [dict(zip(names, row)) for row in parse_values(values)]
+
+
+def load_catalog(sql):
+    """Upsert every known table's rows; return ``{table: row_count}``."""
+    counts = {}
+    with transaction.atomic():
+        for table, rows in parse_sql(sql):
+            if table not in MODELS:
+                continue
+            model, code_field = MODELS[table]
+            fields = [f for f in rows[0] if f != code_field] if rows else []
+            model.objects.bulk_create(
+                [model(**row) for row in rows],
+                update_conflicts=True,
+                unique_fields=[code_field],
+                update_fields=fields,
+            )
+            counts[table] = counts.get(table, 0) + len(rows)
+        mark_changed()
+    return counts
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.message_catalog.loader import load_catalog
+
+
+class Command(BaseCommand):
+    help = "Load (upsert) the error/validation/information messages from the SQL script."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", nargs="?", default=str(settings.MESSAGE_CATALOG_SOURCE),
+            help="SQL script with the INSERT statements (default: MESSAGE_CATALOG_SOURCE).",
+        )
+
+    def handle(self, *args, **options):
+        counts = load_catalog(Path(options["path"]).read_text(encoding="utf-8"))
+        for table, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f"{table}: {count} row(s) loaded"))
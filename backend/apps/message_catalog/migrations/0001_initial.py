@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserError',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('error_code', models.CharField(max_length=10, unique=True)),
+                ('error_message', models.TextField()),
+                ('category', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'db_table': 'user_error',
+                'ordering': ['error_code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserInformation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('information_code', models.CharField(max_length=10, unique=True)),
+                ('information_text', models.TextField()),
+                ('category', models.CharField(max_length=100)),
+            ],
+            options={
+                'db_table': 'user_information',
+                'ordering': ['information_code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserValidation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('validation_code', models.CharField(max_length=10, unique=True)),
+                ('validation_message', models.TextField()),
+                ('category', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'db_table': 'user_validation',
+                'ordering': ['validation_code'],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import models
+
+
+class UserError(models.Model):
+    """Error codes (EP/EA/ES/EU/ER/EH/EV...) from the `user_error` table."""
+    error_code = models.CharField(max_length=10, unique=True)
+    error_message = models.TextField()
+    category = models.CharField(max_length=100, null=True, blank=True)
+
+    class Meta:
+        db_table = 'user_error'
+        ordering = ['error_code']
+
+    def __str__(self):
+        return f"{self.error_code}: {self.error_message}"
+
+
+class UserValidation(models.Model):
+    """Validation hints (VP/VA/VS/...) from the `user_validation` table."""
+    validation_code = models.CharField(max_length=10, unique=True)
+    validation_message = models.TextField()
+    category = models.CharField(max_length=100, null=True, blank=True)
+
+    class Meta:
+        db_table = 'user_validation'
+        ordering = ['validation_code']
+
+    def __str__(self):
+        return f"{self.validation_code}: {self.validation_message}"
+
+
+class UserInformation(models.Model):
+    """Information messages (IP/IA/IR/IL/...) from the `user_information` table."""
+    information_code = models.CharField(max_length=10, unique=True)
+    information_text = models.TextField()
+    category = models.CharField(max_length=100)
+
+    class Meta:
+        db_table = 'user_information'
+        ordering = ['information_code']
+
+    def __str__(self):
+        return f"{self.information_code}: {self.information_text}"
+
+
+class CatalogVersion(models.Model):
+    """One row, bumped with every catalog change; each process polls it to know when to reload."""
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"message catalog v{self.version}"
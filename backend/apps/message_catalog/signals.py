@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import mark_changed
+from .models import UserError, UserValidation, UserInformation
+
+
+@receiver(post_save, sender=UserError)
+@receiver(post_save, sender=UserValidation)
+@receiver(post_save, sender=UserInformation)
+@receiver(post_delete, sender=UserError)
+@receiver(post_delete, sender=UserValidation)
+@receiver(post_delete, sender=UserInformation)
+def bump_catalog_version(sender, **kwargs):
+    mark_changed()
@@ -0,0 +1,49 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .catalog import MessageCatalog, catalog, current_version
+from .loader import load_catalog
+from .models import UserError
+
+SQL = """
+INSERT INTO user_error (error_code, error_message, category) VALUES
+('EP001', 'Password is too short', 'password'),
+('EA001', 'Account is on hold', NULL);
+INSERT INTO user_information (information_text, category, information_code) VALUES
+('Password updated', 'password', 'IP001');
+"""
+
+
+# Re-check the version on every refresh, as if the interval had passed
+@override_settings(MESSAGE_CATALOG_CHECK_SECONDS=0)
+class MessageCatalogTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            load_catalog(SQL)
+        self.client = APIClient()
+
+    def test_other_processes_reload_after_an_edit(self):
+        # A worker that loaded the catalog before the edit
+        other = MessageCatalog()
+        other.refresh()
+        version, etag = current_version(), other.etag
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserError.objects.filter(error_code="EP001").update(error_message="Too short")
+            UserError.objects.get(error_code="EA001").save()  # the admin's save bumps the version
+
+        self.assertEqual(current_version(), version + 1)
+        other.refresh()
+        self.assertNotEqual(other.etag, etag)
+        self.assertEqual(other.get_message("EP001"), "Too short")
+        catalog.refresh()
+        self.assertEqual(catalog.etag, other.etag)
+
+    def test_unchanged_catalog_revalidates_with_304(self):
+        response = self.client.get("/api/messages/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["information"]["IP001"]["message"], "Password updated")
+
+        cached = self.client.get("/api/messages/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], response["ETag"])
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import message_catalog_view
+
+urlpatterns = [
+    path("", message_catalog_view, name="message-catalog"),
+]
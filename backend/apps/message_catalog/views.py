@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny
+
+from .catalog import catalog
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def message_catalog_view(request):
+    """
+    GET /api/messages/
+    The whole error / validation / information catalog, served from memory.
+    Clients revalidate with If-None-Match and get a 304 while it is unchanged.
+    """
+    catalog.refresh()
+
+    if_none_match = request.headers.get("If-None-Match", "")
+    if catalog.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(catalog.payload, content_type="application/json")
+
+    response["ETag"] = catalog.etag
+    patch_cache_control(response, public=True, max_age=getattr(settings, "MESSAGE_CATALOG_MAX_AGE", 86400))
+    return response
@@ -0,0 +1,211 @@
+"""Helpers shared by the benchmark management commands."""
+import asyncio
+import importlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import clear_url_caches
+
+# URLconfs that pick sync or async views from USE_ASYNC_VIEWS at import time
+ASYNC_VIEW_URLCONFS = ("apps.accounts.urls", "apps.addresses.urls", "apps.password_reset.urls")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def run_concurrently(total, concurrency, job):
+    """
+    Run ``job()`` ``total`` times on ``concurrency`` threads. ``job`` returns
+    True on success. Returns (latencies, errors, elapsed seconds).
+    """
+    latencies, errors = [], [0]
+    remaining = [total]
+    lock = threading.Lock()
+
+    def worker():
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                ok = job()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if ok:
+                        latencies.append(elapsed)
+                    else:
+                        errors[0] += 1
+        finally:
+            # Each thread has its own connections — don't leak them past the run
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - started
+
+
+async def run_concurrently_async(total, concurrency, job):
+    """``run_concurrently`` for a coroutine ``job`` on ``concurrency`` tasks of one event loop."""
+    latencies, errors = [], [0]
+    remaining = [total]
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            ok = await job()
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[0] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors[0], time.perf_counter() - started
+
+
+class ThreadSampler:
+    """Records the peak number of live threads while the block runs."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def reload_urlconfs():
+    """Rebuild the URLconf after ``USE_ASYNC_VIEWS`` changes."""
+    for module in (*ASYNC_VIEW_URLCONFS, settings.ROOT_URLCONF):
+        importlib.reload(importlib.import_module(module))
+    clear_url_caches()
+
+
+class WSGIRequester:
+    """
+    Sends requests through the real WSGI handler, so request_started /
+    request_finished fire and connections are managed exactly as under a
+    WSGI server (the test Client skips closing them).
+    """
+
+    def __init__(self):
+        self.handler = WSGIHandler()
+        self.factory = RequestFactory()
+
+    def request(self, method, path, data=None, token=None, **extra):
+        if token:
+            extra["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        if data is not None:
+            request = self.factory.generic(method, path, json.dumps(data), content_type="application/json", **extra)
+        else:
+            request = self.factory.generic(method, path, **extra)
+
+        status = []
+        response = self.handler(request.environ, lambda code, headers, exc_info=None: status.append(code))
+        try:
+            body = b"".join(response)
+        finally:
+            response.close()
+        return int(status[0].split()[0]), body
+
+
+class ASGIRequester:
+    """
+    Sends requests through the real ASGI handler in-process, the way an ASGI
+    server would: one ``http`` scope per request, the body in a single
+    ``http.request`` message, the response collected from ``send``.
+    """
+
+    def __init__(self):
+        self.handler = ASGIHandler()
+
+    async def request(self, method, path, data=None, token=None, headers=None):
+        path, _, query = path.partition("?")
+        body = json.dumps(data).encode() if data is not None else b""
+        raw_headers = [(b"host", b"testserver")]
+        if token:
+            raw_headers.append((b"authorization", f"Bearer {token}".encode()))
+        if data is not None:
+            raw_headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        for name, value in (headers or {}).items():
+            raw_headers.append((name.lower().encode(), value.encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+        finished = asyncio.Event()
+        body_sent = False
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await finished.wait()  # the client stays connected until the response ends
+            return {"type": "http.disconnect"}
+
+        status, chunks = [], []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.handler(scope, receive, send)
+        finally:
+            finished.set()
+        return status[0], b"".join(chunks)
@@ -0,0 +1,64 @@
+"""
+Database connection metrics.
+
+Counts the connections this process has opened (``connection_created``) and,
+when the psycopg pool is configured (``DB_POOL=True``), reports its stats.
+"""
+import threading
+from collections import Counter
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_lock = threading.Lock()
+_created = Counter()
+
+
+def _count_connection(sender, connection, **kwargs):
+    with _lock:
+        _created[connection.alias] += 1
+
+
+def connect_signals():
+    connection_created.connect(_count_connection, dispatch_uid="monitoring.count_db_connections")
+
+
+def connections_created(alias="default"):
+    with _lock:
+        return _created[alias]
+
+
+def pool_stats(alias="default"):
+    """Stats of the psycopg pool behind ``alias``, or None when it isn't pooled."""
+    # Only the postgresql backend has .pool, and it's None without OPTIONS["pool"]
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+    raw = pool.get_stats()
+    size = raw.get("pool_size", 0)
+    available = raw.get("pool_available", 0)
+    return {
+        "min_size": raw.get("pool_min", 0),
+        "max_size": raw.get("pool_max", 0),
+        "size": size,
+        "available": available,
+        "in_use": size - available,
+        "waiting": raw.get("requests_waiting", 0),
+        "created": raw.get("connections_num", 0),
+        "requests": raw.get("requests_num", 0),
+        "wait_ms": raw.get("requests_wait_ms", 0),
+        "timeouts": raw.get("requests_errors", 0),
+        "connection_errors": raw.get("connections_errors", 0),
+    }
+
+
+def connection_stats(alias="default"):
+    wrapper = connections[alias]
+    return {
+        "alias": alias,
+        "vendor": wrapper.vendor,
+        "conn_max_age": wrapper.settings_dict.get("CONN_MAX_AGE"),
+        "health_checks": wrapper.settings_dict.get("CONN_HEALTH_CHECKS"),
+        "connections_created": connections_created(alias),
+        "pool": pool_stats(alias),
+    }
@@ -0,0 +1,245 @@
+"""
+Mixed-workload load test for the auth, password and address endpoints.
+
+Each thread plays one virtual user with its own account and tokens, picking
+weighted actions (log in, refresh, read the profile, address CRUD, register,
+OTP reset, change password) from a seeded RNG so runs are repeatable.
+Requests go through the real WSGI handler against the configured database;
+OTP emails stay in the outbox table and the code is read back from there.
+"""
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import connections
+from django.db.models import Q
+
+from apps.accounts.models import User
+from apps.outbox.models import OutboxEmail
+
+from .bench import WSGIRequester, summarize
+
+USERNAME_PREFIX = "loadtest_"
+OTP_PATTERN = re.compile(r"Your OTP is: (\d+)")
+
+# Relative weights of the actions in the default mixed workload
+DEFAULT_WEIGHTS = {
+    "login": 15,
+    "refresh": 15,
+    "profile": 15,
+    "address_list": 15,
+    "address_check": 10,
+    "address_create": 5,
+    "address_update": 5,
+    "register": 5,
+    "password_reset": 4,
+    "change_password": 3,
+}
+
+
+class VirtualUser:
+    def __init__(self, index, requester, rng, record):
+        self.index = index
+        self.username = f"{USERNAME_PREFIX}{index}"
+        self.email = f"{self.username}@loadtest.invalid"
+        self.password = f"Load-test-{index}-pass"
+        self.requester = requester
+        self.rng = rng
+        self.record = record
+        self.access = self.refresh_token = None
+        self.address_ids = []
+        self.registered = 0
+
+    # ---------- plumbing ----------
+
+    def call(self, endpoint, method, path, data=None, auth=True, expect=(200, 201)):
+        start = time.perf_counter()
+        status, body = self.requester.request(method, path, data=data, token=self.access if auth else None)
+        self.record(endpoint, time.perf_counter() - start, status in expect, status)
+        if status in expect and body:
+            return json.loads(body)
+        return None
+
+    def ensure_logged_in(self):
+        if self.access is None:
+            self.login()
+
+    # ---------- actions ----------
+
+    def login(self):
+        data = self.call("login", "POST", "/api/auth/login/",
+                         {"username": self.username, "password": self.password}, auth=False)
+        if data:
+            self.access, self.refresh_token = data["access"], data["refresh"]
+
+    def refresh(self):
+        data = self.call("token_refresh", "POST", "/api/auth/token/refresh/",
+                         {"refresh": self.refresh_token}, auth=False)
+        if data:
+            self.access = data["access"]
+            self.refresh_token = data.get("refresh", self.refresh_token)
+
+    def profile(self):
+        self.call("profile", "GET", "/api/auth/profile/")
+
+    def address_list(self):
+        self.call("address_list", "GET", "/api/addresses/")
+
+    def address_check(self):
+        self.call("address_check", "GET", "/api/addresses/check/")
+
+    def _address_payload(self):
+        return {
+            "house_flat": f"{self.rng.randint(1, 999)}",
+            "street": "MG Road",
+            "city": "Hyderabad",
+            "state": "Telangana",
+            "postal_code": "500001",
+            "country": "India",
+        }
+
+    def address_create(self):
+        data = self.call("address_create", "POST", "/api/addresses/", self._address_payload())
+        if data:
+            self.address_ids.append(data["id"])
+
+    def address_update(self):
+        if not self.address_ids:
+            return self.address_create()
+        address_id = self.rng.choice(self.address_ids)
+        self.call("address_update", "PUT", f"/api/addresses/{address_id}/", self._address_payload())
+
+    def register(self):
+        self.registered += 1
+        username = f"{self.username}_r{self.registered}"
+        self.call("register", "POST", "/api/auth/register/", {
+            "username": username,
+            "email": f"{username}@loadtest.invalid",
+            # +999 is an unassigned country code, so no real account's number can clash
+            "phone": f"+999{self.index:04d}{self.registered:07d}",
+            "password": self.password,
+        }, auth=False)
+
+    def password_reset(self):
+        if not self.call("send_otp", "POST", "/api/password-reset/send-otp/", {"email": self.email}, auth=False):
+            return
+        # The "user" reads the code from the email waiting in the outbox
+        email = OutboxEmail.objects.filter(recipients=[self.email]).order_by("-id").first()
+        match = OTP_PATTERN.search(email.body) if email else None
+        if match is None:
+            self.record("verify_otp", 0.0, False, 0)
+            return
+        new_password = self._next_password()
+        if self.call("verify_otp", "POST", "/api/password-reset/verify-otp/", {
+            "email": self.email,
+            "otp": match.group(1),
+            "new_password": new_password,
+            "confirm_password": new_password,
+        }, auth=False) is not None:
+            self.password = new_password
+            self.access = None
+
+    def change_password(self):
+        new_password = self._next_password()
+        if self.call("change_password", "POST", "/api/change-password/change-password/", {
+            "old_password": self.password,
+            "new_password": new_password,
+            "confirm_password": new_password,
+        }) is not None:
+            self.password = new_password
+            self.access = None
+
+    def _next_password(self):
+        return f"{self.username}-{self.rng.randrange(10 ** 8)}"
+
+
+def setup_users(count, make_password):
+    """Create (or reset) the virtual users' accounts in one bulk insert."""
+    cleanup()
+    users = []
+    for index in range(count):
+        probe = VirtualUser(index, None, None, None)
+        user = User(username=probe.username, email=probe.email, password=make_password(probe.password))
+        user.sync_identity()  # bulk_create skips save()
+        users.append(user)
+    User.objects.bulk_create(users)
+
+
+def cleanup():
+    """Delete the load-test accounts (addresses cascade) and the OTP emails queued for them."""
+    users = User.objects.filter(username__startswith=USERNAME_PREFIX)
+    emails = list(users.values_list("email", flat=True))
+    if emails:
+        OutboxEmail.objects.filter(reduce(or_, (Q(recipients=[email]) for email in emails))).delete()
+    users.delete()
+
+
+def run(actions_total, concurrency, weights=None, seed=0, warmup=0):
+    """Run ``actions_total`` actions spread over ``concurrency`` virtual users; return the report."""
+    weights = weights or DEFAULT_WEIGHTS
+    actions, action_weights = zip(*weights.items())
+    requester = WSGIRequester()
+    samples = defaultdict(lambda: {"latencies": [], "errors": 0, "statuses": defaultdict(int)})
+    lock = threading.Lock()
+    recording = threading.Event()
+    remaining = [actions_total]
+
+    def record(endpoint, elapsed, ok, status):
+        if not recording.is_set():
+            return
+        with lock:
+            entry = samples[endpoint]
+            entry["statuses"][str(status)] += 1
+            if ok:
+                entry["latencies"].append(elapsed)
+            else:
+                entry["errors"] += 1
+
+    def worker(index):
+        user = VirtualUser(index, requester, random.Random(seed + index), record)
+        try:
+            for _ in range(warmup):
+                user.ensure_logged_in()
+                getattr(user, user.rng.choices(actions, action_weights)[0])()
+            barrier.wait()
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                user.ensure_logged_in()
+                getattr(user, user.rng.choices(actions, action_weights)[0])()
+        finally:
+            connections.close_all()
+
+    def start_recording():
+        recording.set()
+        started.append(time.perf_counter())
+
+    started = []
+    barrier = threading.Barrier(concurrency, action=start_recording)
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started[0] if started else 0.0
+
+    endpoints = {}
+    all_latencies, all_errors = [], 0
+    for endpoint, entry in sorted(samples.items()):
+        endpoints[endpoint] = summarize(entry["latencies"], entry["errors"], elapsed)
+        endpoints[endpoint]["statuses"] = dict(entry["statuses"])
+        all_latencies += entry["latencies"]
+        all_errors += entry["errors"]
+
+    return {
+        "elapsed_seconds": elapsed,
+        "total": summarize(all_latencies, all_errors, elapsed),
+        "endpoints": endpoints,
+    }
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import threading
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.authentication import add_user_claims
+from apps.accounts.models import User
+from apps.addresses.models import Address
+from apps.monitoring.bench import (
+    ASGIRequester, ThreadSampler, WSGIRequester, reload_urlconfs, run_concurrently, run_concurrently_async,
+    summarize,
+)
+from apps.outbox.models import OutboxEmail
+
+BENCH_USERNAME = "bench_asgi_user"
+BENCH_EMAIL = "bench-asgi@example.com"
+
+ENDPOINTS = {
+    "profile": ("GET", "/api/auth/profile/", None),
+    "addresses": ("GET", "/api/addresses/", None),
+    "send-otp": ("POST", "/api/password-reset/send-otp/", {"identifier": BENCH_USERNAME}),
+    # Held open for --stream-seconds: the slow-connection case
+    "stats-stream": ("GET", "/api/auth/admin/stats/stream/", None),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the WSGI deployment (sync views on a fixed pool of server threads) "
+        "with the ASGI deployment (USE_ASYNC_VIEWS, one event loop) for the same "
+        "number of concurrent clients, through the real WSGI / ASGI handlers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", action="append", dest="endpoints", choices=sorted(ENDPOINTS),
+                            help="Endpoint to hit (repeatable). Defaults to all of them.")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and mode.")
+        parser.add_argument("--clients", type=int, default=100, help="Concurrent clients.")
+        parser.add_argument("--threads", type=int, default=8,
+                            help="WSGI server threads (e.g. gunicorn --threads); clients beyond this queue.")
+        parser.add_argument("--stream-seconds", type=float, default=2.0,
+                            help="How long each stats-stream connection stays open.")
+        parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+
+    def handle(self, *args, **options):
+        endpoints = options["endpoints"] or list(ENDPOINTS)
+        user, _ = User.objects.get_or_create(
+            username=BENCH_USERNAME, defaults={"email": BENCH_EMAIL, "is_staff": True, "role": "admin"}
+        )
+        Address.objects.get_or_create(
+            user=user, defaults={"house_flat": "1", "street": "Bench Street", "city": "Hyderabad",
+                                 "state": "Telangana", "postal_code": "500001", "country": "India"},
+        )
+        refresh = RefreshToken.for_user(user)
+        add_user_claims(refresh, user)
+        token = str(refresh.access_token)
+
+        overrides = {
+            "THROTTLE_RATES": {},
+            "LOAD_SHEDDING": {},
+            "USER_STATS_STREAM_MAX_SECONDS": options["stream_seconds"],
+            "USER_STATS_STREAM_HEARTBEAT_SECONDS": options["stream_seconds"],
+        }
+        results = []
+        try:
+            for mode in ("wsgi", "asgi"):
+                with override_settings(**overrides, USE_ASYNC_VIEWS=mode == "asgi"):
+                    reload_urlconfs()
+                    for name in endpoints:
+                        total = options["requests"]
+                        if name == "stats-stream":
+                            total = min(total, options["clients"])  # one long request per client
+                        run = self.run_wsgi if mode == "wsgi" else self.run_asgi
+                        with ThreadSampler() as sampler:
+                            latencies, errors, elapsed = run(ENDPOINTS[name], token, total, options)
+                        row = {"mode": mode, "endpoint": name, **summarize(latencies, errors, elapsed)}
+                        row["peak_threads"] = sampler.peak
+                        results.append(row)
+        finally:
+            reload_urlconfs()
+            OutboxEmail.objects.filter(recipients=[user.email]).delete()
+            user.delete()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{options['requests']} requests per run, {options['clients']} concurrent clients, "
+            f"{options['threads']} WSGI threads"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['mode']:<5} {row['endpoint']:<13} {row['rps']:>8.1f} req/s   "
+                f"p50={row['p50_ms']:.1f}ms p95={row['p95_ms']:.1f}ms p99={row['p99_ms']:.1f}ms   "
+                f"threads={row['peak_threads']} errors={row['errors']}"
+            )
+
+    def run_wsgi(self, endpoint, token, total, options):
+        method, path, data = endpoint
+        requester = WSGIRequester()
+        # Clients connect at once but only --threads requests are served at a time
+        server_threads = threading.BoundedSemaphore(options["threads"])
+
+        def job():
+            with server_threads:
+                status, _ = requester.request(method, path, data=data, token=token)
+            return status < 400
+
+        job()  # warm up
+        return run_concurrently(total, options["clients"], job)
+
+    def run_asgi(self, endpoint, token, total, options):
+        method, path, data = endpoint
+        requester = ASGIRequester()
+
+        async def job():
+            status, _ = await requester.request(method, path, data=data, token=token)
+            return status < 400
+
+        async def main():
+            await job()  # warm up
+            return await run_concurrently_async(total, options["clients"], job)
+
+        return asyncio.run(main())
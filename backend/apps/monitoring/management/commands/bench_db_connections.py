@@ -0,0 +1,95 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.authentication import add_user_claims
+from apps.accounts.models import User
+from apps.monitoring import db
+from apps.monitoring.bench import WSGIRequester, run_concurrently, summarize
+
+BENCH_USERNAME = "bench_db_user"
+BENCH_PASSWORD = "bench-db-Passw0rd"
+
+ENDPOINTS = {
+    "check-address": ("GET", "/api/addresses/check/", None),
+    "addresses": ("GET", "/api/addresses/", None),
+    "profile": ("GET", "/api/auth/profile/", None),
+    "login": ("POST", "/api/auth/login/", {"username": BENCH_USERNAME, "password": BENCH_PASSWORD}),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark requests/sec of auth and address endpoints through the WSGI "
+        "handler with a new connection per request vs the configured connection "
+        "management (persistent connections or the psycopg pool)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", action="append", dest="endpoints", choices=sorted(ENDPOINTS),
+                            help="Endpoint to hit (repeatable). Defaults to check-address, profile and login.")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and mode.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent request threads.")
+        parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+
+    def handle(self, *args, **options):
+        endpoints = options["endpoints"] or ["check-address", "profile", "login"]
+        user, _ = User.objects.get_or_create(username=BENCH_USERNAME, defaults={"email": "bench-db@example.com"})
+        user.set_password(BENCH_PASSWORD)
+        user.save()
+        refresh = RefreshToken.for_user(user)
+        add_user_claims(refresh, user)
+        token = str(refresh.access_token)
+
+        requester = WSGIRequester()
+        db_settings = connections.settings["default"]
+        pooled = bool(db_settings.get("OPTIONS", {}).get("pool"))
+        configured_max_age = db_settings.get("CONN_MAX_AGE", 0)
+        baseline = ("per-request (CONN_MAX_AGE=0)", 0)
+
+        # A pool can't be switched off in-process: run once with DB_POOL=False for the baseline
+        if pooled:
+            modes = [("pool", configured_max_age)]
+        elif configured_max_age:
+            modes = [baseline, (f"persistent (CONN_MAX_AGE={configured_max_age})", configured_max_age)]
+        else:
+            modes = [baseline]
+
+        results = []
+        try:
+            for mode, max_age in modes:
+                # Every thread's DatabaseWrapper shares this settings dict
+                db_settings["CONN_MAX_AGE"] = max_age
+                for name in endpoints:
+                    method, path, data = ENDPOINTS[name]
+
+                    def job():
+                        status, _ = requester.request(method, path, data=data, token=token)
+                        return status < 400
+
+                    job()  # warm up
+                    opened_before = db.connections_created()
+                    latencies, errors, elapsed = run_concurrently(options["requests"], options["concurrency"], job)
+                    row = {"mode": mode, "endpoint": name, **summarize(latencies, errors, elapsed)}
+                    row["connections_opened"] = db.connections_created() - opened_before
+                    results.append(row)
+        finally:
+            db_settings["CONN_MAX_AGE"] = configured_max_age
+            user.delete()
+
+        report = {"database": db.connection_stats(), "results": results}
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{options['requests']} requests per run, concurrency {options['concurrency']}")
+        for row in results:
+            self.stdout.write(
+                f"{row['mode']:<34} {row['endpoint']:<14} {row['rps']:>8.1f} req/s   "
+                f"p50={row['p50_ms']:.1f}ms p95={row['p95_ms']:.1f}ms p99={row['p99_ms']:.1f}ms   "
+                f"connections={row['connections_opened']} errors={row['errors']}"
+            )
+        if report["database"]["pool"]:
+            self.stdout.write(f"Pool: {report['database']['pool']}")
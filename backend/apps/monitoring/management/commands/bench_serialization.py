@@ -0,0 +1,115 @@
+import json
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.accounts.fast_serializers import ValuesSerializer
+from apps.accounts.models import User
+from apps.accounts.renderers import ORJSONRenderer, orjson
+from apps.accounts.serializers import UserSerializer
+from apps.addresses.models import Address
+from apps.addresses.serializers import AddressSerializer
+
+
+def sample_users(count):
+    return [
+        User(id=i, username=f"user{i}", first_name="Ravi", last_name=f"Kumar{i}", email=f"user{i}@example.com",
+             phone=f"98765{i:05d}", role="user", is_active=i % 7 != 0)
+        for i in range(1, count + 1)
+    ]
+
+
+def sample_addresses(count):
+    now = timezone.now()
+    return [
+        Address(id=i, user_id=i, house_flat=f"{i}-4/2", street="MG Road", landmark="Near Metro", area="Ameerpet",
+                district="Hyderabad", city="Hyderabad", state="Telangana", postal_code="500016", country="India",
+                created_at=now - timedelta(minutes=i))
+        for i in range(1, count + 1)
+    ]
+
+
+def as_values_rows(instances, values_serializer):
+    return [{column: getattr(obj, column) for column in values_serializer.columns} for obj in instances]
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark the user and address listing read paths: ModelSerializer + "
+        "JSONRenderer vs values() rows + ValuesSerializer + ORJSONRenderer, per N rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="Rows per listing.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (the best is reported).")
+        parser.add_argument("--from-db", action="store_true",
+                            help="Also fetch the rows from the database (instances vs values()), using existing data.")
+        parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        listings = [
+            ("users", UserSerializer, sample_users(rows), User.objects.order_by("-id")),
+            ("addresses", AddressSerializer, sample_addresses(rows), Address.objects.order_by("id")),
+        ]
+        json_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+        results = []
+
+        for name, serializer_class, instances, queryset in listings:
+            values_serializer = ValuesSerializer(serializer_class)
+            values_rows = as_values_rows(instances, values_serializer)
+
+            serialize_before, data_before = best_of(repeat, lambda: serializer_class(instances, many=True).data)
+            render_before, body_before = best_of(repeat, lambda: json_renderer.render(data_before))
+            serialize_after, data_after = best_of(repeat, lambda: values_serializer.to_representation(values_rows))
+            render_after, body_after = best_of(repeat, lambda: fast_renderer.render(data_after))
+
+            if json.loads(body_before) != json.loads(body_after):
+                self.stderr.write(f"{name}: fast path output differs from the ModelSerializer's")
+
+            row = {
+                "listing": name,
+                "rows": rows,
+                "before_serialize_ms": serialize_before * 1000,
+                "before_render_ms": render_before * 1000,
+                "after_serialize_ms": serialize_after * 1000,
+                "after_render_ms": render_after * 1000,
+            }
+            if options["from_db"]:
+                limited = queryset[:rows]
+                row["db_rows"] = limited.count()
+                row["before_fetch_ms"] = best_of(repeat, lambda: list(limited))[0] * 1000
+                row["after_fetch_ms"] = best_of(repeat, lambda: list(values_serializer.values(limited)))[0] * 1000
+            results.append(row)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"Best of {repeat}, {rows} rows; after = values() + ValuesSerializer + "
+                          f"{'orjson' if orjson else 'JSONRenderer (orjson not installed)'}")
+        for row in results:
+            before = row["before_serialize_ms"] + row["before_render_ms"]
+            after = row["after_serialize_ms"] + row["after_render_ms"]
+            self.stdout.write(
+                f"{row['listing']:<10} before {before:8.1f}ms (serialize {row['before_serialize_ms']:.1f} + "
+                f"render {row['before_render_ms']:.1f})   after {after:8.1f}ms (serialize "
+                f"{row['after_serialize_ms']:.1f} + render {row['after_render_ms']:.1f})   {before / after:.1f}x"
+            )
+            if "db_rows" in row:
+                self.stdout.write(
+                    f"{'':<10} fetch {row['db_rows']} rows: instances {row['before_fetch_ms']:.1f}ms, "
+                    f"values() {row['after_fetch_ms']:.1f}ms"
+                )
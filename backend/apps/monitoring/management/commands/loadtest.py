@@ -0,0 +1,101 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.accounts import hashing
+from apps.monitoring import loadtest
+
+LOCMEM_EMAIL = "django.core.mail.backends.locmem.EmailBackend"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a repeatable mixed workload (login, refresh, register, OTP reset, "
+        "change password, profile and address CRUD) against the local database "
+        "and report RPS and p50/p95/p99 per endpoint as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--actions", type=int, default=2000, help="Actions to run after warm-up.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Virtual users (threads).")
+        parser.add_argument("--warmup", type=int, default=5, help="Unrecorded actions per virtual user first.")
+        parser.add_argument("--seed", type=int, default=0, help="RNG seed, for comparable runs.")
+        parser.add_argument("--weight", action="append", default=[], metavar="ACTION=N",
+                            help=f"Override an action's weight (repeatable). Actions: {', '.join(loadtest.DEFAULT_WEIGHTS)}.")
+        parser.add_argument("--fast-hashing", action="store_true",
+                            help="Hash with MD5 inline, to measure everything except password hashing.")
+        parser.add_argument("--output", help="Also write the JSON report to this file.")
+        parser.add_argument("--keep-data", action="store_true", help="Leave the load-test users in the database.")
+
+    def _weights(self, overrides):
+        weights = dict(loadtest.DEFAULT_WEIGHTS)
+        for item in overrides:
+            action, _, value = item.partition("=")
+            if action not in weights or not value.isdigit():
+                raise CommandError(f"Invalid --weight {item!r}; use ACTION=N with one of: {', '.join(weights)}.")
+            weights[action] = int(value)
+        weights = {action: weight for action, weight in weights.items() if weight}
+        if not weights:
+            raise CommandError("At least one action needs a non-zero weight.")
+        return weights
+
+    def handle(self, *args, **options):
+        weights = self._weights(options["weight"])
+        # Virtual users would trip the per-account rate limits within seconds
+        overrides = {"EMAIL_BACKEND": LOCMEM_EMAIL, "OUTBOX_EMAIL_BACKEND": LOCMEM_EMAIL, "THROTTLE_RATES": {}}
+        if options["fast_hashing"]:
+            overrides["PASSWORD_HASHERS"] = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+            overrides["PASSWORD_HASHING"] = {**hashing.get_config(), "WORKERS": 0}
+
+        with override_settings(**overrides):
+            # Start the hashing pool afresh so it picks up the overrides (and again afterwards)
+            hashing.shutdown()
+            try:
+                loadtest.setup_users(options["concurrency"], hashing.make_password)
+                result = loadtest.run(
+                    options["actions"], options["concurrency"], weights,
+                    seed=options["seed"], warmup=options["warmup"],
+                )
+            finally:
+                if not options["keep_data"]:
+                    loadtest.cleanup()
+                hashing.shutdown()
+
+        report = {
+            "meta": {
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "actions": options["actions"],
+                "concurrency": options["concurrency"],
+                "warmup": options["warmup"],
+                "seed": options["seed"],
+                "fast_hashing": options["fast_hashing"],
+                "weights": weights,
+            },
+            **result,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output + "\n")
+        self.stdout.write(output)
@@ -0,0 +1,226 @@
+"""
+In-process request metrics, exposed in Prometheus text format.
+
+``MetricsMiddleware`` counts every request by route, method and status. A
+sampled share of requests (``METRICS_SAMPLE_RATE``) is also timed and has its
+SQL wrapped with ``execute_wrapper`` to count queries and database time.
+``timer()`` records other slow operations (password hashing, SMTP).
+
+Aggregates live in this process only: each worker exposes its own, which
+Prometheus sums across scrape targets.
+"""
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    """Thread-safe counters and histograms keyed by label tuples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}         # (route, method, status) -> count
+            self.latency = {}          # (route, method) -> Histogram
+            self.db_queries = {}       # (route, method) -> queries in sampled requests
+            self.db_seconds = {}       # (route, method) -> DB time in sampled requests
+            self.operations = {}       # operation -> Histogram
+
+    def record_request(self, route, method, status, duration=None, queries=0, db_time=0.0):
+        with self._lock:
+            key = (route, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if duration is None:
+                return
+            key = (route, method)
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram()
+            histogram.observe(duration)
+            self.db_queries[key] = self.db_queries.get(key, 0) + queries
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + db_time
+
+    def record_operation(self, operation, duration):
+        with self._lock:
+            histogram = self.operations.get(operation)
+            if histogram is None:
+                histogram = self.operations[operation] = Histogram()
+            histogram.observe(duration)
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total Requests by route, method and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels(route=route, method=method, status=status)} {count}")
+
+            lines += [
+                "# HELP http_request_duration_seconds Latency of sampled requests.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (route, method), histogram in sorted(self.latency.items()):
+                lines += _histogram_lines("http_request_duration_seconds", histogram, route=route, method=method)
+
+            lines += [
+                "# HELP http_request_db_queries_total SQL queries run by sampled requests.",
+                "# TYPE http_request_db_queries_total counter",
+            ]
+            for (route, method), count in sorted(self.db_queries.items()):
+                lines.append(f"http_request_db_queries_total{_labels(route=route, method=method)} {count}")
+
+            lines += [
+                "# HELP http_request_db_seconds_total Time spent in SQL by sampled requests.",
+                "# TYPE http_request_db_seconds_total counter",
+            ]
+            for (route, method), seconds in sorted(self.db_seconds.items()):
+                lines.append(f"http_request_db_seconds_total{_labels(route=route, method=method)} {seconds:.6f}")
+
+            lines += [
+                "# HELP operation_duration_seconds Duration of slow operations (password hashing, SMTP).",
+                "# TYPE operation_duration_seconds histogram",
+            ]
+            for operation, histogram in sorted(self.operations.items()):
+                lines += _histogram_lines("operation_duration_seconds", histogram, operation=operation)
+
+            lines += [
+                "# HELP metrics_sample_rate Share of requests that are timed.",
+                "# TYPE metrics_sample_rate gauge",
+                f"metrics_sample_rate {get_sample_rate()}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(name, histogram, **labels):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(BUCKETS + ("+Inf",), histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.total:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+registry = Registry()
+
+
+def get_sample_rate():
+    return getattr(settings, "METRICS_SAMPLE_RATE", 1.0)
+
+
+@contextmanager
+def timer(operation):
+    """Record how long the block takes under ``operation``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.record_operation(operation, time.perf_counter() - start)
+
+
+class _QueryTimer:
+    """execute_wrapper that counts queries and the time spent running them."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= get_sample_rate():
+            response = self.get_response(request)
+            registry.record_request(_route(request), request.method, response.status_code)
+            return response
+
+        query_timer = _QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_timer))
+            response = self.get_response(request)
+        # Streaming responses are timed until the view returns, not until the stream ends
+        registry.record_request(
+            _route(request),
+            request.method,
+            response.status_code,
+            duration=time.perf_counter() - start,
+            queries=query_timer.queries,
+            db_time=query_timer.seconds,
+        )
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= get_sample_rate():
+            response = await self.get_response(request)
+            registry.record_request(_route(request), request.method, response.status_code)
+            return response
+
+        # Async views run their queries on sync_to_async threads, out of reach
+        # of execute_wrapper here, so only the latency is recorded
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        registry.record_request(
+            _route(request), request.method, response.status_code, duration=time.perf_counter() - start
+        )
+        return response
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import db_connections_view
+
+urlpatterns = [
+    path("db/", db_connections_view, name="monitoring-db"),
+]
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.exceptions import APIException
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from apps.accounts.authentication import ClaimsJWTAuthentication
+
+from .db import connection_stats
+from .metrics import registry
+
+
+# ✅ Admin — Database Connection / Pool Metrics
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def db_connections_view(request):
+    """GET /api/monitoring/db/ → per-alias connection settings, connections opened and pool stats"""
+    return Response({"databases": [connection_stats(alias) for alias in connections]})
+
+
+def _metrics_allowed(request):
+    """The scraper sends ``Authorization: Bearer <METRICS_TOKEN>``; admins can use their JWT."""
+    header = request.headers.get("Authorization", "")
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(header, f"Bearer {token}"):
+        return True
+    try:
+        result = ClaimsJWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+    return result is not None and result[0].is_staff
+
+
+# ✅ Prometheus scrape endpoint (plain Django view — Prometheus wants text, not DRF JSON)
+def metrics_view(request):
+    if not _metrics_allowed(request):
+        return HttpResponse("Forbidden\n", status=403, content_type="text/plain")
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.outbox.services import deliver_batch, get_outbox_connection
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails in batches over a reused mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain due emails once and exit.")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--interval", type=float, default=getattr(settings, "OUTBOX_POLL_SECONDS", 2),
+            help="Seconds to sleep when nothing is due.",
+        )
+
+    def handle(self, *args, **options):
+        connection = None
+        try:
+            while True:
+                if connection is None:
+                    connection = get_outbox_connection()
+                sent, failed = deliver_batch(connection, options["batch_size"])
+                if sent or failed:
+                    self.stdout.write(f"Outbox: sent {sent}, failed {failed}")
+                    continue
+                if options["once"]:
+                    break
+                # Idle — don't hold the SMTP session open while nothing is queued
+                connection.close()
+                connection = None
+                time.sleep(options["interval"])
+        finally:
+            if connection is not None:
+                connection.close()
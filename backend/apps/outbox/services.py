@@ -0,0 +1,190 @@
+"""
+Email outbox.
+
+Views call ``enqueue_email`` (one INSERT, no network) and return; the
+delivery worker picks rows up in batches over a reused SMTP connection and
+retries failures with exponential backoff. Async views can also hand the row
+to ``deliver_soon``, which sends it on the event loop with aiosmtplib.
+"""
+import asyncio
+import logging
+import random
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.monitoring.metrics import timer
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, body, recipients, from_email=None, not_before=None):
+    """
+    Queue an email for the outbox worker and return the ``OutboxEmail`` row.
+    The worker leaves it alone until ``not_before`` (default: now).
+    """
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipients),
+        next_attempt_at=not_before or timezone.now(),
+    )
+
+
+def get_outbox_connection():
+    """Return a mail connection that the worker keeps open across messages."""
+    backend = getattr(settings, "OUTBOX_EMAIL_BACKEND", settings.EMAIL_BACKEND)
+    return get_connection(backend=backend, fail_silently=False)
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter: base, 2×base, 4×base, ... (capped at an hour)."""
+    base = getattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 30)
+    delay = min(base * 2 ** (attempts - 1), 3600)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(batch_size):
+    """
+    Lease up to ``batch_size`` due emails to this worker and return them.
+
+    One short transaction picks the rows with ``SELECT ... FOR UPDATE SKIP
+    LOCKED`` (so several workers can run side by side) and marks them
+    ``sending`` until ``OUTBOX_LEASE_SECONDS`` from now. No lock is held while
+    mail is sent; rows whose lease runs out (a worker died mid-batch) become
+    due again.
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=getattr(settings, "OUTBOX_LEASE_SECONDS", 300))
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status__in=(OutboxEmail.PENDING, OutboxEmail.SENDING), next_attempt_at__lte=now)
+            .order_by("next_attempt_at")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=ids).update(
+            status=OutboxEmail.SENDING, next_attempt_at=lease_until, attempts=F("attempts") + 1
+        )
+    return list(OutboxEmail.objects.filter(pk__in=ids).order_by("pk"))
+
+
+def deliver_batch(connection, batch_size=None):
+    """
+    Send up to ``batch_size`` due emails over ``connection``.
+
+    Rows are leased by ``claim_batch``, sent outside any transaction, and the
+    results are written back in a second short one. Returns ``(sent, failed)``.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 50)
+    max_attempts = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 5)
+    sent = failed = 0
+
+    emails = claim_batch(batch_size)
+    for email in emails:
+        message = EmailMessage(
+            email.subject, email.body, email.from_email, email.recipients,
+            connection=connection,
+        )
+        try:
+            # No-op while the connection is open; reconnects after a failure
+            with timer("smtp_send"):
+                connection.open()
+                message.send()
+        except Exception as exc:
+            logger.warning("Outbox email %s failed (attempt %s): %s", email.pk, email.attempts, exc)
+            email.last_error = str(exc)
+            if email.attempts >= max_attempts:
+                email.status = OutboxEmail.FAILED
+            else:
+                email.status = OutboxEmail.PENDING
+                email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+            failed += 1
+            # The connection may be unusable now — drop it so the next send reconnects
+            connection.close()
+        else:
+            email.status = OutboxEmail.SENT
+            email.sent_at = timezone.now()
+            email.last_error = ""
+            sent += 1
+
+    with transaction.atomic():
+        OutboxEmail.objects.bulk_update(emails, ["status", "next_attempt_at", "last_error", "sent_at"])
+
+    return sent, failed
+
+
+# ---------- Async delivery (aiosmtplib, optional) ----------
+
+@lru_cache(maxsize=None)
+def _aiosmtplib_installed():
+    try:
+        import aiosmtplib  # noqa: F401
+    except ImportError:
+        logger.warning("OUTBOX_ASYNC_SMTP is on but aiosmtplib is not installed; the worker will send mail")
+        return False
+    return True
+
+
+def async_smtp_enabled():
+    """True when ``OUTBOX_ASYNC_SMTP`` is on, mail goes over SMTP and aiosmtplib is installed."""
+    if not getattr(settings, "OUTBOX_ASYNC_SMTP", False):
+        return False
+    backend = getattr(settings, "OUTBOX_EMAIL_BACKEND", settings.EMAIL_BACKEND)
+    return backend == "django.core.mail.backends.smtp.EmailBackend" and _aiosmtplib_installed()
+
+
+def async_grace_deadline():
+    """``not_before`` for rows handed to ``deliver_soon``: the worker waits this long for the async send."""
+    return timezone.now() + timedelta(seconds=getattr(settings, "OUTBOX_ASYNC_GRACE_SECONDS", 60))
+
+
+async def adeliver(email):
+    """
+    Send one queued ``OutboxEmail`` over aiosmtplib and mark it sent. On
+    failure the row is made due again, so the worker retries it as usual.
+    """
+    import aiosmtplib
+
+    message = EmailMessage(email.subject, email.body, email.from_email, email.recipients).message()
+    pending = OutboxEmail.objects.filter(pk=email.pk, status=OutboxEmail.PENDING)
+    try:
+        with timer("smtp_send"):
+            await aiosmtplib.send(
+                message,
+                sender=email.from_email,
+                recipients=email.recipients,
+                hostname=settings.EMAIL_HOST,
+                port=settings.EMAIL_PORT,
+                username=settings.EMAIL_HOST_USER or None,
+                password=settings.EMAIL_HOST_PASSWORD or None,
+                start_tls=settings.EMAIL_USE_TLS,
+                use_tls=settings.EMAIL_USE_SSL,
+                timeout=settings.EMAIL_TIMEOUT or 30,
+            )
+    except Exception as exc:
+        logger.warning("Async send of outbox email %s failed, leaving it to the worker: %s", email.pk, exc)
+        await pending.aupdate(attempts=F("attempts") + 1, last_error=str(exc), next_attempt_at=timezone.now())
+        return False
+    await pending.aupdate(status=OutboxEmail.SENT, sent_at=timezone.now(), attempts=F("attempts") + 1, last_error="")
+    return True
+
+
+# Strong references, so running sends aren't garbage-collected mid-flight
+_background_sends = set()
+
+
+def deliver_soon(email):
+    """Start ``adeliver(email)`` on the running event loop without waiting for it."""
+    task = asyncio.get_running_loop().create_task(adeliver(email))
+    _background_sends.add(task)
+    task.add_done_callback(_background_sends.discard)
+    return task
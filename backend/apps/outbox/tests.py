@@ -0,0 +1,70 @@
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import OutboxEmail
+from .services import claim_batch, deliver_batch, enqueue_email, get_outbox_connection
+
+
+@override_settings(
+    OUTBOX_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    OUTBOX_LEASE_SECONDS=300,
+    OUTBOX_MAX_ATTEMPTS=2,
+)
+class OutboxDeliveryTests(TestCase):
+    def setUp(self):
+        self.email = enqueue_email("Your code", "123456", ["ravi@example.com"])
+
+    def deliver(self):
+        return deliver_batch(get_outbox_connection())
+
+    def reload(self):
+        self.email.refresh_from_db()
+        return self.email
+
+    def test_send_marks_sent_and_clears_the_lease(self):
+        self.assertEqual(self.deliver(), (1, 0))
+
+        email = self.reload()
+        self.assertEqual((email.status, email.attempts, email.last_error), (OutboxEmail.SENT, 1, ""))
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(mail.outbox[0].to, ["ravi@example.com"])
+        # Sent rows are never claimed again
+        self.assertEqual(claim_batch(10), [])
+
+    def test_expired_lease_becomes_due_again(self):
+        self.assertEqual([row.pk for row in claim_batch(10)], [self.email.pk])
+        self.assertEqual(self.reload().status, OutboxEmail.SENDING)
+        # Leased to a worker: nobody else picks it up
+        self.assertEqual(claim_batch(10), [])
+
+        # The worker died mid-batch and the lease ran out
+        OutboxEmail.objects.filter(pk=self.email.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual([row.pk for row in claim_batch(10)], [self.email.pk])
+        self.assertEqual(self.reload().attempts, 2)
+
+    def test_failures_back_off_then_give_up_at_max_attempts(self):
+        with (
+            mock.patch.object(EmailBackend, "send_messages", side_effect=SMTPException("421 try later")),
+            self.assertLogs("apps.outbox.services", "WARNING"),
+        ):
+            self.assertEqual(self.deliver(), (0, 1))
+            email = self.reload()
+            self.assertEqual((email.status, email.attempts), (OutboxEmail.PENDING, 1))
+            self.assertIn("421", email.last_error)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+
+            # Not due during the backoff
+            self.assertEqual(self.deliver(), (0, 0))
+            OutboxEmail.objects.filter(pk=self.email.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(self.deliver(), (0, 1))
+
+        email = self.reload()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.FAILED, 2))
+        self.assertEqual(claim_batch(10), [])
+        self.assertEqual(mail.outbox, [])
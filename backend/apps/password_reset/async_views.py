@@ -0,0 +1,72 @@
+"""
+Async versions of the OTP endpoints (routed when ``USE_ASYNC_VIEWS`` is on).
+
+Same inputs, responses and throttles as ``views``. Lookups and the password
+update use the async ORM; issuing the OTP stays one sync transaction (the ORM
+has no async transactions) run off the event loop. With ``OUTBOX_ASYNC_SMTP``
+the email is sent right away by aiosmtplib, and the outbox worker only
+handles it if that send fails.
+"""
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+
+from apps.accounts import hashing, revocation
+from apps.accounts.async_api import AsyncResponse, async_api_view
+from apps.accounts.identity import afind_user
+from apps.accounts.models import User
+from apps.accounts.throttling import SendOTPThrottle, VerifyOTPThrottle
+from apps.outbox import services as outbox
+
+from .otp_store import get_otp_store
+from .serializers import SendOtpSerializer, VerifyOtpSerializer
+from .views import issue_otp, password_error
+
+
+@async_api_view(["POST"], permission_classes=[AllowAny], throttle_classes=[SendOTPThrottle])
+async def send_otp_view(request):
+    serializer = SendOtpSerializer(data=request.data)
+    if not serializer.is_valid():
+        return AsyncResponse({"detail": "Invalid input"}, status=status.HTTP_400_BAD_REQUEST)
+
+    user = await afind_user(
+        serializer.validated_data['identifier'], User.objects.only('id', 'username', 'email', 'email_normalized')
+    )
+    if user is None or not user.email_normalized:
+        return AsyncResponse({
+            "detail": "Email not found — please register first.",
+            "sent": False
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    if outbox.async_smtp_enabled():
+        email = await sync_to_async(issue_otp)(user, not_before=outbox.async_grace_deadline())
+        outbox.deliver_soon(email)
+    else:
+        await sync_to_async(issue_otp)(user)
+
+    return AsyncResponse({"detail": "Verifiaction code sent successfully to your email.", "sent": True})
+
+
+@async_api_view(["POST"], permission_classes=[AllowAny], throttle_classes=[VerifyOTPThrottle])
+async def verify_otp_view(request):
+    serializer = VerifyOtpSerializer(data=request.data)
+    if not serializer.is_valid():
+        return AsyncResponse({"detail": "Invalid input"}, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+    error = password_error(data['new_password'], data['confirm_password'])
+    if error:
+        return AsyncResponse({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    user = await afind_user(data['identifier'], User.objects.only('id', 'username', 'email_normalized'))
+    if user is None:
+        return AsyncResponse({"detail": "User not found. Please register first."}, status=status.HTTP_404_NOT_FOUND)
+    if not user.email_normalized or not await sync_to_async(get_otp_store().consume)(user.email_normalized, data['otp']):
+        return AsyncResponse({"detail": "Invalid or expired OTP"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Waiting for the hashing pool doesn't need the request's DB thread
+    password = await sync_to_async(hashing.make_password, thread_sensitive=False)(data['new_password'])
+    await User.objects.filter(pk=user.pk).aupdate(password=password, **revocation.bump_values())
+    await sync_to_async(revocation.snapshot.publish)()
+
+    return AsyncResponse({"detail": "Password updated successfully."})
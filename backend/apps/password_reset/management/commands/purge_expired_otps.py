@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.password_reset.otp_store import get_otp_store
+
+
+class Command(BaseCommand):
+    help = "Delete expired password-reset OTP codes (run from cron)."
+
+    def handle(self, *args, **options):
+        purged = get_otp_store().purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} expired OTP code(s)."))
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+def delete_plaintext_codes(apps, schema_editor):
+    # Existing rows hold plaintext codes that can't be verified against hashes
+    apps.get_model('password_reset', 'OTPCode').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('password_reset', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_plaintext_codes, migrations.RunPython.noop),
+        migrations.RenameField(
+            model_name='otpcode',
+            old_name='otp_code',
+            new_name='code_hash',
+        ),
+        migrations.AlterField(
+            model_name='otpcode',
+            name='code_hash',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='otpcode',
+            index=models.Index(fields=['email', 'code_hash', 'expiry_time'], name='otp_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otpcode',
+            index=models.Index(fields=['expiry_time'], name='otp_expiry_idx'),
+        ),
+    ]
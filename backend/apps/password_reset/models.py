@@ -2,11 +2,20 @@ from django.db import models
 
 class OTPCode(models.Model):
     """
-    Stores OTP codes temporarily for password reset
+    Stores OTP codes temporarily for password reset.
+    Only an HMAC of the code is kept (see otp_store.hash_code).
     """
     email = models.EmailField(max_length=255)
-    otp_code = models.CharField(max_length=6)
+    code_hash = models.CharField(max_length=64)
     expiry_time = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            # ✅ Verification: WHERE email = ? AND code_hash = ? AND expiry_time >= now
+            models.Index(fields=['email', 'code_hash', 'expiry_time'], name='otp_lookup_idx'),
+            # ✅ Purging expired codes
+            models.Index(fields=['expiry_time'], name='otp_expiry_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.email} - {self.otp_code}"
+        return f"{self.email} - expires {self.expiry_time:%H:%M:%S}"
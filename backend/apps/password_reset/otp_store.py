@@ -0,0 +1,110 @@
+"""
+OTP storage backends.
+
+``get_otp_store()`` returns the backend named by ``settings.OTP_STORE``. Every
+backend stores only a keyed hash of the code, keeps at most one live code per
+email, and verifies with a single consume-and-delete operation.
+"""
+import hashlib
+import hmac
+import random
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OTPCode
+
+DEFAULT_OTP_STORE = "apps.password_reset.otp_store.DatabaseOTPStore"
+
+
+def hash_code(email, code):
+    """HMAC the code with the secret key so a leaked table can't be brute-forced offline."""
+    message = f"{email}:{code}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+class BaseOTPStore(ABC):
+    @abstractmethod
+    def issue(self, email, code, expiry_time):
+        """Store ``code`` for ``email`` until ``expiry_time``, replacing any earlier code."""
+
+    @abstractmethod
+    def consume(self, email, code):
+        """Return True and invalidate the code if it is valid and unexpired."""
+
+    def purge_expired(self):
+        """Drop expired codes and return how many were removed."""
+        return 0
+
+
+class DatabaseOTPStore(BaseOTPStore):
+    """Stores hashed codes in ``OTPCode`` (indexed on email, hash and expiry)."""
+
+    def issue(self, email, code, expiry_time):
+        with transaction.atomic():
+            OTPCode.objects.filter(email=email).delete()
+            OTPCode.objects.create(email=email, code_hash=hash_code(email, code), expiry_time=expiry_time)
+
+        # Expired rows of abandoned resets are swept now and then, keeping the table bounded
+        if random.random() < getattr(settings, "OTP_PURGE_PROBABILITY", 0.01):
+            self.purge_expired()
+
+    def consume(self, email, code):
+        # One DELETE ... WHERE email AND code_hash AND expiry_time >= now (OTPCode
+        # has no cascades or signals, so the collector fast-deletes); the row
+        # count tells us whether the code was valid, and a second request with
+        # the same code finds nothing left to delete.
+        deleted, _ = OTPCode.objects.filter(
+            email=email, code_hash=hash_code(email, code), expiry_time__gte=timezone.now()
+        ).delete()
+        return deleted > 0
+
+    def purge_expired(self):
+        deleted, _ = OTPCode.objects.filter(expiry_time__lt=timezone.now()).delete()
+        return deleted
+
+
+class CacheOTPStore(BaseOTPStore):
+    """
+    Keeps codes in the ``OTP_CACHE_ALIAS`` cache with a TTL, so nothing hits
+    the database and expired codes disappear on their own.
+    """
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, "OTP_CACHE_ALIAS", "default")]
+
+    def _email_key(self, email):
+        return f"otp:email:{hashlib.sha256(email.encode()).hexdigest()}"
+
+    def _code_key(self, email, code):
+        return f"otp:code:{hash_code(email, code)}"
+
+    def issue(self, email, code, expiry_time):
+        ttl = max(int((expiry_time - timezone.now()).total_seconds()), 1)
+        email_key = self._email_key(email)
+        previous = self.cache.get(email_key)
+        if previous:
+            self.cache.delete(previous)
+        code_key = self._code_key(email, code)
+        self.cache.set_many({code_key: 1, email_key: code_key}, timeout=ttl)
+
+    def consume(self, email, code):
+        # delete() reports whether the key existed — one atomic cache operation
+        if self.cache.delete(self._code_key(email, code)):
+            self.cache.delete(self._email_key(email))
+            return True
+        return False
+
+
+@lru_cache(maxsize=None)
+def _load_store(path):
+    return import_string(path)()
+
+
+def get_otp_store():
+    return _load_store(getattr(settings, "OTP_STORE", DEFAULT_OTP_STORE))
@@ -1,10 +1,22 @@
 from rest_framework import serializers
 
-class SendOtpSerializer(serializers.Serializer):
-    email = serializers.EmailField()
+class AccountIdentifierMixin:
+    """Accepts ``email`` or ``identifier`` (username, email or phone) and sets ``identifier``."""
 
-class VerifyOtpSerializer(serializers.Serializer):
-    email = serializers.EmailField()
+    def validate(self, attrs):
+        identifier = attrs.get('identifier') or attrs.get('email')
+        if not identifier:
+            raise serializers.ValidationError("Provide an email, username or phone number.")
+        attrs['identifier'] = identifier
+        return attrs
+
+class SendOtpSerializer(AccountIdentifierMixin, serializers.Serializer):
+    email = serializers.EmailField(required=False)
+    identifier = serializers.CharField(max_length=254, required=False)
+
+class VerifyOtpSerializer(AccountIdentifierMixin, serializers.Serializer):
+    email = serializers.EmailField(required=False)
+    identifier = serializers.CharField(max_length=254, required=False)
     otp = serializers.CharField(max_length=6)
     new_password = serializers.CharField(min_length=8)
     confirm_password = serializers.CharField(min_length=8)
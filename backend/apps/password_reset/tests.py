@@ -1,3 +1,81 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.accounts.views import CustomTokenObtainPairSerializer
+
+from .models import OTPCode
+from .otp_store import CacheOTPStore, DatabaseOTPStore, get_otp_store
+
+
+class OTPStoreTests(TestCase):
+    email = "ravi@example.com"
+
+    def setUp(self):
+        cache.clear()
+
+    def assert_single_use(self, store):
+        store.issue(self.email, "123456", timezone.now() + timedelta(minutes=5))
+        self.assertFalse(store.consume(self.email, "654321"))
+        self.assertTrue(store.consume(self.email, "123456"))
+        self.assertFalse(store.consume(self.email, "123456"))
+
+    def test_database_code_is_single_use(self):
+        self.assert_single_use(DatabaseOTPStore())
+        self.assertFalse(OTPCode.objects.exists())
+
+    def test_database_consume_is_one_statement(self):
+        store = DatabaseOTPStore()
+        store.issue(self.email, "123456", timezone.now() + timedelta(minutes=5))
+        with self.assertNumQueries(1):
+            self.assertTrue(store.consume(self.email, "123456"))
+
+    def test_database_rejects_expired_and_replaced_codes(self):
+        store = DatabaseOTPStore()
+        store.issue(self.email, "111111", timezone.now() - timedelta(seconds=1))
+        self.assertFalse(store.consume(self.email, "111111"))
+        self.assertEqual(store.purge_expired(), 1)
+
+        store.issue(self.email, "222222", timezone.now() + timedelta(minutes=5))
+        store.issue(self.email, "333333", timezone.now() + timedelta(minutes=5))
+        self.assertFalse(store.consume(self.email, "222222"))
+        self.assertTrue(store.consume(self.email, "333333"))
+
+    def test_cache_code_is_single_use(self):
+        self.assert_single_use(CacheOTPStore())
+
+
+@override_settings(REVOCATION={"POLL_SECONDS": 0, "REFRESH_SECONDS": 0}, PASSWORD_HASHING={"WORKERS": 0})
+class PasswordResetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["throttle"].clear()
+        self.user = User.objects.create_user("ravi", email="ravi@example.com", password="old-password")
+        self.client = APIClient()
+
+    def reset(self, otp):
+        return self.client.post("/api/password-reset/verify-otp/", {
+            "email": "Ravi@Example.com", "otp": otp,
+            "new_password": "new-password-1", "confirm_password": "new-password-1",
+        }, format="json")
+
+    def test_reset_revokes_tokens_issued_before_it(self):
+        refresh = CustomTokenObtainPairSerializer.get_token(self.user)
+        access = str(refresh.access_token)
+        get_otp_store().issue("ravi@example.com", "123456", timezone.now() + timedelta(minutes=5))
+
+        self.assertEqual(self.reset("123456").status_code, 200)
+        # The code is spent
+        self.assertEqual(self.reset("123456").status_code, 400)
+
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.check_password("new-password-1"))
+        profile = self.client.get("/api/auth/profile/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(profile.status_code, 401)
+        self.assertEqual(profile.data["code"], "token_revoked")
+        response = self.client.post("/api/auth/token/refresh/", {"refresh": str(refresh)}, format="json")
+        self.assertEqual(response.status_code, 401)
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.USE_ASYNC_VIEWS:
+    from . import async_views as views  # ✅ ASGI deployments: same endpoints, async handlers
+
 urlpatterns = [
     path('send-otp/', views.send_otp_view, name='send-otp'),
     path('verify-otp/', views.verify_otp_view, name='verify-otp'),
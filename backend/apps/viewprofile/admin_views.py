@@ -1,13 +1,22 @@
 # apps/viewprofile/admin_views.py
 from rest_framework import generics, permissions, status
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
+from apps.accounts.fast_serializers import ValuesListMixin, ValuesSerializer
+from apps.accounts.filters import UserFilterBackend
 from apps.accounts.models import User
+from apps.accounts.pagination import UserCursorPagination
 from apps.accounts.serializers import UserSerializer
 
-class AdminUserListCreateView(generics.ListCreateAPIView):
-    queryset = User.objects.all().order_by('-id')
+class AdminUserListCreateView(ValuesListMixin, generics.ListCreateAPIView):
+    queryset = User.objects.all()
     serializer_class = UserSerializer
+    values_serializer = ValuesSerializer(UserSerializer)
     permission_classes = [permissions.IsAdminUser]  # ✅ Only admins
+    pagination_class = UserCursorPagination
+    filter_backends = [UserFilterBackend, OrderingFilter]
+    ordering_fields = ["id", "date_joined"]
+    ordering = "-id"
 
 class AdminUserDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
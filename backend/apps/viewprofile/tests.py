@@ -1,3 +1,63 @@
-from django.test import TestCase
+import tempfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+
+PROFILE_URL = "/api/viewprofile/auth/profile/"
+
+
+class ConditionalProfileTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ravi", email="ravi@example.com", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def shared_cache(self):
+        """A file-based default cache: every worker would see the same version tokens."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": tmp.name},
+            "throttle": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "throttle"},
+        })
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_matching_if_none_match_gets_304(self):
+        self.shared_cache()
+        response = self.client.get(PROFILE_URL)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        cached = self.client.get(PROFILE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], etag)
+
+    def test_stale_if_match_gets_412(self):
+        self.shared_cache()
+        etag = self.client.get(PROFILE_URL)["ETag"]
+
+        updated = self.client.post(PROFILE_URL, {"first_name": "Ravi"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(updated.status_code, 200)
+        # The write replaced the version: the old ETag no longer matches either way
+        self.assertNotEqual(self.client.get(PROFILE_URL)["ETag"], etag)
+        self.assertEqual(self.client.get(PROFILE_URL, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        stale = self.client.post(PROFILE_URL, {"first_name": "Other"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(stale.status_code, 412)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Ravi")
+
+    def test_per_process_cache_issues_no_validators(self):
+        cache.clear()
+        response = self.client.get(PROFILE_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        # Preconditions aren't evaluated either
+        self.assertEqual(self.client.get(PROFILE_URL, HTTP_IF_NONE_MATCH="*").status_code, 200)
+        stale = self.client.post(PROFILE_URL, {"first_name": "Ravi"}, format="json", HTTP_IF_MATCH='"old"')
+        self.assertEqual(stale.status_code, 200)
@@ -2,19 +2,26 @@ from rest_framework import status, permissions, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from apps.accounts import payload_cache, versioning
+from apps.accounts.authentication import get_user_instance
 from apps.accounts.models import User
 from apps.accounts.serializers import UserSerializer
 
-class ProfileAPIView(APIView):
+class ProfileAPIView(versioning.ConditionalResourceMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
+    version_resource = versioning.PROFILE
 
     def get(self, request):
-        user = request.user
-        serializer = UserSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        not_modified = self.precondition_response(request)
+        if not_modified is not None:
+            return not_modified
+        return Response(payload_cache.profile_payload(request.user), status=status.HTTP_200_OK)
 
     def post(self, request):
-        user = request.user
+        not_modified = self.precondition_response(request)
+        if not_modified is not None:
+            return not_modified
+        user = get_user_instance(request.user)
         serializer = UserSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
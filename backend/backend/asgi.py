@@ -0,0 +1,19 @@
+"""
+ASGI config for backend project.
+
+Serve with an ASGI server, e.g. ``uvicorn backend.asgi:application --workers 4``,
+and set ``USE_ASYNC_VIEWS=True`` so the OTP, stats-stream, profile and address
+reads run as async views on the event loop instead of one thread per request.
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+application = get_asgi_application()
+
+# Build the in-memory message catalog now rather than on the first request
+from apps.message_catalog.catalog import load_at_startup  # noqa: E402
+
+load_at_startup()
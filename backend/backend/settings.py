@@ -36,11 +36,16 @@ INSTALLED_APPS = [
     "apps.password_reset",
     "apps.viewprofile",
     "apps.change_password",
+    "apps.outbox",
+    "apps.message_catalog",
+    "apps.monitoring",
 ]
 
 # ---------- Middleware ----------
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # ✅ must be first
+    "apps.monitoring.metrics.MetricsMiddleware",  # ✅ outermost after CORS, so it times the whole stack
+    "apps.accounts.throttling.AdaptiveSheddingMiddleware",  # ✅ sheds login/OTP load before sessions or DB
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -52,6 +57,15 @@ MIDDLEWARE = [
 # ---------- Root URLs ----------
 ROOT_URLCONF = "backend.urls"
 
+# ---------- WSGI / ASGI ----------
+WSGI_APPLICATION = "backend.wsgi.application"
+ASGI_APPLICATION = "backend.asgi.application"
+
+# Under an ASGI server, route OTP send/verify, the stats stream and profile /
+# address reads to the async views in each app's async_views module. Leave off
+# under WSGI, where every async view would get its own event loop.
+USE_ASYNC_VIEWS = os.getenv("USE_ASYNC_VIEWS", "False") == "True"
+
 # ---------- Database ----------
 DATABASES = {
     "default": {
@@ -61,20 +75,114 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "root"),
         "HOST": os.getenv("POSTGRES_HOST", "localhost"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        # ✅ Keep connections open across requests instead of reconnecting every time
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True",
     }
 }
 
+# ✅ Optional psycopg 3 connection pool (Django 5.1+, psycopg[pool] from requirements.txt).
+# Sizes are per worker process; Django requires CONN_MAX_AGE = 0 with a pool.
+if os.getenv("DB_POOL", "False") == "True":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+        },
+    }
+
 # ---------- Custom User Model ----------
 AUTH_USER_MODEL = "accounts.User"
+# Country calling code assumed for phone numbers entered without one (E.164 normalization).
+PHONE_DEFAULT_COUNTRY_CODE = os.getenv("PHONE_DEFAULT_COUNTRY_CODE", "91")
+
+# ---------- Authentication / Password Hashing ----------
+AUTHENTICATION_BACKENDS = ["apps.accounts.backends.PooledModelBackend"]
+
+# Hashes run on a process pool (WORKERS=0 runs them inline). Requests that
+# can't get one of MAX_PENDING slots within QUEUE_TIMEOUT seconds get a 503.
+# The pool is per web process: with gunicorn -w N a host runs N × WORKERS
+# hashing processes, so keep that product near the CPU count.
+# Benchmark with `manage.py bench_password_hashers`.
+PASSWORD_HASHING = {
+    "WORKERS": int(os.getenv("PASSWORD_HASH_WORKERS", 2)),
+    "MAX_PENDING": int(os.getenv("PASSWORD_HASH_MAX_PENDING", 8)),
+    "QUEUE_TIMEOUT": float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", 2.0)),
+}
+
+# ---------- Caches ----------
+# "default" holds the stats counters, resource versions and the cached profile /
+# address payloads. Local memory is per process, so stats recount often, no
+# ETags are issued and payloads aren't cached; for several workers use a shared
+# backend:
+#   CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache CACHE_LOCATION=/var/tmp/poc-cache
+#   CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://127.0.0.1:6379/1
+# "throttle" holds the rate-limit buckets, configured the same way.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", "default"),
+        "TIMEOUT": 300,
+        "KEY_PREFIX": "poc",
+    },
+    "throttle": {
+        "BACKEND": os.getenv("THROTTLE_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("THROTTLE_CACHE_LOCATION", "throttle"),
+    },
+}
+if CACHE_BACKEND.endswith(("LocMemCache", "FileBasedCache")):
+    # Room for a profile and an address payload per active user (Django's default is 300)
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 20000))}
 
 # ---------- REST Framework ----------
+# JSON responses: DRF's JSONRenderer, or apps.accounts.renderers.ORJSONRenderer
+# (needs the optional orjson package; several times faster on large listings).
+API_JSON_RENDERER = os.getenv("API_JSON_RENDERER", "rest_framework.renderers.JSONRenderer")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        API_JSON_RENDERER,
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    # Reverse proxies in front of the app. Throttles key on the client IP: with 0
+    # it's REMOTE_ADDR, with N the Nth X-Forwarded-For entry from the right (the
+    # one your own proxy appended). Never leave it unset: DRF would then key on
+    # the whole, client-controlled X-Forwarded-For header.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
+}
+
+# request.user is built from token claims; the full User row is loaded only
+# when a view needs it, from this per-process LRU (invalidated by User signals).
+AUTH_USER_CACHE = {
+    "MAX_SIZE": int(os.getenv("AUTH_USER_CACHE_SIZE", 10000)),
+    "TTL_SECONDS": int(os.getenv("AUTH_USER_CACHE_TTL", 60)),
+}
+
+# Profile / address ETags come from per-user version tokens in the default
+# cache. They are only issued with a shared CACHE_BACKEND (file-based, Redis,
+# Memcached): with local memory, other workers would miss bumps and answer 304
+# for stale bodies. The TTL bounds staleness if a bump is missed anyway.
+RESOURCE_VERSION_TTL = int(os.getenv("RESOURCE_VERSION_TTL", 300))
+
+# Serialized profile / address payloads, keyed by that version token so a write
+# makes the next read rebuild (apps.accounts.payload_cache). Like the ETags,
+# only used with a shared CACHE_BACKEND. A key about to expire is refreshed
+# early by one request while the rest keep reading it.
+PAYLOAD_CACHE = {
+    "ENABLED": os.getenv("PAYLOAD_CACHE_ENABLED", "True") == "True",
+    "TTL_SECONDS": int(os.getenv("PAYLOAD_CACHE_TTL", 300)),
+    "EARLY_REFRESH_BETA": 1.0,
+    "LOCK_SECONDS": 5,
+    "WAIT_SECONDS": 1.0,
 }
 
 # ---------- CORS Configuration ----------
@@ -92,6 +200,17 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTES", 60))),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # ✅ Logins feed the daily activity rollup (apps.accounts.activity)
+    "UPDATE_LAST_LOGIN": os.getenv("JWT_UPDATE_LAST_LOGIN", "True") == "True",
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.serializers.RevocationAwareTokenRefreshSerializer",
+}
+
+# Held users / revoked tokens are refused from an in-process snapshot
+# (apps.accounts.revocation). Each process reads the revocation epoch row at
+# most every POLL_SECONDS, and reloads at least every REFRESH_SECONDS.
+REVOCATION = {
+    "POLL_SECONDS": float(os.getenv("REVOCATION_POLL_SECONDS", 2)),
+    "REFRESH_SECONDS": int(os.getenv("REVOCATION_REFRESH_SECONDS", 60)),
 }
 
 # ---------- Templates ----------
@@ -126,5 +245,104 @@ EMAIL_HOST_USER = "janamahi2010@gmail.com"  # ✅ Replace with your Gmail
 EMAIL_HOST_PASSWORD = "zeex topo acdn zsjq"  # ✅ App password only
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# ---------- Pincode Lookup ----------
+# Built by `manage.py build_pincode_index <csv>`; memory-mapped by every worker.
+PINCODE_INDEX_PATH = os.getenv("PINCODE_INDEX_PATH", str(BASE_DIR / "data" / "pincodes.idx"))
+
+# ---------- Message Catalog ----------
+# `manage.py load_message_catalog` reads this script; /api/messages/ serves it.
+MESSAGE_CATALOG_SOURCE = BASE_DIR.parent / "Error_tables code"
+MESSAGE_CATALOG_CHECK_SECONDS = 30
+MESSAGE_CATALOG_MAX_AGE = 86400
+
+# ---------- Email Outbox ----------
+# Views queue mail in the outbox table; `manage.py run_outbox_worker` delivers it.
+# Point OUTBOX_EMAIL_BACKEND at the locmem/console backend for local runs.
+OUTBOX_EMAIL_BACKEND = os.getenv("OUTBOX_EMAIL_BACKEND", EMAIL_BACKEND)
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BASE_SECONDS = 30
+OUTBOX_POLL_SECONDS = 2
+# A claimed batch is leased to its worker this long; if the worker dies the
+# rows become due again afterwards. Keep it above a slow batch's send time.
+OUTBOX_LEASE_SECONDS = 300
+# With async views, send OTP mail straight away over aiosmtplib (optional
+# dependency); the worker only picks a message up if that attempt fails or
+# hasn't finished within OUTBOX_ASYNC_GRACE_SECONDS.
+OUTBOX_ASYNC_SMTP = os.getenv("OUTBOX_ASYNC_SMTP", "False") == "True"
+OUTBOX_ASYNC_GRACE_SECONDS = 60
+
 # ---------- OTP Expiry ----------
 OTP_EXPIRY_MINUTES = 5
+
+# Where OTP codes live: DatabaseOTPStore (hashed rows in OTPCode) or
+# CacheOTPStore (hashed keys with a TTL in the OTP_CACHE_ALIAS cache).
+OTP_STORE = os.getenv("OTP_STORE", "apps.password_reset.otp_store.DatabaseOTPStore")
+OTP_CACHE_ALIAS = "default"
+OTP_PURGE_PROBABILITY = 0.01
+
+# ---------- Admin User Stats ----------
+# Cached counters are replaced by a full recount at least this often
+# (also available as `manage.py resync_user_stats` for cron).
+USER_STATS_RESYNC_SECONDS = int(os.getenv("USER_STATS_RESYNC_SECONDS", 300))
+# With a per-process CACHE_BACKEND (local memory) workers can't see each other's
+# counter updates, so each one recounts this often instead.
+USER_STATS_LOCAL_RESYNC_SECONDS = int(os.getenv("USER_STATS_LOCAL_RESYNC_SECONDS", 10))
+
+# Live stats stream (auth/admin/stats/stream/): one version poll per process,
+# keep-alives for idle dashboards, and a max lifetime after which clients reconnect.
+USER_STATS_STREAM_POLL_SECONDS = float(os.getenv("USER_STATS_STREAM_POLL_SECONDS", 1))
+USER_STATS_STREAM_HEARTBEAT_SECONDS = 15
+USER_STATS_STREAM_MAX_SECONDS = 300
+# Under WSGI every open stream holds a worker thread; keep this well below the
+# server's threads per process (gunicorn --threads). Dashboards past the cap poll.
+USER_STATS_STREAM_MAX_SYNC_CONNECTIONS = int(os.getenv("USER_STATS_STREAM_MAX_SYNC_CONNECTIONS", 4))
+
+# ---------- Rate Limiting / Load Shedding (apps.accounts.throttling) ----------
+THROTTLE_CACHE_ALIAS = "throttle"
+# Token buckets: "<capacity>/<period>" per client IP and per targeted account.
+THROTTLE_RATES = {
+    "login.ip": "30/m",
+    "login.account": "10/m",
+    "register.ip": "20/h",
+    "register.account": "5/h",
+    "otp_send.ip": "10/h",
+    "otp_send.account": "3/15m",
+    "otp_verify.ip": "30/h",
+    "otp_verify.account": "10/h",
+}
+if os.getenv("THROTTLE_ENABLED", "True") != "True":
+    THROTTLE_RATES = {}
+
+LOAD_SHEDDING = {
+    "ENABLED": os.getenv("LOAD_SHEDDING_ENABLED", "True") == "True",
+    "PATHS": ["/api/auth/login/", "/api/auth/register/", "/api/password-reset/"],
+    # Shedding starts when the moving average latency of PATHS exceeds this
+    "TARGET_MS": float(os.getenv("LOAD_SHEDDING_TARGET_MS", 1500)),
+    "MAX_DROP": 0.9,
+    "SMOOTHING": 0.1,
+}
+
+# ---------- Admin Bulk Actions ----------
+ADMIN_BULK_MAX_USERS = int(os.getenv("ADMIN_BULK_MAX_USERS", 10000))
+# Result cap for the admin user search (admin/users/search/?q=).
+ADMIN_USER_SEARCH_MAX_RESULTS = int(os.getenv("ADMIN_USER_SEARCH_MAX_RESULTS", 50))
+# Rows accepted per upload by admin/users/import/ (bigger files: manage.py import_users).
+ADMIN_IMPORT_MAX_ROWS = int(os.getenv("ADMIN_IMPORT_MAX_ROWS", 5000))
+
+# ---------- Admin Exports / Reports ----------
+# Rows fetched per server-side cursor round trip by the streaming exports.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+# Logins are counted in memory and added to the activity rollup at most this
+# often per process (one UPDATE per day/role instead of one per login).
+ACTIVITY_LOGIN_FLUSH_SECONDS = int(os.getenv("ACTIVITY_LOGIN_FLUSH_SECONDS", 10))
+
+# Longest date range the activity report accepts.
+ADMIN_REPORT_MAX_DAYS = int(os.getenv("ADMIN_REPORT_MAX_DAYS", 731))
+
+# ---------- Metrics (/metrics, Prometheus text format) ----------
+# Share of requests timed and SQL-instrumented; every request is still counted.
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", 1.0))
+# Bearer token for the scraper; admins can also read /metrics with their JWT.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
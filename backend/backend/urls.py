@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from apps.monitoring.views import metrics_view
+
 urlpatterns = [
     path('dj-admin/', admin.site.urls),
 
@@ -10,4 +12,7 @@ urlpatterns = [
     path('api/password-reset/', include('apps.password_reset.urls')),
     path('api/viewprofile/', include('apps.viewprofile.urls')),
     path('api/change-password/', include('apps.change_password.urls')),
+    path('api/messages/', include('apps.message_catalog.urls')),
+    path('api/monitoring/', include('apps.monitoring.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
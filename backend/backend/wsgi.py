@@ -0,0 +1,18 @@
+"""
+WSGI config for backend project.
+
+Serve with a threaded WSGI server, e.g.
+``gunicorn backend.wsgi --workers 4 --threads 8``.
+"""
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+application = get_wsgi_application()
+
+# Build the in-memory message catalog now rather than on the first request
+from apps.message_catalog.catalog import load_at_startup  # noqa: E402
+
+load_at_startup()
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import axios from "axios";
 import "../layouts/AdminLayout.css";
 import "./AdminDashboard.css";
@@ -51,16 +51,88 @@ export default function AdminDashboard() {
     }
   );
 
+  // Set while the stats stream is connected; otherwise the interval below polls
+  const streamLive = useRef(false);
+
   useEffect(() => {
+    const controller = new AbortController();
+
     fetchDashboardData();
+    streamDashboardData(controller.signal); // 📡 Server pushes only when users change
 
     const interval = setInterval(() => {
-      fetchDashboardData();
-    }, 10000); // 🔁 Refresh every 10 seconds
+      if (!streamLive.current) fetchDashboardData();
+    }, 30000); // 🔁 Fallback refresh every 30 seconds while the stream is down
 
-    return () => clearInterval(interval);
+    return () => {
+      controller.abort();
+      clearInterval(interval);
+    };
   }, []);
 
+  const applyStats = (data) => {
+    setStats({
+      totalUsers: data.total_users,
+      activeUsers: data.active_users,
+      holdUsers: data.hold_users,
+    });
+  };
+
+  // 📡 Live updates over Server-Sent Events (fetch stream, so we can send the JWT)
+  const streamDashboardData = async (signal) => {
+    let lastEventId = "";
+
+    while (!signal.aborted) {
+      try {
+        const res = await fetch("http://127.0.0.1:8000/api/auth/admin/stats/stream/", {
+          headers: {
+            Accept: "text/event-stream",
+            Authorization: `Bearer ${localStorage.getItem("access")}`,
+            ...(lastEventId && { "Last-Event-ID": lastEventId }),
+          },
+          signal,
+        });
+        if (!res.ok || !res.body) throw new Error(`Stats stream failed (${res.status})`);
+        streamLive.current = true;
+
+        const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) {
+            streamLive.current = false;
+            break; // server closed the stream — reconnect
+          }
+
+          buffer += value;
+          const events = buffer.split("\n\n");
+          buffer = events.pop();
+
+          events.forEach((raw) => {
+            const fields = {};
+            raw.split("\n").forEach((line) => {
+              const i = line.indexOf(":");
+              if (i > 0) fields[line.slice(0, i)] = line.slice(i + 1).trim();
+            });
+            if (fields.event === "stats" && fields.data) {
+              lastEventId = fields.id || lastEventId;
+              applyStats(JSON.parse(fields.data));
+            }
+          });
+        }
+      } catch (err) {
+        streamLive.current = false;
+        if (signal.aborted) return;
+        console.error("❌ Stats stream error:", err.message);
+        // Plain fetch goes through the interceptor, refreshing an expired token;
+        // the interval keeps polling until the stream is back
+        await fetchDashboardData();
+        await new Promise((resolve) => setTimeout(resolve, 60000));
+      }
+    }
+  };
+
   const fetchDashboardData = async () => {
     try {
       setLoading(true);
@@ -73,13 +145,7 @@ export default function AdminDashboard() {
       });
 
       // ✅ Expecting backend to return: { total_users, active_users, hold_users }
-      const data = res.data;
-
-      setStats({
-        totalUsers: data.total_users,
-        activeUsers: data.active_users,
-        holdUsers: data.hold_users,
-      });
+      applyStats(res.data);
     } catch (err) {
       console.error("❌ Error fetching stats:", err.response?.data || err.message);
       setError("Failed to load user stats. Check backend or token validity.");
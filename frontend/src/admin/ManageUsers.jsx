@@ -0,0 +1,125 @@
+import React, { useEffect, useState } from "react";
+import "./ManageUsers.css";
+
+const API_BASE = "http://127.0.0.1:8000/api/auth/admin/users/";
+
+const authHeaders = () => ({
+  Authorization: `Bearer ${localStorage.getItem("access")}`,
+});
+
+export default function ManageUsers() {
+  const [users, setUsers] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
+  const [query, setQuery] = useState("");
+  const [role, setRole] = useState("");
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState("");
+
+  // ✅ Server-side: typeahead search for 2+ characters, otherwise the paginated list
+  useEffect(() => {
+    const controller = new AbortController();
+    const term = query.trim();
+    const timer = setTimeout(() => {
+      if (term.length >= 2) {
+        loadUsers(`${API_BASE}search/?q=${encodeURIComponent(term)}&limit=50`, controller.signal);
+      } else {
+        loadUsers(`${API_BASE}${role ? `?role=${role}` : ""}`, controller.signal);
+      }
+    }, 250); // debounce keystrokes
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [query, role]);
+
+  const loadUsers = async (url, signal, append = false) => {
+    setLoading(true);
+    setError("");
+    try {
+      const res = await fetch(url, { headers: authHeaders(), signal });
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      const data = await res.json();
+      const results = role ? data.results.filter((u) => u.role === role) : data.results;
+      setUsers((prev) => (append ? [...prev, ...results] : results));
+      setNextPage(data.next || null);
+    } catch (err) {
+      if (err.name !== "AbortError") {
+        console.error("❌ Failed to load users:", err);
+        setError("Failed to load users. Please log in again.");
+      }
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className="manage-users-container">
+      <div className="page-header">
+        <div>
+          <h2>Manage Users</h2>
+          <p>Search by username, email, name or phone.</p>
+        </div>
+      </div>
+
+      <div className="filter-bar">
+        <input
+          className="search-box"
+          type="search"
+          placeholder="Search users..."
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+        />
+        <select className="filter-select" value={role} onChange={(e) => setRole(e.target.value)}>
+          <option value="">All roles</option>
+          <option value="admin">Admin</option>
+          <option value="user">User</option>
+        </select>
+      </div>
+
+      {error && <p className="error-text">{error}</p>}
+
+      <table className="users-table">
+        <thead>
+          <tr>
+            <th>Username</th>
+            <th>Name</th>
+            <th>Email</th>
+            <th>Phone</th>
+            <th>Role</th>
+            <th>Status</th>
+          </tr>
+        </thead>
+        <tbody>
+          {users.map((u) => (
+            <tr key={u.id}>
+              <td>{u.username}</td>
+              <td>{[u.first_name, u.last_name].filter(Boolean).join(" ") || "-"}</td>
+              <td>{u.email}</td>
+              <td>{u.phone || "-"}</td>
+              <td>
+                <span className="role-badge">{u.role}</span>
+              </td>
+              <td>
+                <span className={`status-badge ${u.is_active ? "active" : "hold"}`}>
+                  {u.is_active ? "Active" : "On Hold"}
+                </span>
+              </td>
+            </tr>
+          ))}
+          {!loading && users.length === 0 && (
+            <tr>
+              <td colSpan="6">No users found.</td>
+            </tr>
+          )}
+        </tbody>
+      </table>
+
+      {nextPage && (
+        <button className="add-btn" disabled={loading} onClick={() => loadUsers(nextPage, undefined, true)}>
+          {loading ? "Loading..." : "Load more"}
+        </button>
+      )}
+    </div>
+  );
+}
@@ -2,6 +2,27 @@ import React from "react";
 import "../layouts/AdminLayout.css";
 
 
+const EXPORT_URL = "http://127.0.0.1:8000/api/auth/admin/export/";
+
+// ✅ Download a streamed export (users joined with addresses)
+async function downloadExport(format, gzip = false) {
+  const filename = `users.${format}${gzip ? ".gz" : ""}`;
+  const res = await fetch(`${EXPORT_URL}users.${format}${gzip ? "?gzip=1" : ""}`, {
+    headers: { Authorization: `Bearer ${localStorage.getItem("access")}` },
+  });
+  if (!res.ok) {
+    alert("Export failed. Please log in again.");
+    return;
+  }
+  const blob = await res.blob();
+  const url = URL.createObjectURL(blob);
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = filename;
+  link.click();
+  URL.revokeObjectURL(url);
+}
+
 export default function Reports() {
   return (
     <div className="admin-page">
@@ -22,6 +43,13 @@ export default function Reports() {
           <p>3</p>
         </div>
       </div>
+
+      <div className="reports-export">
+        <h3>Export Users &amp; Addresses</h3>
+        <button onClick={() => downloadExport("csv")}>Download CSV</button>
+        <button onClick={() => downloadExport("ndjson")}>Download NDJSON</button>
+        <button onClick={() => downloadExport("csv", true)}>Download CSV (gzip)</button>
+      </div>
     </div>
   );
 }
@@ -30,7 +30,29 @@ function AddressPage() {
     if (postal_code.length < 5) return;
 
     try {
-      // 🇮🇳 Indian Postal Code API
+      // 🗂️ Local pincode index on our backend (fast, no third-party call)
+      const countryCode =
+        form.country && form.country.toLowerCase() !== "india" ? form.country : "IN";
+      const localRes = await fetch(
+        `http://127.0.0.1:8000/api/addresses/pincode/${encodeURIComponent(postal_code)}/?country=${encodeURIComponent(countryCode)}`,
+        { headers: { Authorization: `Bearer ${token}` } }
+      );
+      if (localRes.ok) {
+        const place = (await localRes.json()).places?.[0];
+        if (place) {
+          setForm((prev) => ({
+            ...prev,
+            area: prev.area || place.area || "",
+            district: place.district || "",
+            city: place.city || "",
+            state: place.state || "",
+            country: place.country || prev.country,
+          }));
+          return;
+        }
+      }
+
+      // 🇮🇳 Indian Postal Code API (fallback when the local index has no match)
       const indiaRes = await fetch(`https://api.postalpincode.in/pincode/${postal_code}`);
       const indiaData = await indiaRes.json();
 